@@ -0,0 +1,88 @@
+"""Throughput of bulk question answering against a get_response loop.
+
+Usage:
+    python benchmarks/bench_ask.py [--questions 100000] [--unique 0.2] [--workers 1 2 4]
+
+Builds a question list in the shape of an FAQ export: phrasings of the
+knowledge base topics, misspellings and off-topic questions, with a given
+share of distinct texts and the rest repeats with different case and
+punctuation. The list is answered once with get_response in a loop and
+then with ethixguard.ask.answer_stream at each worker count; every answer
+is checked against the loop's.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ethixguard.ask import answer_stream
+from ethixguard.assistant import get_response
+from ethixguard.knowledge import knowledge_base
+
+TEMPLATES = ["What is {}?", "how do I get {} approval", "Tell me about {}.", "{} requirements for my lab",
+             "Who handles {} in India?", "do we need {} for a field trial"]
+OFF_TOPIC = ["parking permit", "cafeteria menu", "conference travel", "printer toner", "leave policy"]
+
+
+def misspell(word, rng):
+    if len(word) < 4:
+        return word
+    i = rng.randrange(1, len(word) - 1)
+    return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+
+def make_questions(count, unique, seed=3):
+    """`count` questions of which about `unique` (a fraction) are distinct after normalizing."""
+    rng = random.Random(seed)
+    topics = list(knowledge_base)
+    distinct = []
+    for i in range(max(1, int(count * unique))):
+        kind = i % 3
+        if kind == 0:
+            topic = rng.choice(topics)
+        elif kind == 1:
+            topic = misspell(rng.choice(topics), rng)
+        else:
+            topic = rng.choice(OFF_TOPIC)
+        distinct.append(rng.choice(TEMPLATES).format(topic) + f" #{i}")
+    questions = []
+    for _ in range(count):
+        question = rng.choice(distinct)
+        # Same question as typed by someone else: case and trailing punctuation differ
+        questions.append(question.upper() if rng.random() < 0.3 else question.rstrip("?.") + "!" * rng.randint(0, 2))
+    return questions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--questions", type=int, default=100000)
+    parser.add_argument("--unique", type=float, default=0.2, help="share of distinct questions")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, os.cpu_count() or 1])
+    parser.add_argument("--blocksize", type=int, default=256)
+    args = parser.parse_args(argv)
+
+    questions = make_questions(args.questions, args.unique)
+    get_response(questions[0])  # build the matcher outside the timings
+
+    start = time.perf_counter()
+    expected = [get_response(question) for question in questions]
+    baseline = len(questions) / (time.perf_counter() - start)
+    print(f"{'method':<24} {'questions/s':>12} {'speedup':>8}")
+    print(f"{'get_response loop':<24} {baseline:>12.0f} {1:>7.1f}x")
+
+    for workers in sorted(set(args.workers)):
+        answers = {}
+        start = time.perf_counter()
+        results = [answer for _, _, answer in answer_stream(enumerate(questions), workers=workers,
+                                                            blocksize=args.blocksize, answers=answers)]
+        rate = len(questions) / (time.perf_counter() - start)
+        assert results == expected, "answer_stream disagrees with get_response"
+        print(f"{f'answer_stream x{workers}':<24} {rate:>12.0f} {rate / baseline:>7.1f}x")
+    print(f"{len(answers)} unique of {len(questions)} questions")
+
+
+if __name__ == "__main__":
+    main()
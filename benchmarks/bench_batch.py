@@ -0,0 +1,73 @@
+"""Throughput of the headless batch evaluator.
+
+Usage:
+    python benchmarks/bench_batch.py [--submissions 20000] [--workers 1 2 4]
+
+Scores the same synthetic submissions with different worker counts and
+reports submissions per second overall and per core, with and without
+report rendering.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ethixguard.batch import evaluate_stream
+from ethixguard.checklists import get_checklists
+
+BIOSAFETY_QUESTIONS = {
+    "GMO Involvement": ["Yes", "No", "Not Applicable"],
+    "IBSC Approval": ["Yes", "No", "Not Applicable"],
+    "Containment Measures": ["Yes", "No", "Partially"],
+    "RCGM Approval": ["Yes", "No", "Not Required"],
+    "GEAC Approval": ["Yes", "No", "Not Required"],
+    "Staff Training": ["Yes", "No", "Partially"],
+    "Documentation": ["Yes", "No", "Partially"],
+}
+
+ETHICS_QUESTIONS = ["Informed Consent", "Vulnerable Populations", "Special Protections", "Privacy Measures"]
+
+
+def make_submissions(count, seed=11):
+    """Generate `count` synthetic submissions lazily."""
+    rng = random.Random(seed)
+    checklists = get_checklists()
+    for i in range(count):
+        yield {
+            "id": i,
+            "biosafety": {q: rng.choice(options) for q, options in BIOSAFETY_QUESTIONS.items()},
+            "ethics": {
+                "Research Type": rng.choice(checklists.research_types),
+                "Containment Level": rng.choice(checklists.bsl_levels),
+                **{q: rng.choice(["Yes", "No", "Partially"]) for q in ETHICS_QUESTIONS},
+                "Additional Notes": "",
+            },
+        }
+
+
+def run(count, workers, include_report, chunksize):
+    start = time.perf_counter()
+    done = sum(1 for _ in evaluate_stream(make_submissions(count), workers=workers,
+                                          chunksize=chunksize, include_report=include_report))
+    return done / (time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--submissions", type=int, default=20000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, os.cpu_count() or 1])
+    parser.add_argument("--chunksize", type=int, default=256)
+    args = parser.parse_args(argv)
+
+    print(f"{'workers':>8} {'report':>7} {'subs/s':>10} {'subs/s/core':>12}")
+    for include_report in (False, True):
+        for workers in sorted(set(args.workers)):
+            rate = run(args.submissions, workers, include_report, args.chunksize)
+            print(f"{workers:>8} {'yes' if include_report else 'no':>7} {rate:>10.0f} {rate / workers:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
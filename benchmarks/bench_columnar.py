@@ -0,0 +1,55 @@
+"""Per-submission scoring loop versus the columnar NumPy path.
+
+Usage:
+    python benchmarks/bench_columnar.py [--submissions 100000]
+
+Encodes the synthetic submissions from bench_batch once, then compares
+score_submission in a Python loop with score_table over the whole cohort,
+after checking both produce the same counts.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_batch import make_submissions
+from ethixguard.checklists import SECTIONS, STATUSES
+from ethixguard.columnar import SubmissionTable, score_table
+from ethixguard.evaluation import score_submission
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--submissions", type=int, default=100000)
+    args = parser.parse_args(argv)
+
+    submissions = list(make_submissions(args.submissions))
+
+    start = time.perf_counter()
+    looped = [score_submission(s["biosafety"], s["ethics"]) for s in submissions]
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    table = SubmissionTable.from_submissions(submissions)
+    encode_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scores = score_table(table)
+    score_time = time.perf_counter() - start
+
+    for section in SECTIONS:
+        for status in STATUSES:
+            expected = [counts[section][status] for counts in looped]
+            assert scores[f"{section}_{status}"].tolist() == expected, (section, status)
+
+    print(f"submissions:            {len(submissions)}")
+    print(f"score_submission loop:  {loop_time * 1e3:9.1f} ms")
+    print(f"encode (once):          {encode_time * 1e3:9.1f} ms")
+    print(f"score_table:            {score_time * 1e3:9.1f} ms  ({loop_time / score_time:.0f}x faster than the loop)")
+    print(f"encoded answer bytes:   {table.biosafety.nbytes + table.ethics.nbytes + table.bsl.nbytes + table.research_type.nbytes}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Bytes served and time to first render per landing-page visit.
+
+Usage:
+    python benchmarks/bench_home.py [--visits 20]
+
+Every visit is a new session: a fresh AppTest of full_app.py, timed from
+the start of its first script run to the finished home page. The first
+visit also decodes and encodes the landing image; later visits reuse the
+process-wide variant. The image step is then timed on its own (st.image
+outside a session), once with the path to the PNG as the page used to
+pass it and once with the cached variant. The bytes column is what st.image hands to the browser:
+Streamlit passes both the source PNG (same format, narrower than its
+maximum width) and the variant through unchanged.
+"""
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+APP = os.path.join(ROOT, "full_app.py")
+
+
+CAPTION = "Biosafety and ethics compliance are critical for research and production"
+
+
+def image_from_path(path):
+    import streamlit as st
+    st.image(path, caption=CAPTION)
+
+
+def image_from_asset(name):
+    import streamlit as st
+    from ethixguard.assets import get_asset
+    image = get_asset(name).variant()
+    st.image(image.data, caption=CAPTION, output_format=image.mimetype.split("/")[1].upper())
+
+
+def per_call(fn, arg, calls):
+    timings = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        fn(arg)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def first_render(make_test, visits):
+    """Seconds to the first finished run of `visits` new sessions."""
+    timings = []
+    for _ in range(visits):
+        at = make_test()
+        start = time.perf_counter()
+        at.run()
+        timings.append(time.perf_counter() - start)
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--visits", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    # Keep the timings free of disk writes to the submission store
+    os.environ["ETHIXGUARD_DB"] = ""
+    from streamlit.testing.v1 import AppTest
+
+    import full_app
+    from ethixguard.assets import get_asset
+
+    asset = get_asset(full_app.HOME_IMAGE)
+    page = first_render(lambda: AppTest.from_file(APP, default_timeout=60), args.visits)
+    variant = asset.variant()
+    path = os.path.join(ROOT, full_app.HOME_IMAGE)
+    # st.image outside a session warns on every call
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").setLevel(logging.ERROR)
+    before = per_call(image_from_path, path, args.visits)
+    after = per_call(image_from_asset, full_app.HOME_IMAGE, args.visits)
+
+    print(f"home page, first visit in the process: {page[0] * 1000:8.1f} ms")
+    print(f"home page, later visits (median):      {statistics.median(page[1:] or page) * 1000:8.1f} ms")
+    print()
+    print(f"{'landing image':<24}{'bytes/visit':>12}{'st.image (median)':>20}")
+    print(f"{'PNG from disk':<24}{asset.source_bytes:>12}{before * 1000:>17.2f} ms")
+    print(f"{'cached ' + variant.mimetype:<24}{len(variant.data):>12}{after * 1000:>17.2f} ms")
+    print(f"bytes saved per visit: {asset.source_bytes - len(variant.data)} "
+          f"({1 - len(variant.data) / asset.source_bytes:.0%})")
+
+
+if __name__ == "__main__":
+    main()
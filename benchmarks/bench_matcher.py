@@ -0,0 +1,104 @@
+"""Compare the linear get_response lookup with the precompiled KeywordMatcher.
+
+Usage:
+    python benchmarks/bench_matcher.py [--sizes 100 1000 10000] [--queries 300]
+
+Synthetic knowledge bases of growing size are matched against the same mix
+of exact, misspelled and unknown questions. The per-query time of the old
+scan grows with the number of keys; the matcher should grow much slower.
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from difflib import get_close_matches
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ethixguard.matcher import KeywordMatcher
+
+WORDS = [
+    "biosafety", "containment", "approval", "committee", "ethics", "consent",
+    "animal", "clinical", "genetic", "review", "laboratory", "hazard",
+    "waste", "transport", "import", "export", "field", "trial", "microbe",
+    "plant", "vaccine", "registry", "audit", "training", "disposal",
+]
+
+
+def linear_lookup(knowledge_base, processed_input):
+    """The original get_response matching logic, kept as the baseline."""
+    for key in knowledge_base:
+        if key in processed_input:
+            return knowledge_base[key]
+    for word in processed_input.split():
+        close_matches = get_close_matches(word, knowledge_base.keys(), n=1, cutoff=0.8)
+        if close_matches:
+            return knowledge_base[close_matches[0]]
+    return None
+
+
+def make_knowledge_base(size, rng):
+    knowledge_base = {}
+    while len(knowledge_base) < size:
+        parts = rng.sample(WORDS, rng.randint(1, 3))
+        key = " ".join(parts) + " " + str(len(knowledge_base))
+        knowledge_base[key] = "answer for " + key
+    return knowledge_base
+
+
+def make_queries(knowledge_base, count, rng):
+    keys = list(knowledge_base)
+    queries = []
+    for i in range(count):
+        kind = i % 3
+        if kind == 0:
+            # Exact phrase embedded in a question
+            queries.append("what about " + rng.choice(keys) + " rules")
+        elif kind == 1:
+            # Single misspelled keyword
+            word = rng.choice(WORDS)
+            pos = rng.randrange(len(word))
+            queries.append("tell me " + word[:pos] + word[pos + 1:])
+        else:
+            # Nothing to find
+            queries.append("where is the cafeteria today")
+    return [re.sub(r'[^\w\s]', '', q.lower()) for q in queries]
+
+
+def per_query(fn, queries):
+    start = time.perf_counter()
+    for query in queries:
+        fn(query)
+    return (time.perf_counter() - start) / len(queries)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    print(f"{'keys':>8} {'build ms':>10} {'linear us/q':>12} {'matcher us/q':>13} {'speedup':>8}")
+    for size in args.sizes:
+        rng = random.Random(args.seed)
+        knowledge_base = make_knowledge_base(size, rng)
+        queries = make_queries(knowledge_base, args.queries, rng)
+
+        start = time.perf_counter()
+        matcher = KeywordMatcher(knowledge_base)
+        build = time.perf_counter() - start
+
+        for query in queries:
+            assert matcher.lookup(query) == linear_lookup(knowledge_base, query), query
+
+        linear = per_query(lambda q: linear_lookup(knowledge_base, q), queries)
+        compiled = per_query(matcher.lookup, queries)
+        print(f"{size:>8} {build * 1e3:>10.1f} {linear * 1e6:>12.1f} "
+              f"{compiled * 1e6:>13.1f} {linear / compiled:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Bytes of submission state held per session: answer dicts vs Submission, plus the live evaluation.
+
+Usage:
+    python benchmarks/bench_session_memory.py [--sessions 10000]
+
+Builds the same random answers for many sessions twice. The dict layout
+is what the pages used to keep: biosafety_data, ethics_answers, a full
+ethics_data copy and prev_research_type. The compact layout is one
+ethixguard.submission.Submission. Answer strings come from the shared
+checklist registry in both cases, as they do in the app, and each session
+gets its own short notes string. The app also keeps an
+ethixguard.incremental.EvaluationState per session for the live score,
+so its size is reported next to the Submission's.
+"""
+import argparse
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ethixguard.checklists import get_checklists
+from ethixguard.incremental import EvaluationState
+from ethixguard.submission import Submission
+
+
+def random_form(checklists, rng, index):
+    biosafety = {q.key: rng.choice(q.options) for q in checklists.biosafety_questions}
+    research_type = rng.choice(checklists.research_types)
+    containment = checklists.containment_question
+    answers = {containment.key: rng.choice(containment.options)}
+    answers.update((q.key, rng.choice(q.options)) for q in checklists.ethics_questions[research_type])
+    return biosafety, research_type, answers, f"notes for project {index}"
+
+
+def dict_session(checklists, biosafety, research_type, answers, notes):
+    return {
+        "biosafety_data": dict(biosafety),
+        "ethics_answers": dict(answers),
+        "ethics_data": {checklists.research_type_field.key: research_type, **answers,
+                        checklists.notes_field.key: notes},
+        "prev_research_type": research_type,
+    }
+
+
+def compact_session(checklists, biosafety, research_type, answers, notes):
+    submission = Submission(checklists)
+    submission.set_biosafety(biosafety)
+    submission.set_ethics(research_type, answers, notes)
+    return {"submission": submission}
+
+
+def evaluation_session(checklists, biosafety, research_type, answers, notes):
+    ethics = {checklists.research_type_field.key: research_type, **answers, checklists.notes_field.key: notes}
+    return {"evaluation": EvaluationState.from_data(biosafety, ethics, checklists)}
+
+
+def bytes_per_session(build, forms, checklists):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    sessions = [build(checklists, *form) for form in forms]
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return used / len(sessions), sessions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    checklists = get_checklists()
+    rng = random.Random(args.seed)
+    forms = [random_form(checklists, rng, i) for i in range(args.sessions)]
+    # The notes strings exist either way; count only what the layouts add
+    dict_bytes, dict_sessions = bytes_per_session(dict_session, forms, checklists)
+    compact_bytes, compact_sessions = bytes_per_session(compact_session, forms, checklists)
+    evaluation_bytes, evaluation_sessions = bytes_per_session(evaluation_session, forms, checklists)
+
+    # Both layouts must describe the same answers
+    for old, new, live in zip(dict_sessions, compact_sessions, evaluation_sessions):
+        assert new["submission"].biosafety_data() == old["biosafety_data"]
+        assert new["submission"].ethics_data() == old["ethics_data"]
+        assert live["evaluation"].ethics_data() == old["ethics_data"]
+
+    print(f"sessions:            {args.sessions}")
+    print(f"dict layout:         {dict_bytes:8.0f} bytes/session")
+    print(f"Submission:          {compact_bytes:8.0f} bytes/session  "
+          f"({dict_bytes / compact_bytes:.1f}x smaller)")
+    print(f"for 1000 sessions:   {dict_bytes * 1000 / 2**20:.2f} MiB -> {compact_bytes * 1000 / 2**20:.2f} MiB")
+    print(f"EvaluationState:     {evaluation_bytes:8.0f} bytes/session  "
+          f"(live score, kept alongside the Submission)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Cold-start import cost of the core package versus the Streamlit app.
+
+Usage:
+    python benchmarks/bench_startup.py [--repeat 5] [--top 8]
+
+Each target is imported in a fresh interpreter under `python -X importtime`
+and the cumulative time of the top-level imports is summed. The median over
+several runs is reported, along with the slowest modules of the last run.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TARGETS = [
+    # What a batch worker or test had to import before the core was split out
+    ("streamlit + pandas (old worker cost)", "import streamlit, pandas"),
+    ("batch worker", "import ethixguard.batch"),
+    ("scoring core", "from ethixguard import generate_report; generate_report"),
+    ("assistant", "from ethixguard import get_response; get_response"),
+    ("app process", "import full_app"),
+]
+
+
+def import_profile(statement):
+    """Run `statement` under -X importtime; return [(cumulative_us, depth, module)]."""
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                          cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((int(cumulative), depth, name.strip()))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    # Interpreter start-up imports (site, encodings, ...) are common to every run
+    baseline = {name for _, _, name in import_profile("pass")}
+
+    for label, statement in TARGETS:
+        totals = []
+        for _ in range(args.repeat):
+            try:
+                rows = import_profile(statement)
+            except subprocess.CalledProcessError as exc:
+                print(f"{label}: failed ({exc.stderr.strip().splitlines()[-1]})")
+                break
+            totals.append(sum(us for us, depth, name in rows if depth == 0 and name not in baseline))
+        else:
+            print(f"{label:<40} {statistics.median(totals) / 1000:>9.1f} ms   ({statement})")
+            slowest = sorted((r for r in rows if r[2] not in baseline), reverse=True)[:args.top]
+            for us, depth, name in slowest:
+                print(f"    {us / 1000:>8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Write throughput and indexed query latency of the submission store.
+
+Usage:
+    python benchmarks/bench_store.py [--rows 300000] [--db /tmp/bench.db]
+
+Queues synthetic saved forms through the batching writer, then times typical
+dashboard queries such as "Animal Research below BSL-2 this quarter".
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_batch import make_submissions
+from ethixguard.store import SubmissionStore, submission_row
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=300000)
+    parser.add_argument("--projects", type=int, default=100000)
+    parser.add_argument("--db", default=None, help="database file (default: a fresh temp file)")
+    args = parser.parse_args(argv)
+
+    path = args.db or os.path.join(tempfile.mkdtemp(), "bench.db")
+    store = SubmissionStore(path)
+    rng = random.Random(5)
+    start_day = datetime(2026, 1, 1)
+
+    start = time.perf_counter()
+    for i, submission in enumerate(make_submissions(args.rows)):
+        created = start_day + timedelta(seconds=rng.randrange(365 * 86400))
+        store.save_rows([submission_row(f"project-{rng.randrange(args.projects)}", "ethics",
+                                        submission["biosafety"], submission["ethics"],
+                                        created.strftime("%Y-%m-%d %H:%M:%S"))])
+    store.flush()
+    elapsed = time.perf_counter() - start
+    print(f"stored {args.rows} snapshots in {elapsed:.1f}s ({args.rows / elapsed:.0f} rows/s)")
+
+    queries = {
+        "Animal Research below BSL-2, Q4": dict(research_type="Animal Research", below_bsl="BSL-2",
+                                                 since="2026-10-01", until="2027-01-01"),
+        "violations this week": dict(status="violation", since="2026-12-24", until="2026-12-31"),
+        "latest 50 overall": dict(limit=50),
+    }
+    for label, filters in queries.items():
+        timings = []
+        for _ in range(5):
+            t0 = time.perf_counter()
+            rows = store.query(**filters)
+            timings.append(time.perf_counter() - t0)
+        print(f"{label:<36} {len(rows):>7} rows  {min(timings) * 1e3:8.2f} ms")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
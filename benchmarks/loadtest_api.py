@@ -0,0 +1,128 @@
+"""Load test for the HTTP API (ethixguard.server).
+
+Usage:
+    python benchmarks/loadtest_api.py [--requests 5000] [--connections 32]
+                                      [--endpoint evaluate ask evaluate/batch ask/batch]
+                                      [--url http://127.0.0.1:8765]
+
+Without --url an API server is started in-process on an ephemeral port.
+Each connection is a keep-alive client sending requests back to back; the
+harness reports requests per second and p50/p99/max latency per endpoint.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_batch import make_submissions
+from ethixguard.server import APIServer
+
+QUESTIONS = ["What is BSL-2?", "informed consent", "What is the 3Rs principle?", "gmo approval",
+             "how do I dispose of sharps", "privacy of participants", "IBSC", "biosecurity"]
+
+
+def make_bodies(endpoint, count, batch_size, seed=7):
+    """Pre-encode request bodies so the client measures the server, not json.dumps."""
+    rng = random.Random(seed)
+    submissions = list(make_submissions(max(count, batch_size), seed))
+    bodies = []
+    for i in range(count):
+        if endpoint == "evaluate":
+            payload = dict(submissions[i])
+        elif endpoint == "evaluate/batch":
+            payload = {"submissions": rng.sample(submissions, batch_size), "report": False}
+        elif endpoint == "ask":
+            payload = {"question": rng.choice(QUESTIONS)}
+        else:
+            payload = {"questions": [rng.choice(QUESTIONS) for _ in range(batch_size)]}
+        bodies.append(json.dumps(payload).encode("utf-8"))
+    return bodies
+
+
+async def client(host, port, path, bodies, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for body in bodies:
+            request = (f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                       f"Content-Length: {len(body)}\r\n\r\n").encode("latin-1") + body
+            start = time.perf_counter()
+            writer.write(request)
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n")[1:]:
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            if not head.startswith(b"HTTP/1.1 200"):
+                errors.append(head.split(b"\r\n", 1)[0].decode("latin-1"))
+    finally:
+        writer.close()
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+async def run_endpoint(host, port, endpoint, requests, connections, batch_size):
+    bodies = make_bodies(endpoint, requests, batch_size)
+    latencies, errors = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, "/" + endpoint, bodies[i::connections], latencies, errors)
+                           for i in range(connections)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "endpoint": endpoint,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "max_ms": latencies[-1] * 1000 if latencies else 0.0,
+    }
+
+
+async def run(args):
+    server = None
+    if args.url:
+        parts = urlsplit(args.url)
+        host, port = parts.hostname, parts.port or 80
+    else:
+        server = await APIServer("127.0.0.1", 0, max_concurrency=args.max_concurrency).start()
+        host, port = server.host, server.port
+    try:
+        print(f"{'endpoint':<16}{'requests':>10}{'errors':>8}{'req/s':>10}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+        for endpoint in args.endpoint:
+            result = await run_endpoint(host, port, endpoint, args.requests, args.connections, args.batch_size)
+            print(f"{result['endpoint']:<16}{result['requests']:>10}{result['errors']:>8}{result['rps']:>10.0f}"
+                  f"{result['p50_ms']:>9.2f}{result['p99_ms']:>9.2f}{result['max_ms']:>9.2f}")
+    finally:
+        if server is not None:
+            await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000, help="requests per endpoint")
+    parser.add_argument("--connections", type=int, default=32, help="concurrent keep-alive connections")
+    parser.add_argument("--batch-size", type=int, default=50, help="items per batch request")
+    parser.add_argument("--endpoint", nargs="+", default=["evaluate", "ask", "evaluate/batch", "ask/batch"],
+                        choices=["evaluate", "ask", "evaluate/batch", "ask/batch"])
+    parser.add_argument("--max-concurrency", type=int, default=64,
+                        help="limit for the in-process server (ignored with --url)")
+    parser.add_argument("--url", help="test an already running server instead of starting one")
+    args = parser.parse_args(argv)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,425 @@
+"""Multi-session load and soak test of the Streamlit app, against a real server.
+
+Usage:
+    python benchmarks/soak_app.py [--sessions 8] [--duration 60] [--interval 10]
+                                  [--db soak.db] [--port 0] [--save soak.json]
+    python benchmarks/soak_app.py --url http://127.0.0.1:8501 [--sessions 8] ...
+
+Starts `streamlit run full_app.py` as a headless server in a subprocess (or
+uses the one at --url) and connects --sessions simulated users to it. Each
+user is a websocket client speaking the browser's protocol on
+/_stcore/stream: it sends a rerun request (BackMsg) with its widget values,
+reads the ForwardMsg deltas until the script has finished, fetches the
+images they reference, and takes the widgets for its next action from
+those deltas, as the browser does. The clients share one asyncio loop here,
+so the server sees independent sessions whose reruns overlap as they would
+with real users; the client side does little work per rerun, but give it a
+spare core when measuring a multi-core server. Each user walks through the
+real flow in main():
+
+    home           open the landing page
+    biosafety      open the checklist, change a few answers, save
+    ethics         open the form, switch research type, set the containment
+                   level and a few answers, save
+    report         open the report page and generate the report
+    chatbot        open the Guidance Assistant and ask a question
+    dashboard      open the institution dashboard
+
+Each step is one or more reruns; its latency is the time from sending the
+first request to the end of the last script run. Users loop through the
+flow until --duration seconds have passed. Every --interval seconds a line
+reports the step rate, the p95 step latency over that interval, the server
+process's RSS and the mean session-state size the app recorded over that
+interval (its ethixguard_session_state_bytes metric, sampled on every rerun
+for this test and read from the app's metrics endpoint). At the end the
+latency percentiles per step and the RSS growth are printed; --save writes
+them as JSON. With --url, RSS and session-state size are not available.
+
+Submissions of a started server go to a fresh SQLite store (--db, default
+a temporary file).
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from urllib.parse import urljoin, urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+APP = os.path.join(ROOT, "full_app.py")
+
+STEPS = ("home", "biosafety", "ethics", "report", "chatbot", "dashboard")
+
+QUESTIONS = ["What is IBSC?", "Do I need GEAC approval?", "informed consent requirements",
+             "tell me about rcgm", "what are the 3Rs", "biosaftey levels", "how do I dispose of sharps",
+             "who approves animal experiments", "containment level for GMOs"]
+
+# Element types the clients interact with
+WIDGETS = ("radio", "selectbox", "button", "chat_input")
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def rss_bytes(pid):
+    """Resident set size of process `pid` (None if it cannot be read)."""
+    try:
+        with open(f"/proc/{pid}/statm") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        output = subprocess.run(["ps", "-o", "rss=", "-p", str(pid)], capture_output=True, text=True).stdout
+        return int(output) * 1024
+    except (OSError, ValueError):
+        return None
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def fetch(url, timeout=10):
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return response.read()
+
+
+class Server:
+    """`streamlit run full_app.py` in a subprocess, with the app's metrics endpoint enabled."""
+
+    def __init__(self, port, db):
+        self.port = port or free_port()
+        self.metrics_port = free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self.metrics_url = f"http://127.0.0.1:{self.metrics_port}/metrics"
+        env = dict(os.environ, ETHIXGUARD_DB=db, ETHIXGUARD_METRICS_PORT=str(self.metrics_port),
+                   ETHIXGUARD_METRICS_SESSION_SAMPLE="1")
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "streamlit", "run", APP, "--server.headless", "true",
+             "--server.address", "127.0.0.1", "--server.port", str(self.port),
+             "--server.fileWatcherType", "none", "--browser.gatherUsageStats", "false"],
+            cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+    @property
+    def pid(self):
+        return self.process.pid
+
+    def wait_ready(self, timeout=60):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"streamlit exited with {self.process.returncode}:\n"
+                                   f"{self.process.stderr.read().decode(errors='replace')}")
+            try:
+                fetch(f"{self.url}/_stcore/health", timeout=1)
+                return self
+            except OSError:
+                time.sleep(0.2)
+        raise RuntimeError(f"streamlit did not answer on {self.url} within {timeout}s")
+
+    def session_state_totals(self):
+        """(sum, count) of the app's session-state size samples so far."""
+        totals = {}
+        for line in fetch(self.metrics_url).decode("utf-8").splitlines():
+            name, _, value = line.partition(" ")
+            if name in ("ethixguard_session_state_bytes_sum", "ethixguard_session_state_bytes_count"):
+                totals[name.rsplit("_", 1)[1]] = float(value)
+        return totals.get("sum", 0.0), totals.get("count", 0.0)
+
+    def stop(self):
+        self.process.terminate()
+        try:
+            self.process.wait(10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+
+
+class Session:
+    """One simulated user: a websocket session of the app and the steps it walks through."""
+
+    def __init__(self, url, index, seed):
+        from ethixguard.checklists import get_checklists
+
+        self.url = url
+        self.index = index
+        self.rng = random.Random(seed)
+        self.checklists = get_checklists()
+        self.websocket = None
+        # Widgets of the last script run as (element type, proto), and the values this user set
+        self.widgets = []
+        self.values = {}
+
+    async def connect(self):
+        from websockets.asyncio.client import connect
+
+        parts = urlsplit(self.url)
+        scheme = "wss" if parts.scheme == "https" else "ws"
+        self.websocket = await connect(f"{scheme}://{parts.netloc}{parts.path.rstrip('/')}/_stcore/stream",
+                                       subprotocols=["streamlit"], max_size=None)
+        await self.rerun()
+
+    async def close(self):
+        if self.websocket is not None:
+            await self.websocket.close()
+
+    async def rerun(self, trigger=None):
+        """Send the widget values (and a one-off trigger) and wait until the script run ends."""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        mounted = {widget.id for _, widget in self.widgets}
+        request = BackMsg()
+        request.rerun_script.query_string = ""
+        states = request.rerun_script.widget_states.widgets
+        states.extend(state for widget_id, state in self.values.items() if widget_id in mounted)
+        if trigger is not None:
+            states.append(trigger)
+        await self.websocket.send(request.SerializeToString())
+
+        widgets, images, errors = [], [], []
+        while True:
+            message = ForwardMsg()
+            message.ParseFromString(await self.websocket.recv())
+            kind = message.WhichOneof("type")
+            if kind == "delta" and message.delta.WhichOneof("type") == "new_element":
+                element = message.delta.new_element
+                element_type = element.WhichOneof("type")
+                if element_type in WIDGETS:
+                    widgets.append((element_type, getattr(element, element_type)))
+                elif element_type == "imgs":
+                    images.extend(image.url for image in element.imgs.imgs)
+                elif element_type == "exception":
+                    errors.append(element.exception.message)
+            elif kind == "script_finished" and message.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                break
+        if errors:
+            raise RuntimeError(errors[0])
+        self.widgets = widgets
+        # The browser loads images from the media endpoint after the deltas arrive
+        for url in images:
+            await asyncio.to_thread(fetch, urljoin(self.url + "/", url.lstrip("/")))
+
+    def find(self, element_type, label=None, key=None):
+        for kind, widget in self.widgets:
+            if kind == element_type and (label is None or widget.label == label) \
+                    and (key is None or widget.id.endswith(f"-{key}")):
+                return widget
+        raise LookupError(f"no {element_type} with label={label!r} key={key!r} on the page")
+
+    async def set_value(self, element_type, value, label=None, key=None):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        widget = self.find(element_type, label, key)
+        self.values[widget.id] = WidgetState(id=widget.id, string_value=value)
+        await self.rerun()
+
+    async def click(self, label):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        await self.rerun(WidgetState(id=self.find("button", label=label).id, trigger_value=True))
+
+    async def navigate(self, page):
+        await self.set_value("radio", page, label="Go to")
+
+    async def home(self):
+        await self.navigate("Home")
+
+    async def biosafety(self):
+        rng = self.rng
+        await self.navigate("Biosafety Compliance")
+        for question in rng.sample(self.checklists.biosafety_questions, 3):
+            await self.set_value("radio", rng.choice(question.options), key=f"biosafety:{question.key}")
+        await self.click("Save Biosafety Responses")
+
+    async def ethics(self):
+        rng, checklists = self.rng, self.checklists
+        await self.navigate("Ethics Evaluation")
+        research_type = rng.choice(checklists.research_types)
+        await self.set_value("selectbox", research_type, key="ethics:research_type")
+        containment = checklists.containment_question
+        await self.set_value("radio", rng.choice(containment.options), key=f"ethics:{containment.key}")
+        questions = checklists.ethics_questions[research_type]
+        for question in rng.sample(questions, min(2, len(questions))):
+            await self.set_value("radio", rng.choice(question.options), key=f"ethics:{question.key}")
+        await self.click("Save Ethics Responses")
+
+    async def report(self):
+        await self.navigate("Generate Report")
+        await self.click("Generate Compliance Report")
+
+    async def chatbot(self):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        await self.navigate("Guidance Assistant")
+        trigger = WidgetState(id=self.find("chat_input").id)
+        trigger.chat_input_value.data = self.rng.choice(QUESTIONS)
+        await self.rerun(trigger)
+
+    async def dashboard(self):
+        await self.navigate("Institution Dashboard")
+
+
+class Soak:
+    def __init__(self, url, sessions, duration, interval, seed, server=None):
+        self.url = url
+        self.server = server
+        self.sessions = sessions
+        self.duration = duration
+        self.interval = interval
+        self.seed = seed
+        self.latencies = {step: [] for step in STEPS}
+        self.errors = []
+        self.stop = asyncio.Event()
+
+    async def run_session(self, index):
+        session = Session(self.url, index, self.seed + index)
+        try:
+            await session.connect()
+            while not self.stop.is_set():
+                for step in STEPS:
+                    start = time.perf_counter()
+                    await getattr(session, step)()
+                    self.latencies[step].append((time.monotonic(), time.perf_counter() - start))
+                    if self.stop.is_set():
+                        break
+        except Exception as exc:
+            self.errors.append(f"session {index}: {exc!r}")
+            self.stop.set()
+        finally:
+            await session.close()
+
+    def window(self, since):
+        return [elapsed for entries in self.latencies.values() for at, elapsed in entries if at >= since]
+
+    def rss(self):
+        return rss_bytes(self.server.pid) if self.server else None
+
+    async def state_totals(self):
+        if self.server is None:
+            return None
+        try:
+            return await asyncio.to_thread(self.server.session_state_totals)
+        except OSError:
+            return None
+
+    async def run(self):
+        rss_start = self.rss()
+        tasks = [asyncio.create_task(self.run_session(i)) for i in range(self.sessions)]
+        start = time.monotonic()
+
+        timeline = []
+        print(f"{'elapsed':>8}{'steps/s':>9}{'p95 step':>11}{'rss MiB':>9}{'state KiB':>11}")
+        last, last_totals = start, await self.state_totals()
+        while not self.stop.is_set() and time.monotonic() - start < self.duration:
+            try:
+                await asyncio.wait_for(self.stop.wait(),
+                                       min(self.interval, max(0.0, start + self.duration - time.monotonic())))
+            except asyncio.TimeoutError:
+                pass
+            now = time.monotonic()
+            recent = self.window(last)
+            totals = await self.state_totals()
+            state = None
+            # The metrics endpoint only comes up with the first script run
+            base = last_totals or (0.0, 0.0)
+            if totals and totals[1] > base[1]:
+                state = (totals[0] - base[0]) / (totals[1] - base[1])
+            point = {
+                "elapsed_s": now - start,
+                "steps_per_s": len(recent) / (now - last) if now > last else 0.0,
+                "p95_s": percentile(recent, 0.95) if recent else None,
+                "rss_bytes": self.rss(),
+                "state_bytes": state,
+            }
+            timeline.append(point)
+            p95 = f"{point['p95_s'] * 1000:.0f} ms" if recent else "-"
+            rss = f"{point['rss_bytes'] / 2**20:.1f}" if point["rss_bytes"] else "-"
+            state = f"{state / 1024:.1f}" if state is not None else "-"
+            print(f"{point['elapsed_s']:>7.0f}s{point['steps_per_s']:>9.1f}{p95:>11}{rss:>9}{state:>11}", flush=True)
+            last, last_totals = now, totals
+        self.stop.set()
+        await asyncio.gather(*tasks)
+
+        summary = {}
+        for step, entries in self.latencies.items():
+            values = [elapsed for _, elapsed in entries]
+            if values:
+                summary[step] = {"count": len(values), "p50_s": percentile(values, 0.5),
+                                 "p95_s": percentile(values, 0.95), "p99_s": percentile(values, 0.99),
+                                 "max_s": max(values)}
+        return {
+            "sessions": self.sessions,
+            "url": self.url,
+            "duration_s": time.monotonic() - start,
+            "rss_start_bytes": rss_start,
+            "rss_end_bytes": self.rss(),
+            "steps": summary,
+            "timeline": timeline,
+            "errors": self.errors,
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=8, help="concurrent simulated users")
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds to keep the sessions running")
+    parser.add_argument("--interval", type=float, default=10.0, help="seconds between progress lines")
+    parser.add_argument("--url", help="drive an already running app instead of starting one")
+    parser.add_argument("--port", type=int, default=0, help="port of the started server (default: a free one)")
+    parser.add_argument("--db", help="SQLite store of the started server (default: a temporary file)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--save", help="write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        server = None
+        if not args.url:
+            server = Server(args.port, args.db or os.path.join(tmp, "soak.db")).wait_ready()
+        try:
+            soak = Soak(args.url or server.url, args.sessions, args.duration, args.interval, args.seed, server)
+            result = asyncio.run(soak.run())
+        finally:
+            if server is not None:
+                server.stop()
+
+    print()
+    print(f"{'step':<12}{'count':>8}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}")
+    for step, stats in result["steps"].items():
+        print(f"{step:<12}{stats['count']:>8}" + "".join(
+            f"{stats[key] * 1000:>7.0f} ms" for key in ("p50_s", "p95_s", "p99_s", "max_s")))
+    if result["rss_end_bytes"]:
+        # Growth after the first interval, once imports and session start-up are done
+        warm = result["timeline"][0]["rss_bytes"] if result["timeline"] else result["rss_start_bytes"]
+        growth = result["rss_end_bytes"] - warm
+        print(f"Server RSS: {result['rss_start_bytes'] / 2**20:.1f} MiB at start, {warm / 2**20:.1f} MiB after "
+              f"the first interval, {result['rss_end_bytes'] / 2**20:.1f} MiB at the end ({growth / 2**20:+.1f} MiB)")
+    sizes = [point["state_bytes"] for point in result["timeline"] if point["state_bytes"] is not None]
+    if sizes:
+        print(f"session state: mean {statistics.mean(sizes) / 1024:.1f} KiB, "
+              f"last interval {sizes[-1] / 1024:.1f} KiB")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as handle:
+            json.dump(result, handle, indent=2)
+        print(f"Saved results to {args.save}")
+    for error in result["errors"]:
+        print(f"ERROR {error}", file=sys.stderr)
+    return 1 if result["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
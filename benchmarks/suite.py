@@ -0,0 +1,257 @@
+"""Reproducible benchmark suite with saved results and a regression check.
+
+Usage:
+    python benchmarks/suite.py [--only micro pages] [--quick]
+                               [--save results.json]
+                               [--compare baseline.json] [--threshold 0.25]
+
+Two groups of benchmarks:
+
+    micro   KeywordMatcher.lookup over synthetic knowledge bases of growing
+            size, get_response on the real knowledge base (repeated and
+            uncached questions), and
+            generate_report / every download format / incremental updates
+            over submissions with a growing number of questions.
+    pages   Full script reruns of each page, measured with Streamlit's
+            headless AppTest harness (forms filled in, report generated,
+            chat history of growing length).
+
+Every benchmark reports the median and minimum seconds per call over
+several repeats. --save writes them as JSON with some context about the
+machine. --compare loads an earlier file and exits with status 1 if any
+median is more than --threshold (a fraction) slower than it was there.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_batch import BIOSAFETY_QUESTIONS, ETHICS_QUESTIONS
+from bench_matcher import make_knowledge_base, make_queries
+
+APP = os.path.join(ROOT, "full_app.py")
+
+
+def measure(fn, repeat=5, number=1):
+    """Median and minimum seconds per call of fn() over `repeat` rounds of `number` calls."""
+    fn()  # warm-up: imports, lazy singletons, caches
+    rounds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        rounds.append((time.perf_counter() - start) / number)
+    return {"median_s": statistics.median(rounds), "min_s": min(rounds),
+            "repeat": repeat, "number": number}
+
+
+def make_submission(questions, rng):
+    """A submission with `questions` biosafety and ethics answers each."""
+    options = list(BIOSAFETY_QUESTIONS.items())
+    biosafety = {}
+    for i in range(questions):
+        question, answers = options[i % len(options)]
+        biosafety[f"{question} {i}" if i >= len(options) else question] = rng.choice(answers)
+    ethics = {"Research Type": "Animal Research", "Containment Level": rng.choice(["BSL-1", "BSL-2"])}
+    for i in range(questions):
+        question = ETHICS_QUESTIONS[i % len(ETHICS_QUESTIONS)]
+        ethics[f"{question} {i}" if i >= len(ETHICS_QUESTIONS) else question] = rng.choice(["Yes", "No", "Partially"])
+    return biosafety, ethics
+
+
+# Micro-benchmarks
+
+def bench_micro(quick):
+    from ethixguard.assistant import get_response
+    from ethixguard.cache import query_cache
+    from ethixguard.evaluation import generate_report
+    from ethixguard.incremental import EvaluationState
+    from ethixguard.knowledge import knowledge_base
+    from ethixguard.matcher import KeywordMatcher
+    from ethixguard.renderers import FORMATS, render_to
+
+    results = {}
+    repeat = 3 if quick else 7
+
+    for size in ([100, 1000] if quick else [100, 1000, 10000]):
+        rng = random.Random(7)
+        synthetic = make_knowledge_base(size, rng)
+        queries = make_queries(synthetic, 150, rng)
+        results[f"matcher.build[keys={size}]"] = measure(lambda: KeywordMatcher(synthetic), repeat)
+        matcher = KeywordMatcher(synthetic)
+        timing = measure(lambda: [matcher.lookup(q) for q in queries], repeat)
+        results[f"matcher.lookup[keys={size}]"] = per_item(timing, len(queries))
+
+    questions = ["What is IBSC?", "informed consent requirements", "tell me about rcgm",
+                 "how do I dispose of sharps", "biosaftey levels"]
+    timing = measure(lambda: [get_response(q) for q in questions], repeat, number=20)
+    results[f"get_response[keys={len(knowledge_base)}]"] = per_item(timing, len(questions))
+    # Every question new to the query cache: normalization and matching each time
+    timing = measure(lambda: [(query_cache.clear(), get_response(q)) for q in questions], repeat, number=20)
+    results[f"get_response.uncached[keys={len(knowledge_base)}]"] = per_item(timing, len(questions))
+
+    for count in ([10, 100] if quick else [10, 100, 1000]):
+        biosafety, ethics = make_submission(count, random.Random(count))
+        results[f"report.generate[questions={count}]"] = measure(
+            lambda: generate_report(biosafety, ethics, "2024-01-01 00:00:00"), repeat, number=5)
+        for fmt in FORMATS:
+            results[f"report.{fmt}[questions={count}]"] = measure(
+                lambda: render_to(fmt, biosafety, ethics, io.BytesIO(), "2024-01-01 00:00:00"), repeat, number=5)
+
+        # One changed answer: incremental update + live score vs. full re-evaluation
+        state = EvaluationState.from_data(biosafety, ethics)
+        question = next(iter(biosafety))
+        flip = iter(["No", "Yes"] * 10 ** 6)
+        results[f"incremental.update[questions={count}]"] = measure(
+            lambda: (state.set_answer("biosafety", question, next(flip)), state.compliance_pct()), repeat, number=100)
+        results[f"incremental.markdown[questions={count}]"] = measure(
+            lambda: state.markdown("2024-01-01 00:00:00"), repeat, number=5)
+    return results
+
+
+def per_item(timing, items):
+    return dict(timing, median_s=timing["median_s"] / items, min_s=timing["min_s"] / items)
+
+
+# Page reruns
+
+def fill_forms(at):
+    """Save the biosafety and ethics forms so the report page has data."""
+    at.sidebar.radio[0].set_value("Biosafety Compliance").run()
+    next(b for b in at.button if b.label == "Save Biosafety Responses").click().run()
+    at.sidebar.radio[0].set_value("Ethics Evaluation").run()
+    at.selectbox[0].set_value("Animal Research").run()
+    next(r for r in at.radio if r.label.startswith("What containment")).set_value("BSL-1").run()
+    next(b for b in at.button if b.label == "Save Ethics Responses").click().run()
+
+
+def check(at):
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return at
+
+
+def bench_pages(quick):
+    # Keep the timings free of disk writes to the submission store
+    os.environ["ETHIXGUARD_DB"] = ""
+    from streamlit.testing.v1 import AppTest
+
+    at = check(AppTest.from_file(APP, default_timeout=60).run())
+    fill_forms(at)
+    check(at)
+
+    results = {}
+    repeat = 3 if quick else 7
+
+    for label, name in [("Home", "home"), ("Biosafety Compliance", "biosafety"),
+                        ("Ethics Evaluation", "ethics"), ("Institution Dashboard", "dashboard")]:
+        at.sidebar.radio[0].set_value(label).run()
+        results[f"page.{name}"] = measure(lambda: check(at.run()), repeat)
+
+    at.sidebar.radio[0].set_value("Generate Report").run()
+    # The report is only built on the run triggered by the click, so click every time
+    results["page.report"] = measure(
+        lambda: check(next(b for b in at.button if b.label == "Generate Compliance Report").click().run()),
+        repeat)
+
+    at.sidebar.radio[0].set_value("Guidance Assistant").run()
+    asked = 0
+    for history in ([0, 20] if quick else [0, 20, 100]):
+        while asked < history:
+            at.chat_input[0].set_value(f"what is ibsc {asked}?").run()
+            asked += 1
+        results[f"page.chatbot[messages={2 * history}]"] = measure(lambda: check(at.run()), repeat)
+    return results
+
+
+GROUPS = {"micro": bench_micro, "pages": bench_pages}
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, threshold):
+    """Return (name, old, new) for every median that regressed beyond `threshold`."""
+    regressions = []
+    for name, result in results.items():
+        old = baseline.get(name)
+        if old and result["median_s"] > old["median_s"] * (1 + threshold):
+            regressions.append((name, old["median_s"], result["median_s"]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", nargs="+", choices=list(GROUPS), default=list(GROUPS))
+    parser.add_argument("--quick", action="store_true", help="fewer sizes and repeats")
+    parser.add_argument("--save", help="write results to this JSON file")
+    parser.add_argument("--compare", help="JSON results of an earlier run to check against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown of a median before it counts as a regression")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for group in args.only:
+        results.update(GROUPS[group](args.quick))
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as handle:
+            baseline = json.load(handle)["results"]
+
+    print(f"{'benchmark':<36}{'median':>12}{'min':>12}{'baseline':>12}{'change':>9}")
+    for name, result in results.items():
+        old = baseline.get(name)
+        change = f"{result['median_s'] / old['median_s'] - 1:>+8.0%}" if old else ""
+        reference = format_seconds(old["median_s"]) if old else ""
+        print(f"{name:<36}{format_seconds(result['median_s']):>12}{format_seconds(result['min_s']):>12}"
+              f"{reference:>12}{change:>9}")
+
+    if args.save:
+        document = {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "quick": args.quick,
+            "results": results,
+        }
+        with open(args.save, "w", encoding="utf-8") as handle:
+            json.dump(document, handle, indent=2)
+        print(f"Saved {len(results)} results to {args.save}")
+
+    if args.compare:
+        regressions = compare(results, baseline, args.threshold)
+        for name, old, new in regressions:
+            print(f"REGRESSION {name}: {format_seconds(old)} -> {format_seconds(new)}", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} against {args.compare}")
+    return 0
+
+
+def format_seconds(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,23 @@
+"""Core building blocks for the EthixGuard compliance app.
+
+Importing the package is cheap: nothing touches Streamlit, and the public
+helpers below are only imported from their submodules on first access.
+"""
+import importlib
+
+_EXPORTS = {
+    "evaluate": "ethixguard.evaluation",
+    "generate_report": "ethixguard.evaluation",
+    "score_submission": "ethixguard.evaluation",
+    "get_response": "ethixguard.assistant",
+    "answer_stream": "ethixguard.ask",
+    "knowledge_base": "ethixguard.knowledge",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name]), name)
+    raise AttributeError(f"module 'ethixguard' has no attribute {name!r}")
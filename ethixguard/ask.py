@@ -0,0 +1,200 @@
+"""Headless bulk question answering for the Guidance Assistant.
+
+    python -m ethixguard.ask questions.txt --out answers.jsonl --workers 8
+
+Input is plain text with one question per line, JSONL with a "question"
+field (and an optional "id"), or CSV with a `question` column (and an
+optional `id` column). Output is JSONL {"id", "question", "answer"} or CSV
+with the same columns.
+
+Each answer is exactly what get_response would return, but questions are
+deduplicated first. They are keyed like the assistant's query cache, on
+their normalized text (see ethixguard.assistant.query_key), so "What is
+IBSC?" and "what is ibsc" are answered once and only unseen keys are sent
+to the workers. The keyword matcher and the guideline index are loaded
+before the pool starts, so forked workers share them instead of each
+building their own. Input is read in blocks, at most two blocks per worker
+are in flight, and answers come back in input order.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from ethixguard.assistant import (ANSWERS, DEFAULT_RESPONSE, guideline_answer, load_guidelines, load_matcher,
+                                  query_key)
+
+def read_questions(path):
+    """Yield (id, question) pairs from a text, JSONL or CSV file ("-" for text on stdin)."""
+    if path == "-":
+        yield from _read_text(sys.stdin)
+        return
+    with open(path, newline="", encoding="utf-8") as handle:
+        if path.endswith(".csv"):
+            for row_no, row in enumerate(csv.DictReader(handle), 1):
+                yield row.get("id") or row_no, row["question"]
+        elif path.endswith(".jsonl"):
+            for line_no, line in enumerate(handle, 1):
+                if line.strip():
+                    record = json.loads(line)
+                    yield record.get("id", line_no), record["question"]
+        else:
+            yield from _read_text(handle)
+
+
+def _read_text(handle):
+    for line_no, line in enumerate(handle, 1):
+        question = line.strip()
+        if question:
+            yield line_no, question
+
+
+def _answer_chunk(jobs, top_k):
+    """Resolve (key, question) jobs to ("matcher", key), ("guidelines", text) or ("default", None).
+
+    Matcher hits come back as the knowledge base key, not the answer, so the
+    result stays small to pickle and the answer strings stay shared.
+    """
+    matcher = load_matcher()
+    results = []
+    for key, question in jobs:
+        match = matcher.match(key if isinstance(key, str) else key[0])
+        if match is not None:
+            results.append(("matcher", match))
+            continue
+        answer = guideline_answer(question, top_k=top_k)
+        results.append(("default", None) if answer is None else ("guidelines", answer))
+    return results
+
+
+def _init_worker():
+    # No-ops for forked workers; other start methods build them once per worker
+    load_matcher()
+    load_guidelines()
+
+
+def _blocks(questions, blocksize, answers, queued, top_k):
+    """Yield (block, jobs): up to `blocksize` (id, question, key) entries and the unseen keys among them.
+
+    Keys sent to the workers are tracked in `queued` until _emit stores their
+    answer, so `answers` only ever holds finished answers, even if the
+    stream is closed early.
+    """
+    block, jobs = [], []
+    for item_id, question in questions:
+        key = query_key(question, top_k)
+        if key not in answers and key not in queued:
+            queued.add(key)
+            jobs.append((key, question))
+        block.append((item_id, question, key))
+        if len(block) == blocksize:
+            yield block, jobs
+            block, jobs = [], []
+    if block:
+        yield block, jobs
+
+
+def _emit(block, jobs, results, answers, queued):
+    knowledge_base = load_matcher().knowledge_base
+    for (key, _), (source, value) in zip(jobs, results):
+        ANSWERS.inc(source=source)
+        if source == "matcher":
+            answers[key] = knowledge_base[value]
+        else:
+            answers[key] = DEFAULT_RESPONSE if value is None else value
+        queued.discard(key)
+    for item_id, question, key in block:
+        yield item_id, question, answers[key]
+
+
+def answer_stream(questions, workers=None, blocksize=256, top_k=1, answers=None):
+    """Yield (id, question, answer) for (id, question) pairs, in input order.
+
+    `answers` maps dedup keys to answers; pass a dict to share answers
+    between calls. With more than one worker, blocks of `blocksize` questions
+    are read ahead and their unseen keys answered in a process pool.
+    """
+    workers = workers or os.cpu_count() or 1
+    answers = {} if answers is None else answers
+    # Load before forking so every worker inherits the same matcher and index
+    _init_worker()
+    queued = set()
+    blocks = _blocks(iter(questions), blocksize, answers, queued, top_k)
+    if workers == 1:
+        for block, jobs in blocks:
+            yield from _emit(block, jobs, _answer_chunk(jobs, top_k), answers, queued)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        pending = deque()
+        while True:
+            while len(pending) < workers * 2:
+                block, jobs = next(blocks, (None, None))
+                if block is None:
+                    break
+                pending.append((block, jobs, pool.submit(_answer_chunk, jobs, top_k) if jobs else None))
+            if not pending:
+                return
+            block, jobs, future = pending.popleft()
+            yield from _emit(block, jobs, future.result() if future else (), answers, queued)
+
+
+def answer_all(questions, top_k=1):
+    """Answers for a list of questions, in order, computed in this process."""
+    return [answer for _, _, answer in answer_stream(enumerate(questions), workers=1, top_k=top_k)]
+
+
+def write_jsonl(results, handle):
+    for item_id, question, answer in results:
+        handle.write(json.dumps({"id": item_id, "question": question, "answer": answer}, ensure_ascii=False) + "\n")
+        yield item_id
+
+
+def write_csv(results, handle):
+    writer = csv.writer(handle)
+    writer.writerow(["id", "question", "answer"])
+    for item_id, question, answer in results:
+        writer.writerow([item_id, question, answer])
+        yield item_id
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m ethixguard.ask",
+                                     description="Answer a file of questions with the Guidance Assistant.")
+    parser.add_argument("input", help="text, JSONL or CSV questions file, or - for text on stdin")
+    parser.add_argument("--out", default="-", help="output file (default: stdout)")
+    parser.add_argument("--format", choices=["jsonl", "csv"],
+                        help="output format (default: from --out extension, else jsonl)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--blocksize", type=int, default=256)
+    parser.add_argument("--top-k", type=int, default=1, help="guideline paragraphs per fallback answer")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ("csv" if args.out.endswith(".csv") else "jsonl")
+    workers = args.workers or os.cpu_count() or 1
+
+    handle = sys.stdout if args.out == "-" else open(args.out, "w", newline="", encoding="utf-8")
+    start = time.perf_counter()
+    answers = {}
+    count = 0
+    try:
+        results = answer_stream(read_questions(args.input), workers=workers, blocksize=args.blocksize,
+                                top_k=args.top_k, answers=answers)
+        writer = write_csv if fmt == "csv" else write_jsonl
+        for _ in writer(results, handle):
+            count += 1
+    finally:
+        if handle is not sys.stdout:
+            handle.close()
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed else 0.0
+    print(f"Answered {count} questions ({len(answers)} unique) in {elapsed:.2f}s "
+          f"({rate:.0f}/s, {workers} workers)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Image assets: decoded once per process, served as resized, recompressed variants.
+
+    asset = get_asset("biosafety&hazard.png")
+    variant = asset.variant(960)              # JPEG (or PNG if the image has transparency)
+    variant = asset.variant(640, "WEBP")
+    variant.data, variant.mimetype, variant.etag
+
+The source file is read and decoded on first use. Each (width, format)
+variant is encoded on first request and then kept in memory, so later
+visits reuse the same bytes object; `etag` is a digest of those bytes.
+Variants are never wider than the source. An alpha channel that is fully
+opaque is dropped, so such images can be served as JPEG.
+
+Assets are looked up relative to ETHIXGUARD_ASSETS_DIR (default: the
+directory holding full_app.py). To produce the variants ahead of time, with
+the digest in the file name for long-lived caching behind a static server:
+
+    python -m ethixguard.assets build "biosafety&hazard.png" --out static/
+"""
+import argparse
+import hashlib
+import io
+import os
+import threading
+import time
+from collections import namedtuple
+from functools import lru_cache
+
+ASSETS_DIR = os.environ.get("ETHIXGUARD_ASSETS_DIR",
+                            os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Widths `build` produces for every format
+WIDTHS = (480, 960, 1440)
+FORMATS = ("JPEG", "WEBP", "PNG")
+EXTENSIONS = {"JPEG": "jpg", "WEBP": "webp", "PNG": "png"}
+
+# Encoder settings per format
+QUALITY = {"JPEG": {"quality": 82, "optimize": True, "progressive": True},
+           "WEBP": {"quality": 80, "method": 4},
+           "PNG": {"optimize": True}}
+
+Variant = namedtuple("Variant", "data mimetype width height etag")
+
+
+class ImageAsset:
+    """One source image and the variants encoded from it so far."""
+
+    def __init__(self, path):
+        self.path = path
+        self.source_bytes = os.path.getsize(path)
+        self._image = None
+        self._variants = {}
+        self._lock = threading.Lock()
+
+    @property
+    def image(self):
+        if self._image is None:
+            from PIL import Image
+
+            with Image.open(self.path) as image:
+                image.load()
+            if image.mode in ("RGBA", "LA") and image.getchannel("A").getextrema()[0] == 255:
+                image = image.convert("RGB" if image.mode == "RGBA" else "L")
+            elif image.mode == "P":
+                image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+            self._image = image
+        return self._image
+
+    @property
+    def opaque(self):
+        return "A" not in self.image.getbands()
+
+    def default_format(self):
+        """JPEG unless the image needs its transparency."""
+        return "JPEG" if self.opaque else "PNG"
+
+    def variant(self, width=None, fmt=None):
+        """Encoded Variant at most `width` pixels wide (None = source width)."""
+        fmt = (fmt or self.default_format()).upper()
+        key = (width, fmt)
+        variant = self._variants.get(key)
+        if variant is None:
+            with self._lock:
+                variant = self._variants.get(key)
+                if variant is None:
+                    variant = self._variants[key] = self._encode(width, fmt)
+        return variant
+
+    def _encode(self, width, fmt):
+        from PIL import Image
+
+        image = self.image
+        if width and width < image.width:
+            image = image.resize((width, round(image.height * width / image.width)), Image.LANCZOS)
+        if fmt == "JPEG" and not self.opaque:
+            raise ValueError(f"{self.path} has transparency and cannot be encoded as JPEG")
+        buffer = io.BytesIO()
+        image.save(buffer, fmt, **QUALITY.get(fmt, {}))
+        data = buffer.getvalue()
+        return Variant(data, f"image/{fmt.lower()}", image.width, image.height,
+                       hashlib.sha256(data).hexdigest()[:16])
+
+
+@lru_cache(maxsize=None)
+def get_asset(name):
+    """The process-wide ImageAsset for a file in ASSETS_DIR."""
+    return ImageAsset(os.path.join(ASSETS_DIR, name))
+
+
+def build(name, out_dir, widths=WIDTHS, formats=FORMATS):
+    """Write every variant to `out_dir` as <stem>.<width>.<etag>.<ext>; returns [(path, Variant, seconds)]."""
+    os.makedirs(out_dir, exist_ok=True)
+    asset = get_asset(name)
+    stem = os.path.splitext(os.path.basename(name))[0]
+    written = []
+    for fmt in formats:
+        if fmt == "JPEG" and not asset.opaque:
+            continue
+        for width in sorted({min(width, asset.image.width) for width in widths}):
+            start = time.perf_counter()
+            variant = asset.variant(width, fmt)
+            elapsed = time.perf_counter() - start
+            path = os.path.join(out_dir, f"{stem}.{variant.width}.{variant.etag}.{EXTENSIONS[fmt]}")
+            with open(path, "wb") as handle:
+                handle.write(variant.data)
+            written.append((path, variant, elapsed))
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m ethixguard.assets",
+                                     description="Pre-build resized and recompressed image variants.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build_cmd = sub.add_parser("build", help="write every variant of an image to a directory")
+    build_cmd.add_argument("name", help=f"image file, relative to {ASSETS_DIR}")
+    build_cmd.add_argument("--out", required=True, help="output directory")
+    build_cmd.add_argument("--widths", type=int, nargs="+", default=list(WIDTHS))
+    build_cmd.add_argument("--formats", nargs="+", choices=FORMATS, default=list(FORMATS))
+    args = parser.parse_args(argv)
+
+    asset = get_asset(args.name)
+    print(f"{args.name}: {asset.image.width}x{asset.image.height}, {asset.source_bytes} bytes")
+    for path, variant, elapsed in build(args.name, args.out, args.widths, args.formats):
+        print(f"  {os.path.basename(path):<48}{len(variant.data):>10} bytes "
+              f"{len(variant.data) / asset.source_bytes:>7.1%}  {elapsed * 1000:>7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Guidance Assistant: answers questions from the knowledge base and guideline index.
+
+Answers are memoized in ethixguard.cache.query_cache, keyed on the
+normalized question, so a repeated question costs one dictionary lookup.
+Call reload_knowledge() after editing ethixguard/knowledge.py or
+rebuilding the guideline index; the cache notices the new data and drops
+its entries.
+"""
+import importlib
+import os
+import re
+from functools import lru_cache
+
+from ethixguard import knowledge
+from ethixguard.cache import query_cache
+from ethixguard.metrics import registry, timed
+
+# Guideline paragraphs indexed offline with `python -m ethixguard.retrieval build`
+GUIDELINES_INDEX = os.environ.get("ETHIXGUARD_INDEX", "guidelines_index")
+
+# Which stage answered each question; guidelines/default are matcher fallbacks,
+# cache counts repeats of any of them
+ANSWERS = registry.counter("ethixguard_assistant_answers_total",
+                           "Guidance Assistant answers by the stage that produced them.", ("source",))
+
+DEFAULT_RESPONSE = "I don't have specific information on that topic. Please ask about biosafety guidelines, ethics requirements, or approval processes for more targeted assistance."
+
+
+# Build the keyword matcher once per process, on first use
+@lru_cache(maxsize=None)
+def load_matcher():
+    from ethixguard.matcher import KeywordMatcher
+    return KeywordMatcher(knowledge.knowledge_base)
+
+
+# Memory-map the guideline index once per process; None if it was never built
+@lru_cache(maxsize=None)
+def load_guidelines():
+    from ethixguard.retrieval import load_index
+    return load_index(GUIDELINES_INDEX)
+
+
+# Re-read the knowledge base module and guideline index on next use
+def reload_knowledge():
+    importlib.reload(knowledge)
+    load_matcher.cache_clear()
+    load_guidelines.cache_clear()
+
+
+# Function to search the guideline documents, best paragraphs first
+def search_guidelines(user_input, top_k=5):
+    index = load_guidelines()
+    if index is None:
+        return []
+    return index.search(user_input, k=top_k)
+
+
+# Matcher input: lowercase, punctuation removed (memoized for repeated questions)
+@lru_cache(maxsize=4096)
+def normalize(user_input):
+    return re.sub(r'[^\w\s]', '', user_input.lower())
+
+
+# Cache key: questions with equal keys get the same answer. The matcher only
+# sees the normalized text; the guideline fallback tokenizes the raw question
+# (punctuation can split words normalizing would join), so with an index
+# loaded its tokens and top_k are part of the key too.
+def query_key(user_input, top_k=1):
+    processed = normalize(user_input)
+    if load_guidelines() is None:
+        return processed
+    from ethixguard.retrieval import tokenize
+    return processed, " ".join(tokenize(user_input)), top_k
+
+
+# Answer text built from the best guideline paragraphs, or None
+def guideline_answer(user_input, top_k=1):
+    hits = search_guidelines(user_input, top_k=top_k)
+    if not hits:
+        return None
+    return "\n\n".join(f"{text} (Source: {source})" for score, source, text in hits)
+
+
+# Function to get response from knowledge base
+@timed("assistant")
+def get_response(user_input, top_k=1):
+    matcher = load_matcher()
+    query_cache.bind((matcher, load_guidelines()))
+    key = query_key(user_input, top_k)
+    answer = query_cache.get(key)
+    if answer is not None:
+        ANSWERS.inc(source="cache")
+        return answer
+
+    # Direct phrase matches first, then close matches on single keywords
+    answer = matcher.lookup(normalize(user_input))
+    if answer is not None:
+        ANSWERS.inc(source="matcher")
+    else:
+        # Fall back to the ranked guideline paragraphs, if an index is available
+        answer = guideline_answer(user_input, top_k=top_k)
+        if answer is not None:
+            ANSWERS.inc(source="guidelines")
+        else:
+            # Default response if no match found
+            ANSWERS.inc(source="default")
+            answer = DEFAULT_RESPONSE
+    query_cache.put(key, answer)
+    return answer
@@ -0,0 +1,157 @@
+"""Headless bulk compliance scoring for stored submissions.
+
+    python -m ethixguard.batch submissions.jsonl --out results.jsonl --workers 8
+
+Input is JSONL with one submission per line:
+
+    {"id": "P-001", "biosafety": {"GMO Involvement": "Yes", ...},
+     "ethics": {"Research Type": "Animal Research", ...}}
+
+or CSV with an optional `id` column and one column per question, prefixed
+with its section (`biosafety:IBSC Approval`, `ethics:Containment Level`).
+Empty CSV cells are treated as unanswered.
+
+Submissions are read lazily, scored in chunks across a process pool with a
+fixed number of chunks in flight, and written out in input order as they
+complete, so memory stays flat however large the input is.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from ethixguard.checklists import SECTIONS, STATUSES
+from ethixguard.evaluation import evaluate, report_markdown
+
+
+def read_submissions(path):
+    """Yield {"id", "biosafety", "ethics"} dicts from a JSONL or CSV file ("-" for stdin)."""
+    if path == "-":
+        yield from _read_jsonl(sys.stdin)
+        return
+    with open(path, newline="", encoding="utf-8") as handle:
+        if path.endswith(".csv"):
+            yield from _read_csv(handle)
+        else:
+            yield from _read_jsonl(handle)
+
+
+def _read_jsonl(handle):
+    for line_no, line in enumerate(handle, 1):
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        yield {
+            "id": record.get("id", line_no),
+            "biosafety": record.get("biosafety", {}),
+            "ethics": record.get("ethics", {}),
+        }
+
+
+def _read_csv(handle):
+    for row_no, row in enumerate(csv.DictReader(handle), 1):
+        submission = {"id": row.pop("id", None) or row_no, "biosafety": {}, "ethics": {}}
+        for column, value in row.items():
+            section, _, question = column.partition(":")
+            if section in SECTIONS and question and value:
+                submission[section][question] = value
+        yield submission
+
+
+def evaluate_submission(submission, include_report=True):
+    """Score one submission; the result holds its id, counts and (optionally) report."""
+    evaluation = evaluate(submission["biosafety"], submission["ethics"])
+    result = {"id": submission["id"]}
+    result.update(evaluation.counts)
+    if include_report:
+        result["report"] = report_markdown(evaluation)
+    return result
+
+
+def _evaluate_chunk(chunk, include_report):
+    return [evaluate_submission(submission, include_report) for submission in chunk]
+
+
+def evaluate_stream(submissions, workers=None, chunksize=64, include_report=True):
+    """Yield evaluate_submission results in input order.
+
+    With more than one worker, chunks of `chunksize` submissions are handed
+    to a process pool and at most two chunks per worker are pending at any
+    time, so neither the input nor the output is ever fully materialised.
+    """
+    workers = workers or os.cpu_count() or 1
+    submissions = iter(submissions)
+    if workers == 1:
+        for submission in submissions:
+            yield evaluate_submission(submission, include_report)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        while True:
+            while len(pending) < workers * 2:
+                chunk = list(islice(submissions, chunksize))
+                if not chunk:
+                    break
+                pending.append(pool.submit(_evaluate_chunk, chunk, include_report))
+            if not pending:
+                return
+            yield from pending.popleft().result()
+
+
+def write_jsonl(results, handle):
+    for result in results:
+        handle.write(json.dumps(result, ensure_ascii=False) + "\n")
+        yield result
+
+
+def write_csv(results, handle):
+    writer = csv.writer(handle)
+    writer.writerow(["id"] + [f"{section}_{status}" for section in SECTIONS for status in STATUSES])
+    for result in results:
+        writer.writerow([result["id"]] + [result[section][status] for section in SECTIONS for status in STATUSES])
+        yield result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m ethixguard.batch",
+                                     description="Score stored submissions in bulk.")
+    parser.add_argument("input", help="JSONL or CSV submissions file, or - for JSONL on stdin")
+    parser.add_argument("--out", default="-", help="output file (default: stdout)")
+    parser.add_argument("--format", choices=["jsonl", "csv"],
+                        help="output format (default: from --out extension, else jsonl)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--chunksize", type=int, default=64)
+    parser.add_argument("--no-report", action="store_true", help="only emit the counts")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ("csv" if args.out.endswith(".csv") else "jsonl")
+    # CSV output only carries the counts, so skip rendering the report text
+    include_report = not args.no_report and fmt == "jsonl"
+    workers = args.workers or os.cpu_count() or 1
+
+    handle = sys.stdout if args.out == "-" else open(args.out, "w", newline="", encoding="utf-8")
+    start = time.perf_counter()
+    count = 0
+    try:
+        results = evaluate_stream(read_submissions(args.input), workers=workers,
+                                  chunksize=args.chunksize, include_report=include_report)
+        writer = write_csv if fmt == "csv" else write_jsonl
+        for _ in writer(results, handle):
+            count += 1
+    finally:
+        if handle is not sys.stdout:
+            handle.close()
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed else 0.0
+    print(f"Scored {count} submissions in {elapsed:.2f}s "
+          f"({rate:.0f}/s, {rate / workers:.0f}/s per core, {workers} workers)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
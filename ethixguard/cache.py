@@ -0,0 +1,312 @@
+"""Process-wide caches: generated reports and assistant answers.
+
+Entries are keyed by a stable hash of the (biosafety_data, ethics_data) pair,
+so two sessions that submit identical answers share one entry. The cache is
+a bounded LRU shared by every session in the server process and can also be
+persisted to a directory, so entries survive restarts:
+
+    ETHIXGUARD_REPORT_CACHE_SIZE=512          # entries in memory, and on disk (default 256)
+    ETHIXGUARD_REPORT_CACHE_DIR=/var/cache/ethixguard   # optional disk copy
+
+The directory is pruned to the same number of entries, least recently used
+(by file mtime, which disk hits refresh) first.
+
+Cached values must be JSON-serialisable when a directory is configured.
+
+QueryCache holds Guidance Assistant answers keyed on the normalized
+question, bounded by entry count and age:
+
+    ETHIXGUARD_QUERY_CACHE_SIZE=4096          # entries (default 1024, 0 disables)
+    ETHIXGUARD_QUERY_CACHE_TTL=600            # seconds (default 3600, 0 = no expiry)
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+from ethixguard.metrics import registry
+
+
+def submission_key(biosafety_data, ethics_data):
+    """Stable hex digest of a submission.
+
+    Question order is part of the key because it is part of the report; the
+    JSON encoding is canonical otherwise (fixed separators, escaped unicode).
+    """
+    payload = json.dumps([list(biosafety_data.items()), list(ethics_data.items())],
+                         separators=(",", ":"), ensure_ascii=True, default=str)
+    return hashlib.sha256(payload.encode("ascii")).hexdigest()
+
+
+class ReportCache:
+    """Thread-safe LRU of computed report entries with optional disk persistence."""
+
+    def __init__(self, maxsize=256, directory=None):
+        self.maxsize = maxsize
+        self.directory = directory
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+        value = self._load(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._remember(key, value)
+        return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._remember(key, value)
+        self._store(key, value)
+
+    def get_or_create(self, key, factory):
+        """Return the cached value for `key`, computing it with factory() on a miss."""
+        value = self.get(key)
+        if value is None:
+            value = factory()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        for path in self._disk_entries():
+            _remove(path)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "evictions": self.evictions,
+                "disk_evictions": self.disk_evictions,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+    def _remember(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".json")
+
+    def _load(self, key):
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as handle:
+                value = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        try:
+            # Mark it recently used, so pruning keeps it
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def _store(self, key, value):
+        if not self.directory:
+            return
+        # Write to a temp file first so readers never see a half-written entry
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(value, handle)
+            os.replace(tmp, self._path(key))
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            return
+        self._prune()
+
+    def _disk_entries(self):
+        if not self.directory:
+            return []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        return [os.path.join(self.directory, name) for name in names if name.endswith(".json")]
+
+    def _prune(self):
+        """Remove the least recently used files beyond maxsize."""
+        paths = self._disk_entries()
+        if len(paths) <= self.maxsize:
+            return
+        aged = []
+        for path in paths:
+            try:
+                aged.append((os.stat(path).st_mtime_ns, path))
+            except OSError:
+                pass  # removed by another process meanwhile
+        aged.sort()
+        for _, path in aged[:len(aged) - self.maxsize]:
+            if _remove(path):
+                with self._lock:
+                    self.disk_evictions += 1
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+class QueryCache:
+    """Thread-safe LRU of answers with a time-to-live, tied to the data that produced them.
+
+    bind(owner) is called with whatever the answers were computed from (the
+    loaded matcher and guideline index); when that changes, every entry is
+    dropped, so a reloaded knowledge base never serves stale answers.
+    """
+
+    def __init__(self, maxsize=1024, ttl=3600.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._owner = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def bind(self, owner):
+        if owner != self._owner:
+            with self._lock:
+                if self._owner is not None:
+                    self.invalidations += 1
+                self._entries.clear()
+                self._owner = owner
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires = entry
+            if expires and expires < time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        if not self.maxsize:
+            return
+        expires = time.monotonic() + self.ttl if self.ttl else 0.0
+        with self._lock:
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        for path in self._disk_entries():
+            _remove(path)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+# One cache per server process, shared by all sessions
+report_cache = ReportCache(
+    maxsize=int(os.environ.get("ETHIXGUARD_REPORT_CACHE_SIZE", "256")),
+    directory=os.environ.get("ETHIXGUARD_REPORT_CACHE_DIR") or None,
+)
+
+# Assistant answers, shared by all sessions
+query_cache = QueryCache(
+    maxsize=int(os.environ.get("ETHIXGUARD_QUERY_CACHE_SIZE", "1024")),
+    ttl=float(os.environ.get("ETHIXGUARD_QUERY_CACHE_TTL", "3600")),
+)
+
+
+def _export_cache_stats():
+    stats = report_cache.stats()
+    return [
+        ("ethixguard_report_cache_lookups_total", "counter", "Report cache lookups by result.",
+         [({"result": "hit"}, stats["hits"] - stats["disk_hits"]),
+          ({"result": "disk_hit"}, stats["disk_hits"]),
+          ({"result": "miss"}, stats["misses"])]),
+        ("ethixguard_report_cache_evictions_total", "counter", "Entries evicted from the report cache.",
+         [({"tier": "memory"}, stats["evictions"]),
+          ({"tier": "disk"}, stats["disk_evictions"])]),
+        ("ethixguard_report_cache_entries", "gauge", "Entries held in the in-memory report cache.",
+         [({}, stats["size"])]),
+    ]
+
+
+def _export_query_cache_stats():
+    stats = query_cache.stats()
+    return [
+        ("ethixguard_query_cache_lookups_total", "counter", "Assistant query cache lookups by result.",
+         [({"result": "hit"}, stats["hits"]), ({"result": "miss"}, stats["misses"])]),
+        ("ethixguard_query_cache_removals_total", "counter", "Assistant query cache entries dropped, by reason.",
+         [({"reason": "evicted"}, stats["evictions"]), ({"reason": "expired"}, stats["expirations"])]),
+        ("ethixguard_query_cache_invalidations_total", "counter",
+         "Times the assistant query cache was emptied because the knowledge base was reloaded.",
+         [({}, stats["invalidations"])]),
+        ("ethixguard_query_cache_entries", "gauge", "Entries held in the assistant query cache.",
+         [({}, stats["size"])]),
+    ]
+
+
+registry.register_collector(_export_cache_stats)
+registry.register_collector(_export_query_cache_stats)
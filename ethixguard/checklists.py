@@ -0,0 +1,303 @@
+"""Checklist registry: questions, options, status rules and BSL rules.
+
+Everything the forms, scoring and report need about the checklists lives
+in one JSON schema (ethixguard/checklists.json by default):
+
+    ETHIXGUARD_CHECKLISTS=/etc/ethixguard/checklists.json
+
+get_checklists() parses and validates it once per process into a
+Checklists object of read-only lookup tables, shared by every session. Its
+`fingerprint` is a digest of the schema content, for keying anything cached
+on the rules (e.g. report verdicts) so that edits invalidate it. The
+file's mtime is checked at most every RELOAD_CHECK_INTERVAL seconds; when it
+changes the schema is reloaded, and a file that no longer validates is
+logged and ignored in favour of the last good version.
+
+Schema outline (see the bundled file for a complete example):
+
+    {"version": 1, "compliance_threshold": 80,
+     "bsl_levels": ["Not determined yet", "BSL-1", ...],   # ordinal = position
+     "biosafety": {"title", "description", "status_rules": {answer: status},
+                   "default_status", "sections": [{"title", "questions": [
+                       {"key", "text", "options": [...]}]}]},
+     "ethics": {"title", "description", "status_rules", "default_status",
+                "default_options": [...],
+                "research_type": {"key", "text"},
+                "containment": {"key", "text", "options": [bsl level, ...]},
+                "notes": {"key", "text"},
+                "research_types": [{"name", "min_bsl", "questions": [
+                    {"key", "text", "options" (optional)}]}]}}
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import namedtuple
+from types import MappingProxyType
+
+from ethixguard.metrics import SHARED_TYPES
+
+logger = logging.getLogger(__name__)
+
+CHECKLISTS_PATH = os.environ.get(
+    "ETHIXGUARD_CHECKLISTS", os.path.join(os.path.dirname(os.path.abspath(__file__)), "checklists.json"))
+
+# Seconds between mtime checks; keeps get_checklists() free of syscalls on most calls
+RELOAD_CHECK_INTERVAL = 2.0
+
+# Item statuses from best to worst, and the report sections that count them;
+# every other module imports these from here
+STATUSES = ("pass", "warning", "violation")
+SECTIONS = ("biosafety", "ethics")
+
+Question = namedtuple("Question", "key text options")
+Section = namedtuple("Section", "title questions")
+Field = namedtuple("Field", "key text")
+
+
+class ChecklistError(ValueError):
+    """The checklist schema is malformed."""
+
+
+class Checklists:
+    """Validated, read-only view of a checklist schema.
+
+    Mappings are MappingProxyType and sequences are tuples, so the shared
+    instance cannot be modified by one session under another.
+    """
+
+    __slots__ = (
+        "fingerprint", "version", "compliance_threshold", "bsl_levels", "bsl_hierarchy", "undetermined_bsl",
+        "biosafety_title", "biosafety_description", "biosafety_sections", "biosafety_questions",
+        "biosafety_status_rules", "biosafety_default_status",
+        "ethics_title", "ethics_description", "ethics_status_rules", "ethics_default_status",
+        "research_type_field", "containment_question", "notes_field",
+        "research_types", "min_bsl", "ethics_questions", "ethics_meta_fields",
+        "answers", "answer_codes", "research_type_codes",
+    )
+
+    def __init__(self, schema):
+        _validate(schema)
+        biosafety, ethics = schema["biosafety"], schema["ethics"]
+
+        # Canonical JSON, so reformatting the file does not change it
+        canonical = json.dumps(schema, sort_keys=True, separators=(",", ":"), ensure_ascii=True)
+        self.fingerprint = hashlib.sha256(canonical.encode("ascii")).hexdigest()[:16]
+        self.version = schema["version"]
+        self.compliance_threshold = schema["compliance_threshold"]
+        self.bsl_levels = tuple(schema["bsl_levels"])
+        self.bsl_hierarchy = MappingProxyType({level: i for i, level in enumerate(self.bsl_levels)})
+        self.undetermined_bsl = self.bsl_levels[0]
+
+        self.biosafety_title = biosafety["title"]
+        self.biosafety_description = biosafety["description"]
+        self.biosafety_sections = tuple(
+            Section(section["title"], tuple(Question(q["key"], q["text"], tuple(q["options"]))
+                                            for q in section["questions"]))
+            for section in biosafety["sections"]
+        )
+        self.biosafety_questions = tuple(q for section in self.biosafety_sections for q in section.questions)
+        self.biosafety_status_rules = MappingProxyType(dict(biosafety["status_rules"]))
+        self.biosafety_default_status = biosafety["default_status"]
+
+        self.ethics_title = ethics["title"]
+        self.ethics_description = ethics["description"]
+        self.ethics_status_rules = MappingProxyType(dict(ethics["status_rules"]))
+        self.ethics_default_status = ethics["default_status"]
+        self.research_type_field = Field(ethics["research_type"]["key"], ethics["research_type"]["text"])
+        containment = ethics["containment"]
+        self.containment_question = Question(containment["key"], containment["text"], tuple(containment["options"]))
+        self.notes_field = Field(ethics["notes"]["key"], ethics["notes"]["text"])
+        self.ethics_meta_fields = (self.containment_question.key, self.research_type_field.key, self.notes_field.key)
+
+        default_options = tuple(ethics["default_options"])
+        self.research_types = tuple(entry["name"] for entry in ethics["research_types"])
+        self.min_bsl = MappingProxyType({entry["name"]: entry["min_bsl"] for entry in ethics["research_types"]})
+        self.ethics_questions = MappingProxyType({
+            entry["name"]: tuple(Question(q["key"], q["text"], tuple(q.get("options", default_options)))
+                                 for q in entry["questions"])
+            for entry in ethics["research_types"]
+        })
+        self.research_type_codes = MappingProxyType({name: code for code, name in enumerate(self.research_types, 1)})
+
+        # Every answer option in first-seen order, coded 1..n (0 is left for "unanswered")
+        seen = {}
+        for question in self.biosafety_questions:
+            seen.update(dict.fromkeys(question.options))
+        seen.update(dict.fromkeys(self.containment_question.options))
+        for questions in self.ethics_questions.values():
+            for question in questions:
+                seen.update(dict.fromkeys(question.options))
+        seen.update(dict.fromkeys(self.biosafety_status_rules))
+        seen.update(dict.fromkeys(self.ethics_status_rules))
+        self.answers = tuple(seen)
+        self.answer_codes = MappingProxyType({answer: code for code, answer in enumerate(self.answers, 1)})
+
+    def __setattr__(self, name, value):
+        if hasattr(self, name):
+            raise AttributeError(f"Checklists.{name} is read-only")
+        object.__setattr__(self, name, value)
+
+    def biosafety_status(self, answer):
+        return self.biosafety_status_rules.get(answer, self.biosafety_default_status)
+
+    def ethics_status(self, answer):
+        return self.ethics_status_rules.get(answer, self.ethics_default_status)
+
+    def required_bsl(self, research_type):
+        return self.min_bsl.get(research_type, self.undetermined_bsl)
+
+
+# Sessions hold references to the shared registry; do not count it as theirs
+SHARED_TYPES.add(Checklists)
+
+
+# Validation
+
+def _check(condition, path, message):
+    if not condition:
+        raise ChecklistError(f"{path}: {message}")
+
+
+def _check_text(value, path):
+    _check(isinstance(value, str) and value.strip(), path, "must be a non-empty string")
+
+
+def _check_options(options, path):
+    _check(isinstance(options, list) and options, path, "must be a non-empty list")
+    for i, option in enumerate(options):
+        _check_text(option, f"{path}[{i}]")
+    _check(len(set(options)) == len(options), path, "contains duplicate options")
+
+
+def _check_questions(questions, path, options_required):
+    _check(isinstance(questions, list) and questions, path, "must be a non-empty list")
+    keys = set()
+    for i, question in enumerate(questions):
+        where = f"{path}[{i}]"
+        _check(isinstance(question, dict), where, "must be an object")
+        _check_text(question.get("key"), f"{where}.key")
+        _check_text(question.get("text"), f"{where}.text")
+        _check(question["key"] not in keys, f"{where}.key", f"duplicate key {question['key']!r}")
+        keys.add(question["key"])
+        if options_required or "options" in question:
+            _check_options(question.get("options"), f"{where}.options")
+    return keys
+
+
+def _check_rules(section, path):
+    rules = section.get("status_rules")
+    _check(isinstance(rules, dict), f"{path}.status_rules", "must be an object")
+    for answer, status in rules.items():
+        _check(status in STATUSES, f"{path}.status_rules.{answer}", f"must be one of {STATUSES}")
+    _check(section.get("default_status") in STATUSES, f"{path}.default_status", f"must be one of {STATUSES}")
+
+
+def _validate(schema):
+    _check(isinstance(schema, dict), "$", "must be an object")
+    _check(schema.get("version") == 1, "version", "unsupported schema version")
+    threshold = schema.get("compliance_threshold")
+    _check(isinstance(threshold, (int, float)) and 0 <= threshold <= 100, "compliance_threshold",
+           "must be a number between 0 and 100")
+    _check_options(schema.get("bsl_levels"), "bsl_levels")
+    levels = set(schema["bsl_levels"])
+
+    biosafety = schema.get("biosafety")
+    _check(isinstance(biosafety, dict), "biosafety", "must be an object")
+    _check_text(biosafety.get("title"), "biosafety.title")
+    _check_text(biosafety.get("description"), "biosafety.description")
+    _check_rules(biosafety, "biosafety")
+    sections = biosafety.get("sections")
+    _check(isinstance(sections, list) and sections, "biosafety.sections", "must be a non-empty list")
+    keys = set()
+    for i, section in enumerate(sections):
+        _check(isinstance(section, dict), f"biosafety.sections[{i}]", "must be an object")
+        _check_text(section.get("title"), f"biosafety.sections[{i}].title")
+        section_keys = _check_questions(section.get("questions"), f"biosafety.sections[{i}].questions", True)
+        _check(not keys & section_keys, f"biosafety.sections[{i}]",
+               f"question keys repeated across sections: {sorted(keys & section_keys)}")
+        keys |= section_keys
+
+    ethics = schema.get("ethics")
+    _check(isinstance(ethics, dict), "ethics", "must be an object")
+    _check_text(ethics.get("title"), "ethics.title")
+    _check_text(ethics.get("description"), "ethics.description")
+    _check_rules(ethics, "ethics")
+    _check_options(ethics.get("default_options"), "ethics.default_options")
+    for name in ("research_type", "containment", "notes"):
+        field = ethics.get(name)
+        _check(isinstance(field, dict), f"ethics.{name}", "must be an object")
+        _check_text(field.get("key"), f"ethics.{name}.key")
+        _check_text(field.get("text"), f"ethics.{name}.text")
+    _check_options(ethics["containment"].get("options"), "ethics.containment.options")
+    unknown = set(ethics["containment"]["options"]) - levels
+    _check(not unknown, "ethics.containment.options", f"not in bsl_levels: {sorted(unknown)}")
+    meta = {ethics[name]["key"] for name in ("research_type", "containment", "notes")}
+    _check(len(meta) == 3, "ethics", "research_type, containment and notes need distinct keys")
+
+    research_types = ethics.get("research_types")
+    _check(isinstance(research_types, list) and research_types, "ethics.research_types", "must be a non-empty list")
+    names = set()
+    for i, entry in enumerate(research_types):
+        where = f"ethics.research_types[{i}]"
+        _check(isinstance(entry, dict), where, "must be an object")
+        _check_text(entry.get("name"), f"{where}.name")
+        _check(entry["name"] not in names, f"{where}.name", f"duplicate research type {entry['name']!r}")
+        names.add(entry["name"])
+        _check(entry.get("min_bsl") in levels, f"{where}.min_bsl", "must be one of bsl_levels")
+        keys = _check_questions(entry.get("questions"), f"{where}.questions", False)
+        _check(not keys & meta, f"{where}.questions", f"keys clash with reserved fields: {sorted(keys & meta)}")
+
+
+def load_checklists(path=CHECKLISTS_PATH):
+    """Parse and validate a schema file; raises ChecklistError or OSError."""
+    with open(path, encoding="utf-8") as handle:
+        try:
+            schema = json.load(handle)
+        except ValueError as exc:
+            raise ChecklistError(f"{path}: invalid JSON: {exc}") from None
+    return Checklists(schema)
+
+
+class _Registry:
+    """The current Checklists for one path, reloaded when the file's mtime changes."""
+
+    def __init__(self, path):
+        self.path = path
+        self.current = None
+        self.mtime = None
+        self.checked = 0.0
+        self.lock = threading.Lock()
+
+    def get(self):
+        now = time.monotonic()
+        if self.current is not None and now - self.checked < RELOAD_CHECK_INTERVAL:
+            return self.current
+        with self.lock:
+            self.checked = now
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+            except OSError:
+                if self.current is None:
+                    raise
+                logger.error("Checklist schema %s is unreadable; keeping the loaded version", self.path)
+                return self.current
+            if mtime != self.mtime:
+                try:
+                    self.current = load_checklists(self.path)
+                except ChecklistError:
+                    if self.current is None:
+                        raise
+                    logger.exception("Checklist schema %s is invalid; keeping the loaded version", self.path)
+                self.mtime = mtime
+            return self.current
+
+
+_registry = _Registry(CHECKLISTS_PATH)
+
+
+def get_checklists():
+    """The shared, validated checklist registry (hot-reloaded on file change)."""
+    return _registry.get()
@@ -0,0 +1,180 @@
+"""Columnar, integer-coded scoring for cohort analytics.
+
+Answers are encoded once into small integer codes (one int8 matrix per
+section) and the containment level is stored as its BSL ordinal. Status
+classification, BSL shortfall and compliance percentages are then plain
+NumPy array operations over the whole cohort:
+
+    from ethixguard.batch import read_submissions
+    from ethixguard.columnar import SubmissionTable, score_table
+
+    table = SubmissionTable.from_submissions(read_submissions("submissions.jsonl"))
+    scores = score_table(table)
+    scores.groupby("research_type", observed=True)["compliance_pct"].mean()
+
+The per-row counts match score_submission / generate_report exactly, because
+the code -> status lookups are built from the same status rules.
+"""
+from array import array
+
+import numpy as np
+import pandas as pd
+
+from ethixguard.checklists import SECTIONS, STATUSES, get_checklists
+
+MISSING = 0
+PASS, WARNING, VIOLATION = 0, 1, 2  # indices into STATUSES
+
+
+class Codes:
+    """Integer codes and code -> status lookups derived from one checklist registry.
+
+    Answers are coded 1..n in schema order (0 means unanswered, n+1 is any
+    unknown answer) and research types 1..m (0 is missing or unknown).
+    """
+
+    def __init__(self, checklists):
+        self.checklists = checklists
+        self.answers = checklists.answers
+        self.answer_codes = checklists.answer_codes
+        self.other = len(self.answers) + 1
+        if self.other > np.iinfo(np.int8).max:
+            raise ValueError("too many distinct answers for int8 answer codes")
+        self.research_types = checklists.research_types
+        self.research_type_codes = checklists.research_type_codes
+        hierarchy = checklists.bsl_hierarchy
+        self.required_bsl = np.array(
+            [hierarchy[checklists.undetermined_bsl]] +
+            [hierarchy[checklists.required_bsl(name)] for name in self.research_types], dtype=np.int8)
+        self.bsl_levels = checklists.bsl_levels
+        self.biosafety_status = self._status_lookup(checklists.biosafety_status)
+        self.ethics_status = self._status_lookup(checklists.ethics_status)
+
+    def _status_lookup(self, rule):
+        """code -> status array for one section; unanswered cells map to -1."""
+        lookup = np.full(self.other + 1, STATUSES.index(rule(None)), dtype=np.int8)
+        lookup[MISSING] = -1
+        for answer, code in self.answer_codes.items():
+            lookup[code] = STATUSES.index(rule(answer))
+        return lookup
+
+
+# Codes are rebuilt only when the registry is reloaded
+_codes = None
+
+
+def get_codes(checklists=None):
+    global _codes
+    checklists = checklists or get_checklists()
+    if _codes is None or _codes.checklists is not checklists:
+        _codes = Codes(checklists)
+    return _codes
+
+
+class SubmissionTable:
+    """Integer-coded answers for a cohort of submissions."""
+
+    def __init__(self, ids, biosafety_questions, biosafety, ethics_questions, ethics, research_type, bsl, codes):
+        self.ids = ids
+        self.biosafety_questions = biosafety_questions
+        self.biosafety = biosafety
+        self.ethics_questions = ethics_questions
+        self.ethics = ethics
+        self.research_type = research_type
+        self.bsl = bsl
+        self.codes = codes
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def from_submissions(cls, submissions, checklists=None):
+        """Encode {"id", "biosafety", "ethics"} dicts (the batch input format)."""
+        codes = get_codes(checklists)
+        checklists = codes.checklists
+        meta_fields = checklists.ethics_meta_fields
+        research_type_key = checklists.research_type_field.key
+        containment_key = checklists.containment_question.key
+        ids = []
+        columns = {"biosafety": {}, "ethics": {}}
+        # Sparse (row, column, code) triples, packed into dense matrices at the end
+        cells = {section: (array("i"), array("i"), array("b")) for section in columns}
+        research_type = array("b")
+        bsl = array("b")
+
+        for row, submission in enumerate(submissions):
+            ids.append(submission.get("id", row))
+            ethics_data = submission.get("ethics", {})
+            for section, data in (("biosafety", submission.get("biosafety", {})), ("ethics", ethics_data)):
+                rows, cols, answers = cells[section]
+                index = columns[section]
+                for question, answer in data.items():
+                    if section == "ethics" and question in meta_fields:
+                        continue
+                    rows.append(row)
+                    cols.append(index.setdefault(question, len(index)))
+                    answers.append(codes.answer_codes.get(answer, codes.other))
+            research_type.append(codes.research_type_codes.get(ethics_data.get(research_type_key), 0))
+            bsl.append(checklists.bsl_hierarchy.get(ethics_data.get(containment_key, checklists.undetermined_bsl), 0))
+
+        matrices = {}
+        for section, (rows, cols, answers) in cells.items():
+            matrix = np.zeros((len(ids), len(columns[section])), dtype=np.int8)
+            matrix[np.frombuffer(rows, dtype=np.int32), np.frombuffer(cols, dtype=np.int32)] = \
+                np.frombuffer(answers, dtype=np.int8)
+            matrices[section] = matrix
+
+        return cls(
+            ids=ids,
+            biosafety_questions=list(columns["biosafety"]),
+            biosafety=matrices["biosafety"],
+            ethics_questions=list(columns["ethics"]),
+            ethics=matrices["ethics"],
+            research_type=np.frombuffer(research_type, dtype=np.int8),
+            bsl=np.frombuffer(bsl, dtype=np.int8),
+            codes=codes,
+        )
+
+
+def _status_counts(statuses):
+    return np.stack([(statuses == status).sum(axis=1) for status in (PASS, WARNING, VIOLATION)], axis=1)
+
+
+def score_table(table):
+    """Per-submission counts, BSL shortfall and compliance percentage as a DataFrame."""
+    codes = table.codes
+    biosafety = _status_counts(codes.biosafety_status[table.biosafety])
+    ethics = _status_counts(codes.ethics_status[table.ethics])
+
+    # The containment level is always scored as one extra ethics item
+    shortfall = np.maximum(codes.required_bsl[table.research_type] - table.bsl, 0)
+    ethics[:, PASS] += shortfall == 0
+    ethics[:, WARNING] += shortfall > 0
+
+    passed = biosafety[:, PASS] + ethics[:, PASS]
+    total = biosafety.sum(axis=1) + ethics.sum(axis=1)
+    compliance = 100.0 * passed / total
+
+    frame = pd.DataFrame(
+        {**{f"biosafety_{name}": biosafety[:, i] for i, name in enumerate(STATUSES)},
+         **{f"ethics_{name}": ethics[:, i] for i, name in enumerate(STATUSES)}},
+        index=pd.Index(table.ids, name="id"),
+    )
+    frame["research_type"] = pd.Categorical.from_codes(
+        table.research_type.astype(np.int16) - 1, categories=list(codes.research_types))
+    frame["containment_level"] = pd.Categorical.from_codes(table.bsl, categories=list(codes.bsl_levels))
+    frame["bsl_shortfall"] = shortfall
+    frame["compliance_pct"] = compliance
+    frame["compliant"] = compliance >= codes.checklists.compliance_threshold
+    return frame
+
+
+def summarize(scores, by="research_type"):
+    """Cohort totals per group: summed counts and mean compliance."""
+    counts = [f"{section}_{name}" for section in SECTIONS for name in STATUSES]
+    grouped = scores.groupby(by, observed=True)
+    summary = grouped[counts].sum()
+    summary["submissions"] = grouped.size()
+    summary["mean_compliance_pct"] = grouped["compliance_pct"].mean()
+    summary["compliant_share"] = grouped["compliant"].mean()
+    return summary
@@ -0,0 +1,207 @@
+"""Scoring and report text over the checklist registry, free of any Streamlit dependency."""
+from datetime import datetime
+
+from ethixguard.checklists import SECTIONS, STATUSES, get_checklists
+from ethixguard.metrics import timed
+
+# Status as shown in the report text
+STATUS_LABELS = {
+    "pass": "✅ Pass",
+    "warning": "⚠️ Warning",
+    "violation": "❌ Violation",
+}
+
+
+def containment_check(ethics_data, checklists=None):
+    """Return (research_type, user_bsl, required_bsl, meets_minimum)."""
+    checklists = checklists or get_checklists()
+    research_type = ethics_data.get(checklists.research_type_field.key, "")
+    required_bsl = checklists.required_bsl(research_type)
+    user_bsl = ethics_data.get(checklists.containment_question.key, checklists.undetermined_bsl)
+    hierarchy = checklists.bsl_hierarchy
+    meets = hierarchy.get(user_bsl, 0) >= hierarchy.get(required_bsl, 0)
+    return research_type, user_bsl, required_bsl, meets
+
+
+class EvaluationResult:
+    """Everything shown about one submission, computed by evaluate() in a single pass.
+
+    The report text, the charts and every export read this object instead
+    of re-scanning the answers. to_dict()/from_dict() round-trip it through
+    JSON for the report cache.
+    """
+
+    __slots__ = ("items", "counts", "research_type", "user_bsl", "required_bsl", "bsl_shortfall",
+                 "has_no", "threshold")
+
+    def __init__(self, items, counts, research_type, user_bsl, required_bsl, bsl_shortfall, has_no, threshold):
+        self.items = items                  # section -> [(question, answer, status, note)], ethics starting
+                                            # with the containment level; note explains a warning
+        self.counts = counts                # section -> {status: count}
+        self.research_type = research_type
+        self.user_bsl = user_bsl
+        self.required_bsl = required_bsl
+        self.bsl_shortfall = bsl_shortfall  # levels below the research type's minimum (0 if met)
+        self.has_no = has_no                # section -> any answer is "No" (drives the recommendations)
+        self.threshold = threshold
+
+    @property
+    def meets_bsl(self):
+        return self.bsl_shortfall == 0
+
+    @property
+    def total(self):
+        return sum(sum(counts.values()) for counts in self.counts.values())
+
+    @property
+    def compliance_pct(self):
+        """Share of scored items that pass, in percent."""
+        passed = sum(counts["pass"] for counts in self.counts.values())
+        return 100.0 * passed / self.total if self.total else 0.0
+
+    @property
+    def compliant(self):
+        return self.compliance_pct >= self.threshold
+
+    @property
+    def status(self):
+        """Worst status across both sections."""
+        for status in ("violation", "warning"):
+            if any(counts[status] for counts in self.counts.values()):
+                return status
+        return "pass"
+
+    def chart_counts(self, section):
+        """[pass, warning, violation] for the bar charts."""
+        return [self.counts[section][status] for status in STATUSES]
+
+    def to_dict(self):
+        return {
+            "items": {section: [list(item) for item in items] for section, items in self.items.items()},
+            "counts": self.counts,
+            "research_type": self.research_type,
+            "user_bsl": self.user_bsl,
+            "required_bsl": self.required_bsl,
+            "bsl_shortfall": self.bsl_shortfall,
+            "has_no": self.has_no,
+            "threshold": self.threshold,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        items = {section: [tuple(item) for item in items] for section, items in data["items"].items()}
+        # Copy the dicts too: data is usually a cached entry shared between sessions
+        counts = {section: dict(count) for section, count in data["counts"].items()}
+        return cls(items, counts, data["research_type"], data["user_bsl"], data["required_bsl"],
+                   data["bsl_shortfall"], dict(data["has_no"]), data["threshold"])
+
+
+@timed("report")
+def evaluate(biosafety_data, ethics_data, checklists=None):
+    """Score a submission once: per-item statuses, totals and the containment check."""
+    checklists = checklists or get_checklists()
+
+    biosafety_items = []
+    biosafety = {"pass": 0, "warning": 0, "violation": 0}
+    for question, answer in biosafety_data.items():
+        status = checklists.biosafety_status(answer)
+        biosafety[status] += 1
+        biosafety_items.append((question, answer, status, None))
+
+    # The containment level is always scored against the research type's minimum
+    research_type, user_bsl, required_bsl, meets = containment_check(ethics_data, checklists)
+    hierarchy = checklists.bsl_hierarchy
+    shortfall = max(0, hierarchy.get(required_bsl, 0) - hierarchy.get(user_bsl, 0))
+    ethics = {"pass": 0, "warning": 0, "violation": 0}
+    if meets:
+        ethics["pass"] += 1
+        ethics_items = [(checklists.containment_question.key, user_bsl, "pass", None)]
+    else:
+        ethics["warning"] += 1
+        ethics_items = [(checklists.containment_question.key, user_bsl, "warning",
+                         f"Minimum required: {required_bsl}")]
+
+    meta_fields = checklists.ethics_meta_fields
+    for question, answer in ethics_data.items():
+        if question not in meta_fields:
+            status = checklists.ethics_status(answer)
+            ethics[status] += 1
+            ethics_items.append((question, answer, status, None))
+
+    return EvaluationResult(
+        items={"biosafety": biosafety_items, "ethics": ethics_items},
+        counts={"biosafety": biosafety, "ethics": ethics},
+        research_type=research_type,
+        user_bsl=user_bsl,
+        required_bsl=required_bsl,
+        bsl_shortfall=shortfall,
+        has_no={"biosafety": "No" in biosafety_data.values(), "ethics": "No" in ethics_data.values()},
+        threshold=checklists.compliance_threshold,
+    )
+
+
+def score_submission(biosafety_data, ethics_data, checklists=None):
+    """Pass/warning/violation counts per section, as generate_report counts them."""
+    return evaluate(biosafety_data, ethics_data, checklists).counts
+
+
+REPORT_TITLE = "EthixGuard Compliance Report"
+
+
+def write_recommendations(result, renderer):
+    """The Recommendations section (driven by the ethics totals, as before)."""
+    counts = result.counts["ethics"]
+    renderer.section("Recommendations")
+    if counts["violation"] == 0 and counts["warning"] == 0:
+        renderer.heading("Congratulations! Your project is compliant with all biosafety and ethics guidelines.")
+
+    elif counts["violation"] > 0:
+        if result.has_no["biosafety"]:
+            renderer.recommendation("Ensure all biosafety compliance requirements are met before proceeding")
+        if result.has_no["ethics"]:
+            renderer.recommendation("Address ethical violations identified in this report")
+    elif counts["warning"] > 0:
+        renderer.heading("Areas for Improvement")
+        if not result.meets_bsl:
+            renderer.recommendation(f"{result.user_bsl} is below the recommended level {result.required_bsl} for {result.research_type}. Make sure to conduct experiments in suitable lab environments to ensure safety and compliance.")
+        renderer.recommendation("Review warning items and consider addressing them")
+        renderer.recommendation("Consult with relevant committees for guidance")
+
+
+def write_result(result, renderer, generated_on=None):
+    """Feed an EvaluationResult's sections, items and totals to `renderer`.
+
+    See ethixguard.renderers for the renderer interface and output formats.
+    """
+    if generated_on is None:
+        generated_on = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    renderer.start(REPORT_TITLE, generated_on)
+
+    renderer.section("Biosafety Compliance Summary")
+    for question, answer, status, _ in result.items["biosafety"]:
+        renderer.item(question, answer, status, emphasize=True)
+    renderer.summary(result.counts["biosafety"])
+
+    renderer.section("Ethics Compliance Summary")
+    for question, answer, status, note in result.items["ethics"]:
+        renderer.item(question, answer, status, note=note)
+    renderer.summary(result.counts["ethics"])
+
+    write_recommendations(result, renderer)
+    renderer.finish()
+
+
+@timed("report")
+def report_markdown(result, generated_on=None):
+    """The Markdown report of an EvaluationResult."""
+    from io import StringIO
+    from ethixguard.renderers import MarkdownRenderer
+
+    sink = StringIO()
+    write_result(result, MarkdownRenderer(sink), generated_on)
+    return sink.getvalue()
+
+
+# Function to create downloadable report
+def generate_report(biosafety_data, ethics_data, generated_on=None):
+    return report_markdown(evaluate(biosafety_data, ethics_data), generated_on)
@@ -0,0 +1,116 @@
+"""Bounded Guidance Assistant chat history.
+
+A ChatHistory keeps the most recent `capacity` messages in a ring buffer
+of (role, text) tuples. Older messages are either dropped or, if a spill
+directory is configured, appended to a per-session JSONL file and read back
+page by page only when the user asks for them. The file is created when the
+first message is spilled and deleted when the history is cleared or garbage
+collected (when Streamlit drops the session):
+
+    ETHIXGUARD_CHAT_CAPACITY=200          # messages kept in memory per session (at least 1)
+    ETHIXGUARD_CHAT_SPILL_DIR=/var/tmp/ethixguard-chat   # optional
+
+Assistant answers repeat a lot (canned knowledge base entries, the default
+reply), so they are interned in a process-wide table and every session
+holding the same answer shares one string.
+"""
+import json
+import os
+import threading
+import weakref
+from array import array
+from collections import deque
+
+CHAT_CAPACITY = int(os.environ.get("ETHIXGUARD_CHAT_CAPACITY", "200"))
+CHAT_SPILL_DIR = os.environ.get("ETHIXGUARD_CHAT_SPILL_DIR") or None
+
+# Distinct assistant answers shared across sessions; bounded so free-form
+# guideline answers cannot grow it forever
+MAX_INTERNED = 4096
+_interned = {}
+_intern_lock = threading.Lock()
+
+
+def intern_answer(text):
+    """Return the shared copy of an assistant answer."""
+    shared = _interned.get(text)
+    if shared is not None:
+        return shared
+    with _intern_lock:
+        if len(_interned) < MAX_INTERNED:
+            return _interned.setdefault(text, text)
+    return text
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class ChatHistory:
+    """Most recent messages in memory, older ones optionally on disk."""
+
+    def __init__(self, capacity=CHAT_CAPACITY, spill_dir=CHAT_SPILL_DIR, session_id=None):
+        if capacity < 1:
+            raise ValueError(f"chat history capacity must be at least 1, got {capacity}")
+        self.capacity = capacity
+        self._recent = deque(maxlen=capacity)
+        self._spill_path = None
+        # Byte offset of each spilled message in the spill file
+        self._spilled = array("q")
+        if spill_dir and session_id:
+            os.makedirs(spill_dir, exist_ok=True)
+            self._spill_path = os.path.join(spill_dir, f"{session_id}.jsonl")
+            # Stored questions should not outlive the session
+            weakref.finalize(self, _remove, self._spill_path)
+        self.dropped = 0
+
+    def __len__(self):
+        """Messages still available, in memory and on disk."""
+        return len(self._spilled) + len(self._recent)
+
+    def __iter__(self):
+        return iter(self.window(len(self)))
+
+    def append(self, role, content):
+        if role == "assistant":
+            content = intern_answer(content)
+        if len(self._recent) == self.capacity:
+            self._spill(self._recent[0])
+        self._recent.append((role, content))
+
+    def window(self, count):
+        """The last `count` messages as (role, text), oldest first."""
+        count = min(count, len(self))
+        in_memory = len(self._recent)
+        if count <= in_memory:
+            return [self._recent[i] for i in range(in_memory - count, in_memory)]
+        older = self._read_spilled(len(self._spilled) - (count - in_memory))
+        return older + list(self._recent)
+
+    def clear(self):
+        self._recent.clear()
+        self._spilled = array("q")
+        self.dropped = 0
+        if self._spill_path:
+            _remove(self._spill_path)
+
+    def _spill(self, message):
+        if self._spill_path is None:
+            self.dropped += 1
+            return
+        # The first spilled message starts a new file
+        with open(self._spill_path, "ab" if self._spilled else "wb") as handle:
+            self._spilled.append(handle.tell())
+            handle.write(json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n")
+
+    def _read_spilled(self, start):
+        messages = []
+        with open(self._spill_path, "rb") as handle:
+            handle.seek(self._spilled[start])
+            for _ in range(len(self._spilled) - start):
+                role, content = json.loads(handle.readline())
+                messages.append((role, intern_answer(content) if role == "assistant" else content))
+        return messages
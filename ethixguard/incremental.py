@@ -0,0 +1,215 @@
+"""Incremental evaluation: running totals that follow single-answer changes.
+
+An EvaluationState holds, per checklist item, the current answer and its
+status, plus running pass/warning/violation totals per section. Changing
+one answer adjusts two counters; changing the containment level or
+research type re-checks only the BSL rule. The compliance score and the
+full report are then read off the stored statuses without re-evaluating
+anything:
+
+    state = EvaluationState()
+    state.set_answer("biosafety", "IBSC Approval", "No")
+    state.set_research_type("Animal Research")
+    state.set_containment("BSL-1")
+    state.compliance_pct()          # live score
+    state.markdown(generated_on)    # identical to generate_report(...)
+
+Changing the research type swaps the ethics question set, so it drops the
+previous type's answers.
+"""
+from ethixguard.checklists import SECTIONS, get_checklists
+from ethixguard.evaluation import EvaluationResult, report_markdown, write_result
+
+
+class EvaluationState:
+    # One per session, so keep the instances small
+    __slots__ = ("checklists", "items", "counts", "no_answers", "research_type", "containment", "notes",
+                 "_containment_item")
+
+    def __init__(self, checklists=None):
+        self.checklists = checklists or get_checklists()
+        # section -> {question key: (answer, status)}, in answer order
+        self.items = {"biosafety": {}, "ethics": {}}
+        self.counts = {section: {"pass": 0, "warning": 0, "violation": 0} for section in SECTIONS}
+        # Answers equal to "No", which decide the violation recommendations
+        self.no_answers = {section: 0 for section in SECTIONS}
+        self.research_type = None
+        self.containment = None
+        self.notes = ""
+        # (status, user BSL, required BSL) once a research type is set
+        self._containment_item = None
+
+    @classmethod
+    def from_data(cls, biosafety_data, ethics_data, checklists=None):
+        """State for a saved submission (the dicts generate_report takes)."""
+        state = cls(checklists)
+        for question, answer in biosafety_data.items():
+            state.set_answer("biosafety", question, answer)
+        if ethics_data:
+            checklists = state.checklists
+            state.set_research_type(ethics_data.get(checklists.research_type_field.key, ""))
+            state.set_containment(ethics_data.get(checklists.containment_question.key))
+            for question, answer in ethics_data.items():
+                if question not in checklists.ethics_meta_fields:
+                    state.set_answer("ethics", question, answer)
+            state.notes = ethics_data.get(checklists.notes_field.key, "")
+        return state
+
+    def for_checklists(self, checklists):
+        """This state rebuilt against another registry (after a schema reload).
+
+        Every answer is re-scored with the new rules; answers to questions
+        the new schema no longer has are dropped.
+        """
+        biosafety_keys = {question.key for question in checklists.biosafety_questions}
+        biosafety = {question: answer for question, answer in self.biosafety_data().items()
+                     if question in biosafety_keys}
+        ethics_keys = {question.key for question in checklists.ethics_questions.get(self.research_type, ())}
+        ethics_keys.update(self.checklists.ethics_meta_fields)
+        ethics = {question: answer for question, answer in self.ethics_data().items() if question in ethics_keys}
+        return EvaluationState.from_data(biosafety, ethics, checklists)
+
+    def answer(self, section, question):
+        item = self.items[section].get(question)
+        return item[0] if item else None
+
+    def answers(self, section):
+        return {question: item[0] for question, item in self.items[section].items()}
+
+    def set_answer(self, section, question, answer):
+        """Record one answer; O(1) regardless of checklist size."""
+        items = self.items[section]
+        counts = self.counts[section]
+        item = items.get(question)
+        if item is not None:
+            if item[0] == answer:
+                return
+            counts[item[1]] -= 1
+            self.no_answers[section] -= item[0] == "No"
+        if section == "biosafety":
+            status = self.checklists.biosafety_status(answer)
+        else:
+            status = self.checklists.ethics_status(answer)
+        counts[status] += 1
+        self.no_answers[section] += answer == "No"
+        items[question] = (answer, status)
+
+    def remove_answer(self, section, question):
+        item = self.items[section].pop(question, None)
+        if item is not None:
+            self.counts[section][item[1]] -= 1
+            self.no_answers[section] -= item[0] == "No"
+
+    def set_research_type(self, research_type):
+        """Select the ethics checklist; answers of a previous type are dropped."""
+        if research_type == self.research_type:
+            return
+        if self.research_type is not None:
+            for question in list(self.items["ethics"]):
+                self.remove_answer("ethics", question)
+        self.research_type = research_type
+        self._check_containment()
+
+    def set_containment(self, level):
+        if level != self.containment:
+            self.containment = level
+            self._check_containment()
+
+    def _containment_result(self, research_type):
+        """(status, user BSL, required BSL) of the containment item."""
+        checklists = self.checklists
+        user_bsl = self.containment if self.containment is not None else checklists.undetermined_bsl
+        required = checklists.required_bsl(research_type)
+        hierarchy = checklists.bsl_hierarchy
+        status = "pass" if hierarchy.get(user_bsl, 0) >= hierarchy.get(required, 0) else "warning"
+        return status, user_bsl, required
+
+    def _check_containment(self):
+        """Re-score the containment item against the research type's minimum BSL."""
+        counts = self.counts["ethics"]
+        if self._containment_item is not None:
+            counts[self._containment_item[0]] -= 1
+            self._containment_item = None
+        if self.research_type is not None:
+            self._containment_item = self._containment_result(self.research_type)
+            counts[self._containment_item[0]] += 1
+
+    def compliance_pct(self):
+        """Share of scored items that pass, in percent (None before any answer)."""
+        passed = self.counts["biosafety"]["pass"] + self.counts["ethics"]["pass"]
+        total = sum(self.counts["biosafety"].values()) + sum(self.counts["ethics"].values())
+        return 100.0 * passed / total if total else None
+
+    def compliant(self):
+        score = self.compliance_pct()
+        return score is not None and score >= self.checklists.compliance_threshold
+
+    def biosafety_data(self):
+        return self.answers("biosafety")
+
+    def ethics_data(self):
+        """The ethics dict in saved-form order ({} before a research type is chosen)."""
+        if self.research_type is None:
+            return {}
+        checklists = self.checklists
+        data = {checklists.research_type_field.key: self.research_type}
+        if self.containment is not None:
+            data[checklists.containment_question.key] = self.containment
+        data.update(self.answers("ethics"))
+        data[checklists.notes_field.key] = self.notes
+        return data
+
+    def _ethics_has_no(self):
+        if self.no_answers["ethics"]:
+            return True
+        return "No" in (self.research_type, self.containment, self.notes)
+
+    def _report_ethics(self):
+        """(research type, containment item, ethics counts) as the report shows them.
+
+        Like generate_report, the report scores the containment level even
+        before an ethics form exists; that item is not part of the live totals.
+        """
+        if self._containment_item is not None:
+            return self.research_type, self._containment_item, self.counts["ethics"]
+        item = self._containment_result("")
+        counts = dict(self.counts["ethics"])
+        counts[item[0]] += 1
+        return "", item, counts
+
+    def result(self, with_items=True):
+        """The EvaluationResult the report shows, assembled from the stored statuses.
+
+        with_items=False leaves out the per-item lists (items is None), for
+        callers that only need the totals and the containment check.
+        """
+        checklists = self.checklists
+        research_type, (containment, user_bsl, required), counts = self._report_ethics()
+        items = None
+        if with_items:
+            note = f"Minimum required: {required}" if containment == "warning" else None
+            ethics_items = [(checklists.containment_question.key, user_bsl, containment, note)]
+            ethics_items.extend((question, answer, status, None)
+                                for question, (answer, status) in self.items["ethics"].items())
+            items = {"biosafety": [(question, answer, status, None)
+                                   for question, (answer, status) in self.items["biosafety"].items()],
+                     "ethics": ethics_items}
+        hierarchy = checklists.bsl_hierarchy
+        return EvaluationResult(
+            items=items,
+            counts={"biosafety": dict(self.counts["biosafety"]), "ethics": dict(counts)},
+            research_type=research_type,
+            user_bsl=user_bsl,
+            required_bsl=required,
+            bsl_shortfall=max(0, hierarchy.get(required, 0) - hierarchy.get(user_bsl, 0)),
+            has_no={"biosafety": bool(self.no_answers["biosafety"]), "ethics": self._ethics_has_no()},
+            threshold=checklists.compliance_threshold,
+        )
+
+    def write_to(self, renderer, generated_on=None):
+        """Drive any ethixguard.renderers renderer from the stored statuses."""
+        write_result(self.result(), renderer, generated_on)
+
+    def markdown(self, generated_on=None):
+        """The Markdown report, identical to generate_report on the same answers."""
+        return report_markdown(self.result(), generated_on)
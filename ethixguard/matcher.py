@@ -0,0 +1,162 @@
+import math
+from collections import deque
+from difflib import SequenceMatcher
+
+# Same similarity cutoff get_response has always used with get_close_matches
+FUZZY_CUTOFF = 0.8
+
+
+class PhraseAutomaton:
+    """Aho-Corasick automaton over the knowledge base keys.
+
+    A single pass over the text finds every key that occurs as a substring.
+    Each state remembers the smallest key index it (or any suffix of it)
+    completes, so the scan can report the first key in dictionary order,
+    which is what the old `for key in knowledge_base: if key in text` loop did.
+    """
+
+    def __init__(self, keys):
+        self.goto = [{}]
+        self.best = [None]
+        for index, key in enumerate(keys):
+            state = 0
+            for char in key:
+                nxt = self.goto[state].get(char)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][char] = nxt
+                    self.goto.append({})
+                    self.best.append(None)
+                state = nxt
+            if self.best[state] is None:
+                self.best[state] = index
+
+        # Breadth-first pass to wire failure links and fold outputs
+        self.fail = [0] * len(self.goto)
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self.goto[state].items():
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[nxt] = target if target != nxt else 0
+                inherited = self.best[self.fail[nxt]]
+                if inherited is not None and (self.best[nxt] is None or inherited < self.best[nxt]):
+                    self.best[nxt] = inherited
+                queue.append(nxt)
+
+    def first_match(self, text):
+        """Index of the earliest-inserted key found in `text`, or None."""
+        goto, fail, best = self.goto, self.fail, self.best
+        found = best[0]
+        if found == 0:
+            return found
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            hit = best[state]
+            if hit is not None and (found is None or hit < found):
+                found = hit
+                if found == 0:
+                    break
+        return found
+
+
+class KeywordMatcher:
+    """Precompiled lookup for the Guidance Assistant.
+
+    Built once from the knowledge base and reused for every question. It
+    returns exactly what the original linear scan + get_close_matches code
+    returned, but the exact-phrase pass is a single automaton walk and the
+    fuzzy pass only scores keys the length buckets and bigram index cannot
+    rule out.
+    """
+
+    def __init__(self, knowledge_base, cutoff=FUZZY_CUTOFF):
+        self.knowledge_base = knowledge_base
+        self.keys = list(knowledge_base)
+        self.cutoff = cutoff
+        self.automaton = PhraseAutomaton(self.keys)
+
+        # Keys bucketed by length, each bucket with a bigram -> keys index
+        self.buckets = {}
+        for key in self.keys:
+            keys, grams = self.buckets.setdefault(len(key), ([], {}))
+            keys.append(key)
+            for i in range(len(key) - 1):
+                grams.setdefault(key[i:i + 2], set()).add(key)
+
+    def exact(self, processed_input):
+        """First key (in knowledge base order) contained in the input."""
+        index = self.automaton.first_match(processed_input)
+        return None if index is None else self.keys[index]
+
+    def candidates(self, word):
+        """Keys that could possibly reach the cutoff against `word`.
+
+        ratio = 2*M / n with n = len(key) + len(word) and M the size of the
+        matching blocks. M <= min(len(key), len(word)) limits the key lengths
+        worth looking at. The blocks are separated by at least one unmatched
+        character each, so there are at most n - 2*M + 1 of them, and at
+        least 3*M - n - 1 of the word's bigrams must also appear in the key.
+        By pigeonhole the key then contains one of the word's rarest bigrams.
+        """
+        size = len(word)
+        shortest = math.ceil(size * self.cutoff / (2 - self.cutoff) - 1e-9)
+        longest = int(size * (2 - self.cutoff) / self.cutoff + 1e-9)
+        grams = [word[i:i + 2] for i in range(size - 1)]
+
+        for length in range(shortest, longest + 1):
+            bucket = self.buckets.get(length)
+            if bucket is None:
+                continue
+            keys, index = bucket
+            total = size + length
+            least_matches = math.ceil(self.cutoff * total / 2 - 1e-9)
+            shared = 3 * least_matches - total - 1
+            if shared <= 0:
+                yield from keys
+                continue
+            probe = len(grams) - shared + 1
+            if probe <= 0:
+                continue
+            postings = sorted((index.get(gram, ()) for gram in grams), key=len)
+            found = set()
+            for posting in postings[:probe]:
+                found.update(posting)
+            yield from found
+
+    def fuzzy(self, word):
+        """Same result as get_close_matches(word, keys, n=1, cutoff)[0]."""
+        matcher = SequenceMatcher()
+        matcher.set_seq2(word)
+        best = None
+        for key in self.candidates(word):
+            matcher.set_seq1(key)
+            if matcher.real_quick_ratio() >= self.cutoff and \
+               matcher.quick_ratio() >= self.cutoff and \
+               matcher.ratio() >= self.cutoff:
+                scored = (matcher.ratio(), key)
+                if best is None or scored > best:
+                    best = scored
+        return None if best is None else best[1]
+
+    def match(self, processed_input):
+        """Resolve a normalized question to a knowledge base key, or None."""
+        key = self.exact(processed_input)
+        if key is not None:
+            return key
+        for word in processed_input.split():
+            key = self.fuzzy(word)
+            if key is not None:
+                return key
+        return None
+
+    def lookup(self, processed_input):
+        """Answer text for a normalized question, or None."""
+        key = self.match(processed_input)
+        return None if key is None else self.knowledge_base[key]
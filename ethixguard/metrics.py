@@ -0,0 +1,328 @@
+"""Always-on, low-overhead metrics with a Prometheus text exporter.
+
+Instrumented code records into the process-wide `registry`:
+
+    with metrics.span("page", "Home"):     # ethixguard_span_seconds histogram
+        ...
+    ANSWERS = metrics.registry.counter("ethixguard_assistant_answers_total", "...", ("source",))
+    ANSWERS.inc(source="matcher")
+
+Recording is a dict lookup, a few additions and a lock, so it can stay on
+in production. Nothing is formatted until the metrics are exported, which is
+configured with environment variables (all optional):
+
+    ETHIXGUARD_METRICS_PORT=9464         # serve GET /metrics on this port
+    ETHIXGUARD_METRICS_HOST=0.0.0.0      # address to bind (default 127.0.0.1, local only)
+    ETHIXGUARD_METRICS_FILE=/var/lib/node_exporter/ethixguard.prom
+    ETHIXGUARD_METRICS_INTERVAL=15       # seconds between file writes
+
+The file is replaced atomically, so it can be read by node_exporter's
+textfile collector.
+"""
+import itertools
+import os
+import sys
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from functools import lru_cache, wraps
+
+METRICS_PORT = os.environ.get("ETHIXGUARD_METRICS_PORT", "")
+# Page names and session sizes are not for the network at large; exposing them is opt-in
+METRICS_HOST = os.environ.get("ETHIXGUARD_METRICS_HOST", "127.0.0.1")
+METRICS_FILE = os.environ.get("ETHIXGUARD_METRICS_FILE", "")
+METRICS_INTERVAL = float(os.environ.get("ETHIXGUARD_METRICS_INTERVAL", "15"))
+# Measure session state size on one rerun in this many (walking a long chat history is not free)
+SESSION_SAMPLE_EVERY = int(os.environ.get("ETHIXGUARD_METRICS_SESSION_SAMPLE", "10"))
+
+# Seconds; spans in this app range from microseconds (lookups) to seconds (pages)
+TIME_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+# Bytes of session state
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+
+def _labels(names, values):
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(tuple(labels.get(name, "") for name in self.labelnames), 0)
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield self.name, _labels(self.labelnames, key), value
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=TIME_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}  # label values -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        # Non-cumulative bucket index (first bound >= value); cumulated on export
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 3)
+            series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def count(self, **labels):
+        series = self._series.get(tuple(labels.get(name, "") for name in self.labelnames))
+        return series[-1] if series else 0
+
+    def samples(self):
+        with self._lock:
+            items = [(key, list(series)) for key, series in self._series.items()]
+        names = self.labelnames + ("le",)
+        for key, series in items:
+            cumulative = 0
+            for bound, hits in zip(self.buckets + (float("inf"),), series):
+                cumulative += hits
+                yield self.name + "_bucket", _labels(names, key + (_number(bound),)), cumulative
+            yield self.name + "_sum", _labels(self.labelnames, key), series[-2]
+            yield self.name + "_count", _labels(self.labelnames, key), series[-1]
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name, help, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help, labelnames, **kwargs)
+            return metric
+
+    def counter(self, name, help, labelnames=()):
+        return self._get(Counter, name, help, labelnames)
+
+    def gauge(self, name, help, labelnames=()):
+        return self._get(Gauge, name, help, labelnames)
+
+    def histogram(self, name, help, labelnames=(), buckets=TIME_BUCKETS):
+        return self._get(Histogram, name, help, labelnames, buckets=buckets)
+
+    def register_collector(self, collect):
+        """Add a callable returning [(name, kind, help, [(labels dict, value), ...])].
+
+        Collectors run only at export time, for values that are already
+        counted elsewhere (e.g. the report cache's own hit counters).
+        """
+        self._collectors.append(collect)
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{labels} {_number(value)}")
+        for collect in self._collectors:
+            for name, kind, help, samples in collect():
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_labels(tuple(labels), tuple(labels.values()))} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+# One registry per process, shared by every session
+registry = Registry()
+
+SPANS = registry.histogram("ethixguard_span_seconds", "Time spent in instrumented code paths.", ("span", "name"))
+SESSION_STATE = registry.histogram("ethixguard_session_state_bytes",
+                                   "Approximate size of a session's state, sampled at the end of each rerun.",
+                                   buckets=SIZE_BUCKETS)
+
+
+class span:
+    """Time the enclosed block into ethixguard_span_seconds{span=kind,name=name}.
+
+    A plain class rather than @contextmanager: it is entered on every rerun
+    and this keeps the cost around a microsecond.
+    """
+    __slots__ = ("kind", "name", "start")
+
+    def __init__(self, kind, name=""):
+        self.kind = kind
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        SPANS.observe(time.perf_counter() - self.start, span=self.kind, name=self.name)
+
+
+def timed(kind):
+    """Decorator form of span(), labelled with the function name."""
+    def decorate(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                SPANS.observe(time.perf_counter() - start, span=kind, name=function.__name__)
+        return wrapper
+    return decorate
+
+
+# Process-wide objects that session state refers to but does not own
+# (e.g. the checklist registry); approximate_size does not count them
+SHARED_TYPES = set()
+
+
+def approximate_size(value, limit=100000):
+    """Rough deep size in bytes of containers, strings and numbers.
+
+    Walks at most `limit` objects, so the estimate stays cheap for big
+    session states and simply undercounts beyond that.
+    """
+    seen = set()
+    stack = [value]
+    total = 0
+    while stack and len(seen) < limit:
+        item = stack.pop()
+        if id(item) in seen or type(item) in SHARED_TYPES:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item, 64)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset, deque)):
+            stack.extend(item)
+        elif hasattr(item, "__dict__"):
+            stack.append(vars(item))
+        elif hasattr(item, "__slots__"):
+            stack.extend(getattr(item, slot) for slot in item.__slots__ if hasattr(item, slot))
+    return total
+
+
+_reruns = itertools.count()
+
+
+def sample_session_state(get_state):
+    """Record the size of get_state() on every SESSION_SAMPLE_EVERY-th call."""
+    if next(_reruns) % SESSION_SAMPLE_EVERY == 0:
+        SESSION_STATE.observe(approximate_size(get_state()))
+
+
+# Exporters
+
+def write_textfile(path):
+    """Atomically replace `path` with the current metrics."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(registry.render())
+        os.replace(tmp, path)
+    except OSError:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def _write_periodically(path, interval):
+    while True:
+        time.sleep(interval)
+        try:
+            write_textfile(path)
+        except OSError:
+            pass
+
+
+def start_http_server(port, host="127.0.0.1"):
+    """Serve GET /metrics from a daemon thread; returns the server."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="ethixguard-metrics", daemon=True).start()
+    return server
+
+
+# Start the configured exporters once per process (Streamlit reruns call this every time)
+@lru_cache(maxsize=None)
+def start_exporters():
+    if METRICS_PORT:
+        try:
+            start_http_server(int(METRICS_PORT), METRICS_HOST)
+        except OSError:
+            # Another process of the app already serves this port
+            pass
+    if METRICS_FILE:
+        threading.Thread(target=_write_periodically, args=(METRICS_FILE, METRICS_INTERVAL),
+                         name="ethixguard-metrics-file", daemon=True).start()
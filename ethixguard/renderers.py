@@ -0,0 +1,329 @@
+"""Incremental report renderers (Markdown, HTML, JSON, PDF).
+
+evaluation.write_result walks an EvaluationResult once and drives a
+renderer through a small set of calls:
+
+    start(title, generated_on)
+    section(title)
+    item(label, answer, status, emphasize=False, note=None)
+    summary(counts)
+    heading(text)
+    recommendation(text)
+    finish()
+
+Each renderer writes its output to a file-like sink as the calls arrive, so
+a report never has to exist as one big string. Text formats write str to
+a text sink; PDF writes bytes to a binary sink. render_result() handles the
+wrapping for callers that just have a binary file.
+"""
+import html
+import io
+import json
+import textwrap
+
+from ethixguard.evaluation import STATUS_LABELS, evaluate, write_result
+from ethixguard.metrics import span
+
+STATUS_TEXT = {"pass": "PASS", "warning": "WARNING", "violation": "VIOLATION"}
+
+
+class MarkdownRenderer:
+    """Byte-for-byte the Markdown that generate_report has always produced."""
+
+    def __init__(self, sink):
+        self.sink = sink
+
+    def start(self, title, generated_on):
+        self.sink.write(f"\n# {title}\nGenerated on: {generated_on}\n\n")
+
+    def section(self, title):
+        self.sink.write(f"## {title}\n\n")
+
+    def item(self, label, answer, status, emphasize=False, note=None):
+        label = f"**{label}**" if emphasize else label
+        suffix = f" - {note}" if note else ""
+        self.sink.write(f"- {label}: {answer} ({STATUS_LABELS[status]}){suffix}\n")
+
+    def summary(self, counts):
+        self.sink.write(
+            "\n### Summary\n"
+            f"- Passes: {counts['pass']}\n"
+            f"- Warnings: {counts['warning']}\n"
+            f"- Violations: {counts['violation']}\n\n"
+        )
+
+    def heading(self, text):
+        self.sink.write(f"### {text}\n")
+
+    def recommendation(self, text):
+        self.sink.write(f"- {text}\n")
+
+    def finish(self):
+        pass
+
+
+class HTMLRenderer:
+    """Standalone HTML page with status-coloured checklist items."""
+
+    STYLE = (
+        "body{font-family:sans-serif;max-width:60em;margin:2em auto;line-height:1.4}"
+        ".pass{color:#006100}.warning{color:#9c6500}.violation{color:#9c0006}"
+    )
+
+    def __init__(self, sink):
+        self.sink = sink
+        self.in_list = False
+
+    def _list(self, open_):
+        if open_ != self.in_list:
+            self.sink.write("<ul>\n" if open_ else "</ul>\n")
+            self.in_list = open_
+
+    def start(self, title, generated_on):
+        title = html.escape(title)
+        self.sink.write(
+            f"<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>{title}</title>"
+            f"<style>{self.STYLE}</style></head><body>\n"
+            f"<h1>{title}</h1>\n<p>Generated on: {html.escape(generated_on)}</p>\n"
+        )
+
+    def section(self, title):
+        self._list(False)
+        self.sink.write(f"<h2>{html.escape(title)}</h2>\n")
+
+    def item(self, label, answer, status, emphasize=False, note=None):
+        self._list(True)
+        label = html.escape(label)
+        label = f"<strong>{label}</strong>" if emphasize else label
+        suffix = f" &ndash; {html.escape(note)}" if note else ""
+        self.sink.write(f"<li>{label}: {html.escape(str(answer))} "
+                        f"<span class=\"{status}\">({html.escape(STATUS_LABELS[status])})</span>{suffix}</li>\n")
+
+    def summary(self, counts):
+        self._list(False)
+        self.sink.write(
+            "<h3>Summary</h3>\n<ul>\n"
+            f"<li>Passes: {counts['pass']}</li>\n"
+            f"<li>Warnings: {counts['warning']}</li>\n"
+            f"<li>Violations: {counts['violation']}</li>\n</ul>\n"
+        )
+
+    def heading(self, text):
+        self._list(False)
+        self.sink.write(f"<h3>{html.escape(text)}</h3>\n")
+
+    def recommendation(self, text):
+        self._list(True)
+        self.sink.write(f"<li>{html.escape(text)}</li>\n")
+
+    def finish(self):
+        self._list(False)
+        self.sink.write("</body></html>\n")
+
+
+class JSONRenderer:
+    """One JSON document, streamed out section by section.
+
+    {"title", "generated_on", "sections": [{"title", "items": [...], "summary"}]}
+    Checklist items carry label/answer/status(/note); the recommendations
+    section holds {"heading": ...} and {"recommendation": ...} items.
+    """
+
+    def __init__(self, sink):
+        self.sink = sink
+        self.first_section = True
+        self.open_section = False
+        self.first_item = True
+
+    def _close_items(self):
+        if self.open_section and self.first_item is not None:
+            self.sink.write("]")
+            self.first_item = None
+
+    def _close_section(self):
+        if self.open_section:
+            self._close_items()
+            self.sink.write("}")
+
+    def _entry(self, value):
+        if self.first_item is None:
+            raise ValueError("items cannot follow the section summary")
+        self.sink.write(("" if self.first_item else ",") + json.dumps(value, ensure_ascii=False))
+        self.first_item = False
+
+    def start(self, title, generated_on):
+        self.sink.write(f'{{"title":{json.dumps(title)},"generated_on":{json.dumps(generated_on)},"sections":[')
+
+    def section(self, title):
+        self._close_section()
+        self.sink.write(("" if self.first_section else ",") + f'{{"title":{json.dumps(title)},"items":[')
+        self.first_section = False
+        self.open_section = True
+        self.first_item = True
+
+    def item(self, label, answer, status, emphasize=False, note=None):
+        entry = {"label": label, "answer": answer, "status": status}
+        if note:
+            entry["note"] = note
+        self._entry(entry)
+
+    def summary(self, counts):
+        self._close_items()
+        self.sink.write(f',"summary":{json.dumps(counts)}')
+
+    def heading(self, text):
+        self._entry({"heading": text})
+
+    def recommendation(self, text):
+        self._entry({"recommendation": text})
+
+    def finish(self):
+        self._close_section()
+        self.sink.write("]}\n")
+
+
+class PDFRenderer:
+    """Minimal PDF 1.4 writer using the built-in Helvetica fonts.
+
+    Pages are written to the (binary) sink as soon as they fill up, so only
+    the current page's text is held in memory. The standard fonts only cover
+    Latin-1, so status emoji become plain text and other characters outside
+    that range are replaced.
+    """
+
+    PAGE_WIDTH, PAGE_HEIGHT = 595, 842  # A4 in points
+    MARGIN = 56
+    WRAP = 92  # characters per line at 10pt Helvetica, roughly
+
+    # Object numbers fixed up front; pages follow from FIRST_PAGE_OBJECT
+    CATALOG, PAGES, FONT, FONT_BOLD = 1, 2, 3, 4
+    FIRST_PAGE_OBJECT = 5
+
+    def __init__(self, sink):
+        self.sink = sink
+        self.offsets = {}
+        self.position = 0
+        self.page_ids = []
+        self.next_object = self.FIRST_PAGE_OBJECT
+        self.lines = []
+        self.y = None
+
+    def _write(self, data):
+        self.sink.write(data)
+        self.position += len(data)
+
+    def _object(self, number, body):
+        self.offsets[number] = self.position
+        self._write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+
+    @staticmethod
+    def _escape(text):
+        text = text.encode("latin-1", "replace").decode("latin-1")
+        return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+    def _line(self, text, size=10, bold=False, gap=4):
+        for chunk in textwrap.wrap(text, int(self.WRAP * 10 / size)) or [""]:
+            if self.y is None or self.y - size < self.MARGIN:
+                self._flush_page()
+                self.y = self.PAGE_HEIGHT - self.MARGIN
+            self.y -= size + gap
+            font = "F2" if bold else "F1"
+            self.lines.append(f"BT /{font} {size} Tf {self.MARGIN} {self.y} Td ({self._escape(chunk)}) Tj ET")
+
+    def _flush_page(self):
+        if not self.lines:
+            return
+        content = "\n".join(self.lines).encode("latin-1")
+        content_id, page_id = self.next_object, self.next_object + 1
+        self.next_object += 2
+        self._object(content_id, b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+        self._object(page_id, (
+            f"<< /Type /Page /Parent {self.PAGES} 0 R /MediaBox [0 0 {self.PAGE_WIDTH} {self.PAGE_HEIGHT}] "
+            f"/Resources << /Font << /F1 {self.FONT} 0 R /F2 {self.FONT_BOLD} 0 R >> >> "
+            f"/Contents {content_id} 0 R >>"
+        ).encode("ascii"))
+        self.page_ids.append(page_id)
+        self.lines = []
+
+    def start(self, title, generated_on):
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self._line(title, size=18, bold=True, gap=8)
+        self._line(f"Generated on: {generated_on}", gap=10)
+
+    def section(self, title):
+        self._line(title, size=14, bold=True, gap=12)
+
+    def item(self, label, answer, status, emphasize=False, note=None):
+        suffix = f" - {note}" if note else ""
+        self._line(f"- {label}: {answer} ({STATUS_TEXT[status]}){suffix}")
+
+    def summary(self, counts):
+        self._line("Summary", size=12, bold=True, gap=10)
+        self._line(f"- Passes: {counts['pass']}")
+        self._line(f"- Warnings: {counts['warning']}")
+        self._line(f"- Violations: {counts['violation']}")
+
+    def heading(self, text):
+        self._line(text, size=12, bold=True, gap=10)
+
+    def recommendation(self, text):
+        self._line(f"- {text}")
+
+    def finish(self):
+        self._flush_page()
+        self._object(self.FONT, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+        self._object(self.FONT_BOLD, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>")
+        kids = " ".join(f"{page} 0 R" for page in self.page_ids)
+        self._object(self.PAGES, f"<< /Type /Pages /Kids [{kids}] /Count {len(self.page_ids)} >>".encode("ascii"))
+        self._object(self.CATALOG, f"<< /Type /Catalog /Pages {self.PAGES} 0 R >>".encode("ascii"))
+
+        xref_at = self.position
+        size = self.next_object
+        rows = [b"xref\n0 %d\n" % size, b"0000000000 65535 f \n"]
+        for number in range(1, size):
+            rows.append(b"%010d 00000 n \n" % self.offsets[number])
+        self._write(b"".join(rows))
+        self._write(b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (size, self.CATALOG, xref_at))
+
+
+# Download format -> (renderer, binary output, file extension, MIME type)
+FORMATS = {
+    "markdown": (MarkdownRenderer, False, "md", "text/markdown"),
+    "html": (HTMLRenderer, False, "html", "text/html"),
+    "json": (JSONRenderer, False, "json", "application/json"),
+    "pdf": (PDFRenderer, True, "pdf", "application/pdf"),
+}
+
+
+def render_result(fmt, result, sink, generated_on=None):
+    """Stream the report of an EvaluationResult in `fmt` into a binary file-like `sink`."""
+    renderer_class, binary, _, _ = FORMATS[fmt]
+    with span("render", fmt):
+        if binary:
+            write_result(result, renderer_class(sink), generated_on)
+            return
+        text = io.TextIOWrapper(sink, encoding="utf-8", newline="", write_through=True)
+        try:
+            write_result(result, renderer_class(text), generated_on)
+            text.flush()
+        finally:
+            # Leave the caller's sink open
+            text.detach()
+
+
+def render_to(fmt, biosafety_data, ethics_data, sink, generated_on=None):
+    """Evaluate a submission and stream its report in `fmt` into `sink`."""
+    render_result(fmt, evaluate(biosafety_data, ethics_data), sink, generated_on)
+
+
+def open_rendered(fmt, result, generated_on=None):
+    """Render an EvaluationResult's report into a rewound in-memory binary file.
+
+    Meant as the deferred data source of a download button, so the payload
+    is only produced when it is actually requested and is served as a file
+    rather than embedded in the page.
+    """
+    handle = io.BytesIO()
+    render_result(fmt, result, handle, generated_on)
+    handle.seek(0)
+    return handle
@@ -0,0 +1,267 @@
+"""BM25 retrieval over guideline paragraphs (DBT, CPCSEA, ICMR, ...).
+
+The index is built offline and saved as a directory of flat NumPy arrays so a
+Streamlit worker can memory-map it instead of parsing it on every rerun:
+
+    meta.json         corpus statistics and BM25 parameters
+    terms.bin         sorted vocabulary, UTF-8 terms back to back
+    term_offsets.npy  byte offsets into terms.bin
+    idf.npy           idf per term
+    offsets.npy       CSR row pointers into the postings, one row per term
+    doc_ids.npy       posting document ids
+    tfs.npy           posting term frequencies
+    doc_len.npy       token count per paragraph
+    text.bin          UTF-8 paragraph text, back to back
+    text_offsets.npy  byte offsets into text.bin
+    sources.json      source label per paragraph
+
+Build one with:
+
+    python -m ethixguard.retrieval build guidelines/*.txt --out guidelines_index
+    python -m ethixguard.retrieval query guidelines_index "animal house licence" -k 3
+
+Plain text files are split into paragraphs on blank lines. JSONL files are
+read one paragraph per line from the "text" field (and "source" if present).
+"""
+import argparse
+import json
+import mmap
+import os
+import re
+
+import numpy as np
+
+FORMAT_VERSION = 2
+
+STOPWORDS = frozenset("""
+a an and are as at be been by can do does for from has have how i if in is it
+its me my of on or our should that the their there these this to was we what
+when where which who why will with you your
+""".split())
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text):
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+def read_paragraphs(paths):
+    """Yield (source, text) pairs from .txt/.md or .jsonl files."""
+    for path in paths:
+        source = os.path.basename(path)
+        with open(path, encoding="utf-8") as handle:
+            if path.endswith(".jsonl"):
+                for line in handle:
+                    if line.strip():
+                        record = json.loads(line)
+                        yield record.get("source", source), record["text"]
+            else:
+                for block in re.split(r"\n\s*\n", handle.read()):
+                    block = " ".join(block.split())
+                    if block:
+                        yield source, block
+
+
+def build_index(paragraphs, out_dir, k1=1.5, b=0.75):
+    """Tokenize (source, text) pairs and write the on-disk index to `out_dir`."""
+    os.makedirs(out_dir, exist_ok=True)
+
+    vocab = {}
+    post_terms, post_docs, post_tfs = [], [], []
+    doc_len, sources, text_offsets = [], [], [0]
+
+    with open(os.path.join(out_dir, "text.bin"), "wb") as text_file:
+        for doc_id, (source, text) in enumerate(paragraphs):
+            counts = {}
+            tokens = tokenize(text)
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+            for token, tf in counts.items():
+                post_terms.append(vocab.setdefault(token, len(vocab)))
+                post_docs.append(doc_id)
+                post_tfs.append(tf)
+            doc_len.append(len(tokens))
+            sources.append(source)
+            encoded = text.encode("utf-8")
+            text_file.write(encoded)
+            text_offsets.append(text_offsets[-1] + len(encoded))
+
+    num_docs = len(doc_len)
+    terms = sorted(vocab)
+    # Renumber term ids so they follow the sorted vocabulary
+    rank = np.empty(len(vocab), dtype=np.int64)
+    rank[[vocab[t] for t in terms]] = np.arange(len(terms))
+    term_ids = rank[np.asarray(post_terms, dtype=np.int64)]
+    doc_ids = np.asarray(post_docs, dtype=np.int32)
+    tfs = np.asarray(post_tfs, dtype=np.float32)
+
+    order = np.lexsort((doc_ids, term_ids))
+    term_ids, doc_ids, tfs = term_ids[order], doc_ids[order], tfs[order]
+    df = np.bincount(term_ids, minlength=len(terms))
+    offsets = np.concatenate(([0], np.cumsum(df))).astype(np.int64)
+    idf = np.log1p((num_docs - df + 0.5) / (df + 0.5)).astype(np.float32)
+
+    # Code point order is also UTF-8 byte order, so the blob stays sorted bytewise
+    encoded_terms = [t.encode("utf-8") for t in terms]
+    with open(os.path.join(out_dir, "terms.bin"), "wb") as handle:
+        handle.write(b"".join(encoded_terms))
+    term_offsets = np.concatenate(([0], np.cumsum([len(t) for t in encoded_terms]))).astype(np.int64)
+    np.save(os.path.join(out_dir, "term_offsets.npy"), term_offsets)
+    np.save(os.path.join(out_dir, "idf.npy"), idf)
+    np.save(os.path.join(out_dir, "offsets.npy"), offsets)
+    np.save(os.path.join(out_dir, "doc_ids.npy"), doc_ids)
+    np.save(os.path.join(out_dir, "tfs.npy"), tfs)
+    np.save(os.path.join(out_dir, "doc_len.npy"), np.asarray(doc_len, dtype=np.float32))
+    np.save(os.path.join(out_dir, "text_offsets.npy"), np.asarray(text_offsets, dtype=np.int64))
+    with open(os.path.join(out_dir, "sources.json"), "w", encoding="utf-8") as handle:
+        json.dump(sources, handle)
+    with open(os.path.join(out_dir, "meta.json"), "w", encoding="utf-8") as handle:
+        json.dump({
+            "version": FORMAT_VERSION,
+            "num_docs": num_docs,
+            "num_terms": len(terms),
+            "avg_doc_len": float(np.mean(doc_len)) if doc_len else 0.0,
+            "k1": k1,
+            "b": b,
+        }, handle, indent=2)
+    return num_docs
+
+
+class BM25Index:
+    """Read-only view over an index directory written by build_index."""
+
+    def __init__(self, path, mmap=True):
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as handle:
+            meta = json.load(handle)
+        if meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported index format in {path}: {meta.get('version')}")
+        self.path = path
+        self.num_docs = meta["num_docs"]
+        self.num_terms = meta["num_terms"]
+        self.k1 = meta["k1"]
+        self.b = meta["b"]
+        self.avg_doc_len = meta["avg_doc_len"] or 1.0
+
+        mode = "r" if mmap else None
+
+        def load(name):
+            return np.load(os.path.join(path, name), mmap_mode=mode)
+
+        self.term_offsets = load("term_offsets.npy")
+        self._terms = None
+        self.idf = load("idf.npy")
+        self.offsets = load("offsets.npy")
+        self.doc_ids = load("doc_ids.npy")
+        self.tfs = load("tfs.npy")
+        self.text_offsets = load("text_offsets.npy")
+        # Length normalisation is per document, so fold it in once at load time
+        self.norm = (self.k1 * (1 - self.b + self.b * load("doc_len.npy") / self.avg_doc_len)).astype(np.float32)
+        self._sources = None
+        self._text = None
+
+    def __len__(self):
+        return self.num_docs
+
+    def term(self, term_id):
+        """UTF-8 bytes of one vocabulary term."""
+        if self._terms is None:
+            with open(os.path.join(self.path, "terms.bin"), "rb") as handle:
+                # Mapped, not read, so workers share the pages; mmap cannot map an empty file
+                self._terms = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) \
+                    if self.term_offsets[-1] else b""
+        return self._terms[int(self.term_offsets[term_id]):int(self.term_offsets[term_id + 1])]
+
+    def term_id(self, token):
+        """Id of `token` in the sorted vocabulary (binary search), or None."""
+        key = token.encode("utf-8")
+        lo, hi = 0, self.num_terms
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.term(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo if lo < self.num_terms and self.term(lo) == key else None
+
+    def term_ids(self, tokens):
+        found = {self.term_id(token) for token in set(tokens)}
+        found.discard(None)
+        return np.asarray(sorted(found), dtype=np.int64)
+
+    def scores(self, query):
+        """BM25 score of every paragraph for `query` as a float32 array."""
+        ids = self.term_ids(tokenize(query))
+        if not len(ids):
+            return np.zeros(self.num_docs, dtype=np.float32)
+        starts, ends = self.offsets[ids], self.offsets[ids + 1]
+        lengths = ends - starts
+        # Gather every posting of every query term in one vectorised pass
+        row = np.repeat(np.arange(len(ids)), lengths)
+        within = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        positions = np.repeat(starts, lengths) + within
+        docs = self.doc_ids[positions]
+        tf = self.tfs[positions]
+        weights = self.idf[ids][row] * tf * (self.k1 + 1) / (tf + self.norm[docs])
+        return np.bincount(docs, weights=weights, minlength=self.num_docs).astype(np.float32)
+
+    def search(self, query, k=5):
+        """Top-k paragraphs as a list of (score, source, text), best first."""
+        scores = self.scores(query)
+        hits = np.flatnonzero(scores > 0)
+        if not len(hits):
+            return []
+        if len(hits) > k:
+            hits = hits[np.argpartition(-scores[hits], k - 1)[:k]]
+        hits = hits[np.argsort(-scores[hits], kind="stable")]
+        return [(float(scores[i]), self.source(i), self.text(i)) for i in hits]
+
+    def source(self, doc_id):
+        if self._sources is None:
+            with open(os.path.join(self.path, "sources.json"), encoding="utf-8") as handle:
+                self._sources = json.load(handle)
+        return self._sources[doc_id]
+
+    def text(self, doc_id):
+        if self._text is None:
+            self._text = np.memmap(os.path.join(self.path, "text.bin"), dtype=np.uint8, mode="r") \
+                if self.text_offsets[-1] else np.empty(0, dtype=np.uint8)
+        start, end = self.text_offsets[doc_id], self.text_offsets[doc_id + 1]
+        return bytes(self._text[start:end]).decode("utf-8")
+
+
+def load_index(path, mmap=True):
+    """Open an index directory, or return None when it has not been built."""
+    if not os.path.exists(os.path.join(path, "meta.json")):
+        return None
+    return BM25Index(path, mmap=mmap)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m ethixguard.retrieval",
+                                     description="Build or query a BM25 guideline index.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="index .txt/.md/.jsonl guideline files")
+    build.add_argument("files", nargs="+")
+    build.add_argument("--out", required=True, help="index directory to write")
+    build.add_argument("--k1", type=float, default=1.5)
+    build.add_argument("--b", type=float, default=0.75)
+
+    query = commands.add_parser("query", help="print the top-k paragraphs for a question")
+    query.add_argument("index")
+    query.add_argument("question")
+    query.add_argument("-k", type=int, default=5)
+
+    args = parser.parse_args(argv)
+    if args.command == "build":
+        count = build_index(read_paragraphs(args.files), args.out, k1=args.k1, b=args.b)
+        print(f"Indexed {count} paragraphs into {args.out}")
+    else:
+        index = BM25Index(args.index)
+        for score, source, text in index.search(args.question, k=args.k):
+            print(f"[{score:.2f}] {source}: {text}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""Local HTTP API for programmatic evaluation and guidance (stdlib asyncio only).
+
+    python -m ethixguard.server --host 127.0.0.1 --port 8765
+
+Endpoints (JSON in, JSON out):
+
+    GET  /health
+    POST /evaluate        {"biosafety": {...}, "ethics": {...}, "report": true}
+    POST /evaluate/batch  {"submissions": [{"id": ..., "biosafety": {...}, "ethics": {...}}, ...]}
+    POST /ask             {"question": "...", "top_k": 1}
+    POST /ask/batch       {"questions": ["...", ...]}
+
+Connections are HTTP/1.1 keep-alive. At most `max_concurrency` requests are
+processed at once (others wait their turn), connections beyond
+`max_connections` are refused with 503, and bodies above `max_body` bytes
+get 413. Single requests are answered on the event loop; batch requests run
+in a thread pool so one large batch cannot stall other clients.
+"""
+import argparse
+import asyncio
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from ethixguard.ask import answer_all
+from ethixguard.assistant import get_response
+from ethixguard.batch import evaluate_submission
+
+logger = logging.getLogger(__name__)
+
+REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    408: "Request Timeout", 411: "Length Required", 413: "Payload Too Large",
+    500: "Internal Server Error", 501: "Not Implemented", 503: "Service Unavailable",
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message=None):
+        super().__init__(message or REASONS[status])
+        self.status = status
+
+
+def _object(value, what):
+    if not isinstance(value, dict):
+        raise HTTPError(400, f"{what} must be a JSON object")
+    return value
+
+
+def _require(payload, key, kind):
+    value = payload.get(key) if isinstance(payload, dict) else None
+    if not isinstance(value, kind):
+        raise HTTPError(400, f"'{key}' must be a {kind.__name__}")
+    return value
+
+
+def _answers(payload, key, what):
+    answers = _require(payload, key, dict)
+    for question, answer in answers.items():
+        if not isinstance(answer, str):
+            raise HTTPError(400, f"{what}: answer to {key} question {question!r} must be a string")
+    return answers
+
+
+def _submission(payload, default_id=None, what="request body"):
+    _object(payload, what)
+    return {
+        "id": payload.get("id", default_id),
+        "biosafety": _answers(payload, "biosafety", what),
+        "ethics": _answers(payload, "ethics", what),
+    }
+
+
+# Handlers take the decoded JSON body and return a JSON-serialisable result
+
+def handle_evaluate(payload):
+    submission = _submission(payload)
+    return evaluate_submission(submission, include_report=payload.get("report", True))
+
+
+def handle_evaluate_batch(payload):
+    submissions = _require(payload, "submissions", list)
+    include_report = payload.get("report", True)
+    submissions = [_submission(item, i, f"submissions[{i}]") for i, item in enumerate(submissions)]
+    return {"results": [evaluate_submission(submission, include_report) for submission in submissions]}
+
+
+def handle_ask(payload):
+    question = _require(payload, "question", str)
+    top_k = payload.get("top_k", 1)
+    # bool is an int subclass, but {"top_k": true} is not a count
+    if not isinstance(top_k, int) or isinstance(top_k, bool) or top_k < 1:
+        raise HTTPError(400, "'top_k' must be a positive integer")
+    return {"answer": get_response(question, top_k=top_k)}
+
+
+def handle_ask_batch(payload):
+    questions = _require(payload, "questions", list)
+    for i, question in enumerate(questions):
+        if not isinstance(question, str):
+            raise HTTPError(400, f"questions[{i}] must be a string")
+    return {"answers": answer_all(questions)}
+
+
+# path -> (handler, runs in thread pool)
+ROUTES = {
+    "/evaluate": (handle_evaluate, False),
+    "/evaluate/batch": (handle_evaluate_batch, True),
+    "/ask": (handle_ask, False),
+    "/ask/batch": (handle_ask_batch, True),
+}
+
+
+class APIServer:
+    def __init__(self, host="127.0.0.1", port=8765, max_concurrency=64, max_connections=1024,
+                 max_body=10 * 1024 * 1024, keepalive_timeout=15.0, batch_workers=4):
+        self.host = host
+        self.port = port
+        self.max_connections = max_connections
+        self.max_body = max_body
+        self.keepalive_timeout = keepalive_timeout
+        self.max_concurrency = max_concurrency
+        self.batch_workers = batch_workers
+        self.connections = 0
+        self.requests = 0
+        self._server = None
+        self._slots = None
+        self._executor = None
+
+    async def start(self):
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=self.batch_workers,
+                                            thread_name_prefix="ethixguard-api")
+        self._server = await asyncio.start_server(self._serve_connection, self.host, self.port)
+        # Report the real port when an ephemeral one (0) was requested
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def close(self):
+        self._server.close()
+        await self._server.wait_closed()
+        self._executor.shutdown(wait=False)
+
+    async def _serve_connection(self, reader, writer):
+        if self.connections >= self.max_connections:
+            await self._respond(writer, 503, {"error": "too many connections"}, keep_alive=False)
+            writer.close()
+            return
+        self.connections += 1
+        try:
+            keep_alive = True
+            while keep_alive:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), self.keepalive_timeout)
+                except asyncio.TimeoutError:
+                    break
+                except HTTPError as exc:
+                    await self._respond(writer, exc.status, {"error": str(exc)}, keep_alive=False)
+                    break
+                if request is None:
+                    break
+                method, path, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                status, result = await self._dispatch(method, path, body)
+                await self._respond(writer, status, result, keep_alive)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    async def _read_request(self, reader):
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError as exc:
+            if not exc.partial:
+                return None  # client closed an idle connection
+            raise HTTPError(400, "incomplete request")
+        except asyncio.LimitOverrunError:
+            raise HTTPError(413, "headers too large")
+
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, path, _ = lines[0].split(" ", 2)
+        except ValueError:
+            raise HTTPError(400, "malformed request line")
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            raise HTTPError(501, "chunked request bodies are not supported")
+        try:
+            length = int(headers.get("content-length", "0") or 0)
+        except ValueError:
+            raise HTTPError(400, "invalid Content-Length")
+        if length < 0:
+            raise HTTPError(400, "invalid Content-Length")
+        if length > self.max_body:
+            raise HTTPError(413)
+        body = await reader.readexactly(length) if length else b""
+        return method, path.split("?", 1)[0], headers, body
+
+    async def _dispatch(self, method, path, body):
+        self.requests += 1
+        if path == "/health":
+            return 200, {"status": "ok", "connections": self.connections, "requests": self.requests}
+        route = ROUTES.get(path)
+        if route is None:
+            return 404, {"error": f"no such endpoint: {path}"}
+        if method != "POST":
+            return 405, {"error": "use POST"}
+        handler, in_pool = route
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError as exc:
+            return 400, {"error": f"invalid JSON body: {exc}"}
+        async with self._slots:
+            try:
+                if in_pool:
+                    result = await asyncio.get_running_loop().run_in_executor(self._executor, handler, payload)
+                else:
+                    result = handler(payload)
+                return 200, result
+            except HTTPError as exc:
+                return exc.status, {"error": str(exc)}
+            except Exception:
+                logger.exception("Error handling %s", path)
+                return 500, {"error": "internal error"}
+
+    async def _respond(self, writer, status, result, keep_alive):
+        body = json.dumps(result, ensure_ascii=False).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m ethixguard.server",
+                                     description="Serve the EthixGuard evaluation and guidance API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-concurrency", type=int, default=64)
+    parser.add_argument("--max-connections", type=int, default=1024)
+    parser.add_argument("--batch-workers", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    async def run():
+        server = await APIServer(args.host, args.port, max_concurrency=args.max_concurrency,
+                                 max_connections=args.max_connections,
+                                 batch_workers=args.batch_workers).start()
+        print(f"EthixGuard API listening on http://{server.host}:{server.port}")
+        await server.serve_forever()
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,365 @@
+"""Persistent, versioned submission store on SQLite.
+
+Every time a form is saved, a snapshot of the project's current answers is
+stored as a new version. The database runs in WAL mode so dashboard reads
+never block the writer. Writes are queued and committed in batches by a
+single background thread, so a burst of saves from many sessions costs one
+transaction instead of one fsync each.
+
+    ETHIXGUARD_DB=/srv/ethixguard/submissions.db   # default: ./ethixguard.db
+    ETHIXGUARD_DB=                                 # empty: persistence off
+
+Example dashboard query, "Animal Research projects below BSL-2 this quarter":
+
+    get_store().query(research_type="Animal Research", below_bsl="BSL-2",
+                      since="2026-10-01")
+
+Alongside the raw rows, the `rollups` table keeps pass/warning/violation
+totals of every project's latest version, bucketed by research type,
+containment level and day of that version. It is updated in the same
+transaction as each insert (subtract the project's previous latest, add the
+new one), so dashboards read a handful of pre-aggregated rows no matter how
+long the history is.
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from functools import lru_cache
+
+from ethixguard.checklists import SECTIONS, STATUSES, get_checklists
+from ethixguard.evaluation import evaluate
+
+logger = logging.getLogger(__name__)
+
+DB_PATH = os.environ.get("ETHIXGUARD_DB", "ethixguard.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS submissions (
+    id                  INTEGER PRIMARY KEY,
+    project_id          TEXT    NOT NULL,
+    version             INTEGER NOT NULL,
+    form                TEXT    NOT NULL,
+    latest              INTEGER NOT NULL DEFAULT 1,
+    research_type       TEXT,
+    containment_level   INTEGER,
+    status              TEXT    NOT NULL,
+    biosafety_pass      INTEGER NOT NULL,
+    biosafety_warning   INTEGER NOT NULL,
+    biosafety_violation INTEGER NOT NULL,
+    ethics_pass         INTEGER NOT NULL,
+    ethics_warning      INTEGER NOT NULL,
+    ethics_violation    INTEGER NOT NULL,
+    biosafety_data      TEXT    NOT NULL,
+    ethics_data         TEXT    NOT NULL,
+    created_at          TEXT    NOT NULL,
+    UNIQUE (project_id, version)
+);
+CREATE INDEX IF NOT EXISTS idx_submissions_type_level_date
+    ON submissions (research_type, containment_level, created_at);
+CREATE INDEX IF NOT EXISTS idx_submissions_level_date
+    ON submissions (containment_level, created_at);
+CREATE INDEX IF NOT EXISTS idx_submissions_status_date
+    ON submissions (status, created_at);
+CREATE INDEX IF NOT EXISTS idx_submissions_date
+    ON submissions (created_at);
+
+CREATE TABLE IF NOT EXISTS rollups (
+    day                 TEXT    NOT NULL,
+    research_type       TEXT    NOT NULL,
+    containment_level   INTEGER NOT NULL,
+    projects            INTEGER NOT NULL DEFAULT 0,
+    status_pass         INTEGER NOT NULL DEFAULT 0,
+    status_warning      INTEGER NOT NULL DEFAULT 0,
+    status_violation    INTEGER NOT NULL DEFAULT 0,
+    biosafety_pass      INTEGER NOT NULL DEFAULT 0,
+    biosafety_warning   INTEGER NOT NULL DEFAULT 0,
+    biosafety_violation INTEGER NOT NULL DEFAULT 0,
+    ethics_pass         INTEGER NOT NULL DEFAULT 0,
+    ethics_warning      INTEGER NOT NULL DEFAULT 0,
+    ethics_violation    INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, research_type, containment_level)
+);
+"""
+
+COUNT_COLUMNS = tuple(f"{section}_{status}" for section in SECTIONS for status in STATUSES)
+ROLLUP_COLUMNS = ("projects", "status_pass", "status_warning", "status_violation") + COUNT_COLUMNS
+
+# Rollup keys cannot be NULL, so missing values get these placeholders
+NO_RESEARCH_TYPE = ""
+NO_CONTAINMENT_LEVEL = -1
+
+ROLLUP_UPSERT = (
+    f"INSERT INTO rollups (day, research_type, containment_level, {', '.join(ROLLUP_COLUMNS)}) "
+    f"VALUES (?, ?, ?, {', '.join('?' * len(ROLLUP_COLUMNS))}) "
+    "ON CONFLICT (day, research_type, containment_level) DO UPDATE SET "
+    + ", ".join(f"{c} = {c} + excluded.{c}" for c in ROLLUP_COLUMNS)
+)
+
+
+def now_utc():
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def submission_row(project_id, form, biosafety_data, ethics_data, created_at=None):
+    """Column values for one saved snapshot (everything except id and version)."""
+    checklists = get_checklists()
+    result = evaluate(biosafety_data, ethics_data, checklists)
+    if not ethics_data:
+        # Without an ethics form there is no containment check to count
+        result.counts["ethics"] = dict.fromkeys(STATUSES, 0)
+    level = ethics_data.get(checklists.containment_question.key)
+    return {
+        "project_id": project_id,
+        "form": form,
+        "research_type": ethics_data.get(checklists.research_type_field.key),
+        "containment_level": checklists.bsl_hierarchy.get(level) if level else None,
+        "status": result.status,
+        **{f"{section}_{status}": result.counts[section][status] for section in SECTIONS for status in STATUSES},
+        "biosafety_data": json.dumps(biosafety_data, ensure_ascii=False),
+        "ethics_data": json.dumps(ethics_data, ensure_ascii=False),
+        "created_at": created_at or now_utc(),
+    }
+
+
+class SubmissionStore:
+    """Versioned submissions with a background batching writer."""
+
+    def __init__(self, path=DB_PATH, batch_size=500, flush_interval=0.2):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._local = threading.local()
+        self._queue = queue.Queue()
+        self._closed = False
+
+        conn = self._connect()
+        try:
+            conn.executescript(SCHEMA)
+            # Databases created before rollups existed get them built once here
+            if conn.execute("SELECT NOT EXISTS (SELECT 1 FROM rollups) "
+                            "AND EXISTS (SELECT 1 FROM submissions)").fetchone()[0]:
+                self.rebuild_rollups(conn)
+        finally:
+            conn.close()
+
+        self._writer = threading.Thread(target=self._run, name="ethixguard-store-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _reader(self):
+        """One read connection per thread (sqlite3 connections are not shareable)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    # Writes
+
+    def save(self, project_id, form, biosafety_data, ethics_data, created_at=None):
+        """Queue a snapshot of the project's answers; it is committed shortly after."""
+        self.save_rows([submission_row(project_id, form, biosafety_data, ethics_data, created_at)])
+
+    def save_rows(self, rows):
+        if self._closed:
+            raise RuntimeError("submission store is closed")
+        for row in rows:
+            self._queue.put(row)
+
+    def flush(self):
+        """Block until everything queued so far has been committed."""
+        self._queue.join()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._writer.join()
+
+    def _run(self):
+        conn = self._connect()
+        stop = False
+        while not stop:
+            first = self._queue.get()
+            batch = []
+            if first is None:
+                stop = True
+            else:
+                batch.append(first)
+            # Collect whatever else arrives within the flush window
+            while len(batch) < self.batch_size:
+                try:
+                    row = self._queue.get(timeout=self.flush_interval if not stop else 0)
+                except queue.Empty:
+                    break
+                if row is None:
+                    stop = True
+                    self._queue.task_done()
+                    continue
+                batch.append(row)
+            try:
+                if batch:
+                    self._write(conn, batch)
+            except sqlite3.Error:
+                # Keep the writer alive; the failed batch is logged and dropped
+                logger.exception("Failed to store %d submissions", len(batch))
+            finally:
+                for _ in range(len(batch) + (first is None)):
+                    self._queue.task_done()
+        conn.close()
+
+    def _write(self, conn, rows):
+        columns = list(rows[0])
+        insert = (
+            f"INSERT INTO submissions (version, {', '.join(columns)}) "
+            f"SELECT COALESCE(MAX(version), 0) + 1, {', '.join('?' * len(columns))} "
+            "FROM submissions WHERE project_id = ?"
+        )
+        previous_latest = (
+            f"SELECT research_type, containment_level, status, created_at, {', '.join(COUNT_COLUMNS)} "
+            "FROM submissions WHERE project_id = ? AND latest = 1"
+        )
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for row in rows:
+                previous = conn.execute(previous_latest, (row["project_id"],)).fetchone()
+                if previous is not None:
+                    self._bump_rollup(conn, previous, -1)
+                    conn.execute("UPDATE submissions SET latest = 0 WHERE project_id = ? AND latest = 1",
+                                 (row["project_id"],))
+                conn.execute(insert, [row[c] for c in columns] + [row["project_id"]])
+                self._bump_rollup(conn, row, 1)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _bump_rollup(conn, row, sign):
+        """Add (sign=1) or remove (sign=-1) one project version from its rollup bucket."""
+        research_type = row["research_type"]
+        level = row["containment_level"]
+        conn.execute(ROLLUP_UPSERT, (
+            row["created_at"][:10],
+            NO_RESEARCH_TYPE if research_type is None else research_type,
+            NO_CONTAINMENT_LEVEL if level is None else level,
+            sign,
+            *(sign * (row["status"] == status) for status in STATUSES),
+            *(sign * row[c] for c in COUNT_COLUMNS),
+        ))
+
+    def rebuild_rollups(self, conn=None):
+        """Recompute the rollups from scratch (one full scan; for repair or migration)."""
+        own = conn is None
+        conn = conn or self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM rollups")
+            conn.execute(
+                f"INSERT INTO rollups (day, research_type, containment_level, {', '.join(ROLLUP_COLUMNS)}) "
+                f"SELECT substr(created_at, 1, 10), COALESCE(research_type, ?), COALESCE(containment_level, ?), "
+                "COUNT(*), SUM(status = 'pass'), SUM(status = 'warning'), SUM(status = 'violation'), "
+                f"{', '.join(f'SUM({c})' for c in COUNT_COLUMNS)} "
+                "FROM submissions WHERE latest = 1 GROUP BY 1, 2, 3",
+                (NO_RESEARCH_TYPE, NO_CONTAINMENT_LEVEL),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            if own:
+                conn.close()
+
+    # Reads
+
+    def query(self, research_type=None, below_bsl=None, status=None, since=None, until=None,
+              latest_only=True, limit=None):
+        """Submissions matching every given filter, newest first.
+
+        below_bsl takes a level name ("BSL-2") and matches lower containment.
+        since/until are "YYYY-MM-DD[ HH:MM:SS]" UTC bounds (until exclusive).
+        """
+        clauses, params = [], []
+        if research_type is not None:
+            clauses.append("research_type = ?")
+            params.append(research_type)
+        if below_bsl is not None:
+            clauses.append("containment_level < ?")
+            params.append(get_checklists().bsl_hierarchy[below_bsl])
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("created_at < ?")
+            params.append(until)
+        if latest_only:
+            clauses.append("latest = 1")
+        sql = "SELECT * FROM submissions"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY created_at DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [dict(row) for row in self._reader().execute(sql, params)]
+
+    def rollup(self, by=(), since=None, until=None):
+        """Totals of every project's latest version, grouped by any of
+        "day", "research_type" and "containment_level". Reads only the
+        pre-aggregated rollups table.
+        """
+        for column in by:
+            if column not in ("day", "research_type", "containment_level"):
+                raise ValueError(f"Cannot group rollups by {column!r}")
+        clauses, params = [], []
+        if since is not None:
+            clauses.append("day >= ?")
+            params.append(since[:10])
+        if until is not None:
+            clauses.append("day < ?")
+            params.append(until[:10])
+        sql = "SELECT " + "".join(f"{c}, " for c in by)
+        sql += ", ".join(f"SUM({c}) AS {c}" for c in ROLLUP_COLUMNS) + " FROM rollups"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        if by:
+            sql += f" GROUP BY {', '.join(by)} HAVING SUM(projects) > 0 ORDER BY {', '.join(by)}"
+        rows = [dict(row) for row in self._reader().execute(sql, params)]
+        for row in rows:
+            for column in ROLLUP_COLUMNS:
+                row[column] = row[column] or 0
+            if row.get("research_type") == NO_RESEARCH_TYPE:
+                row["research_type"] = None
+            if row.get("containment_level") == NO_CONTAINMENT_LEVEL:
+                row["containment_level"] = None
+        return rows
+
+    def history(self, project_id):
+        """All versions of one project, oldest first."""
+        rows = self._reader().execute(
+            "SELECT * FROM submissions WHERE project_id = ? ORDER BY version", (project_id,))
+        return [dict(row) for row in rows]
+
+
+# One store (and writer thread) per process, opened on first use
+@lru_cache(maxsize=None)
+def get_store():
+    if not DB_PATH:
+        return None
+    return SubmissionStore(DB_PATH)
@@ -0,0 +1,106 @@
+"""Compact per-session submission model.
+
+A Submission stores one byte per answered question instead of dicts of
+question -> answer strings:
+
+    biosafety   bytearray, one answer code per biosafety question (schema order)
+    ethics      bytearray, one answer code per question of the research type
+    research_type, containment   small integer codes
+    notes       the free-text notes, the only string kept per session
+
+Codes index the registry's answer and research type tables (0 means
+unanswered), so the strings themselves are shared by every session. The
+question -> answer dicts the scoring, report and store work with are built
+only when asked for, by biosafety_data() and ethics_data().
+"""
+from ethixguard.checklists import get_checklists
+
+
+class Submission:
+    __slots__ = ("checklists", "biosafety", "research_type", "containment", "ethics", "notes")
+
+    def __init__(self, checklists=None):
+        # Codes are only meaningful against the registry they were made with,
+        # so a submission keeps it until re-encoded with for_checklists()
+        self.checklists = checklists or get_checklists()
+        self.biosafety = None
+        self.research_type = 0
+        self.containment = 0
+        self.ethics = None
+        self.notes = ""
+
+    @property
+    def has_biosafety(self):
+        return self.biosafety is not None
+
+    @property
+    def has_ethics(self):
+        return self.ethics is not None
+
+    def _encode(self, answer):
+        try:
+            return self.checklists.answer_codes[answer]
+        except KeyError:
+            raise ValueError(f"{answer!r} is not an option in the checklist schema") from None
+
+    def _decode(self, code):
+        return self.checklists.answers[code - 1]
+
+    def set_biosafety(self, answers):
+        """Store {question key: answer} for the biosafety checklist."""
+        self.biosafety = bytearray(
+            self._encode(answers[question.key]) if question.key in answers else 0
+            for question in self.checklists.biosafety_questions
+        )
+
+    def set_ethics(self, research_type, answers, notes=""):
+        """Store the ethics form: research type, {question key: answer} and notes."""
+        checklists = self.checklists
+        self.research_type = checklists.research_type_codes[research_type]
+        containment = answers.get(checklists.containment_question.key)
+        self.containment = self._encode(containment) if containment is not None else 0
+        self.ethics = bytearray(
+            self._encode(answers[question.key]) if question.key in answers else 0
+            for question in checklists.ethics_questions[research_type]
+        )
+        self.notes = notes
+
+    def for_checklists(self, checklists):
+        """This submission re-encoded against another registry (after a schema reload).
+
+        Questions the new schema no longer has, and answers it no longer
+        offers, are dropped; so is the ethics form if its research type was
+        removed.
+        """
+        moved = Submission(checklists)
+        codes = checklists.answer_codes
+        if self.has_biosafety:
+            moved.set_biosafety({key: answer for key, answer in self.biosafety_data().items() if answer in codes})
+        if self.has_ethics:
+            research_type = self.checklists.research_types[self.research_type - 1]
+            if research_type in checklists.research_type_codes:
+                answers = {key: answer for key, answer in self.ethics_data().items() if answer in codes}
+                moved.set_ethics(research_type, answers, self.notes)
+        return moved
+
+    def biosafety_data(self):
+        """{question key: answer} in checklist order ({} before the form is saved)."""
+        if self.biosafety is None:
+            return {}
+        return {question.key: self._decode(code)
+                for question, code in zip(self.checklists.biosafety_questions, self.biosafety) if code}
+
+    def ethics_data(self):
+        """The saved ethics form as the report and store expect it ({} before saving)."""
+        if self.ethics is None:
+            return {}
+        checklists = self.checklists
+        research_type = checklists.research_types[self.research_type - 1]
+        data = {checklists.research_type_field.key: research_type}
+        if self.containment:
+            data[checklists.containment_question.key] = self._decode(self.containment)
+        for question, code in zip(checklists.ethics_questions[research_type], self.ethics):
+            if code:
+                data[question.key] = self._decode(code)
+        data[checklists.notes_field.key] = self.notes
+        return data
@@ -1,199 +1,48 @@
 import streamlit as st
-import pandas as pd
-import re
-from difflib import get_close_matches
-import base64
-from io import BytesIO
+import uuid
 from datetime import datetime
-#
-# Set page configuration
-st.set_page_config(
-    page_title="EthixGuard - Biosafety & Bioethics Compliance",
-    page_icon="🛡️",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
-
-# Define the knowledge base for the chatbot
-knowledge_base = {
-
-    # Biosafety Questions
-    "gmo": "GMOs (Genetically Modified Organisms) require special clearance from the GEAC (Genetic Engineering Approval Committee) in India. You need to obtain permission before any research, testing, or release.",
-    "biosafety committee": "An Institutional Biosafety Committee (IBSC) is mandatory for institutions handling genetically engineered organisms. They oversee compliance with guidelines and report to RCGM.",
-    "geac": "The Genetic Engineering Approval Committee (GEAC) is India's apex body for approval of activities involving large-scale use of hazardous microorganisms and recombinants in research and industrial production.",
-    "rcgm": "The Review Committee on Genetic Manipulation (RCGM) under DBT reviews all ongoing research projects involving high-risk category and controlled field experiments.",
-    "containment level": "Biosafety containment levels range from BSL-1 (minimal risk) to BSL-4 (dangerous pathogens). Each level requires specific safety equipment, practices, and facility design.",
-    "biosafety guidelines": "The Government of India has published comprehensive biosafety guidelines through DBT. These cover rDNA research, large-scale operations, and environmental release of GMOs.",
-
-    "ibsc": "The Institutional Biosafety Committee (IBSC) is responsible for overseeing biosafety in research institutions. They ensure compliance with guidelines and monitor ongoing projects.",
-    "training": "All personnel involved in handling GMOs must receive appropriate biosafety training. This includes understanding risks, safety practices, and emergency procedures.",
-
-    
-    # Ethics Questions
-    "informed consent": "Informed consent requires fully disclosing research procedures, risks, benefits, and alternatives to participants. Documentation must be maintained and approved by an ethics committee.",
-    "animal ethics": "Animal ethics requires adherence to the 3Rs principle: Replacement, Reduction, and Refinement. CPCSEA approval is needed for animal experiments in India.",
-    "food safety ethics": "Food safety ethics involves transparency about ingredients, additives, preservation methods, and potential allergens. All claims must be backed by scientific evidence.",
-    "research ethics": "Research ethics includes honest reporting, proper attribution, data integrity, declaring conflicts of interest, and respecting intellectual property rights.",
-    "institutional ethics committee": "An Institutional Ethics Committee (IEC) must review all research involving human subjects, ensuring protection of rights, safety, and well-being of participants.",
-
-    "cpcsea": "The Committee for the Purpose of Control and Supervision of Experiments on Animals (CPCSEA) is responsible for overseeing animal research in India. Approval is required before starting any animal experiments.",
-    "3rs": "The 3Rs principle stands for Replacement, Reduction, and Refinement. It aims to minimize animal use and suffering in research.",
-
-
+from functools import partial
+
+from ethixguard import metrics
+from ethixguard.assets import get_asset
+from ethixguard.assistant import get_response
+from ethixguard.cache import report_cache, submission_key
+from ethixguard.checklists import get_checklists
+from ethixguard.evaluation import EvaluationResult, evaluate, report_markdown
+from ethixguard.history import ChatHistory
+from ethixguard.incremental import EvaluationState
+from ethixguard.renderers import FORMATS, open_rendered
+from ethixguard.store import get_store
+from ethixguard.submission import Submission
+
+# Report formats offered for download (button label -> renderer format)
+DOWNLOAD_FORMATS = {
+    "Markdown": "markdown",
+    "HTML": "html",
+    "JSON": "json",
+    "PDF": "pdf",
 }
 
-# Function to get response from knowledge base
-def get_response(user_input):
-    # Convert to lowercase and remove punctuation
-    processed_input = re.sub(r'[^\w\s]', '', user_input.lower())
-    
-    # Check for direct matches first
-    for key in knowledge_base:
-        if key in processed_input:
-            return knowledge_base[key]
-    
-    # If no direct match, look for close matches in keywords
-    words = processed_input.split()
-    for word in words:
-        close_matches = get_close_matches(word, knowledge_base.keys(), n=1, cutoff=0.8)
-        if close_matches:
-            return knowledge_base[close_matches[0]]
-    
-    # Default response if no match found
-    return "I don't have specific information on that topic. Please ask about biosafety guidelines, ethics requirements, or approval processes for more targeted assistance."
-
-# Function to create downloadable report
-def generate_report(biosafety_data, ethics_data):
-    from datetime import datetime
-
-    # Define BSL hierarchy for comparison
-    bsl_hierarchy = {
-        "Not determined yet": 0,
-        "BSL-1": 1,
-        "BSL-2": 2,
-        "BSL-3": 3,
-        "BSL-4": 4
-    }
-
-    # Minimum BSL requirements per research type (from your table, using the lower level for Animal Research)
-    min_bsl = {
-        "Clinical/Human Subjects": "BSL-2",
-
-        "Animal Research": "BSL-2",
-        "Food Production/Safety": "BSL-1",
-        "Academic Research/Publication": "Not determined yet"
-    }
-
-    report = f"""
-# EthixGuard Compliance Report
-Generated on: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-
-## Biosafety Compliance Summary
-
-"""
-    # Biosafety section
-    passed = 0
-    warnings = 0
-    violations = 0
-
-    for question, answer in biosafety_data.items():
-        if answer == "Yes":
-            status = "✅ Pass"
-            passed += 1
-        elif answer == "No":
-            status = "❌ Violation"
-            violations += 1
-        else:
-            status = "⚠️ Warning"
-            warnings += 1
-        report += f"- **{question}**: {answer} ({status})\n"
-
-    report += f"""
-### Summary
-- Passes: {passed}
-- Warnings: {warnings}
-- Violations: {violations}
-
-## Ethics Compliance Summary
-
-"""
-
-    # Ethics section
-    passed = 0
-    warnings = 0
-    violations = 0
-
-    # Determine required BSL for warning logic
-    research_type = ethics_data.get("Research Type", "")
-    required_bsl = min_bsl.get(research_type, "Not determined yet")
-    user_bsl = ethics_data.get("Containment Level", "Not determined yet")
-
-    # Always bullet the containment level and check if it meets the threshold
-    user_bsl_val = bsl_hierarchy.get(user_bsl, 0)
-    required_bsl_val = bsl_hierarchy.get(required_bsl, 0)
-    if user_bsl_val < required_bsl_val:
-        status = f"⚠️ Warning"
-        warnings += 1
-        report += f"- Containment Level: {user_bsl} ({status}) - Minimum required: {required_bsl}\n"
-    else:
-        status = f"✅ Pass"
-        passed += 1
-        report += f"- Containment Level: {user_bsl} ({status})\n"
-
-    # Process all other ethics questions (excluding containment level, research type, notes)
-    for question, answer in ethics_data.items():
-        if question in ["Containment Level", "Research Type", "Additional Notes"]:
-            continue
-        if answer == "Yes" or answer == "No Conflicts Exist":
-            status = "✅ Pass"
-            passed += 1
-        elif answer == "No":
-            status = "❌ Violation"
-            violations += 1
-        else:
-            status = "⚠️ Warning"
-            warnings += 1
-        report += f"- {question}: {answer} ({status})\n"
-
-    report += f"""
-### Summary
-- Passes: {passed}
-- Warnings: {warnings}
-- Violations: {violations}
-
-## Recommendations
-
-"""
-    # Recommendations
-    if violations == 0 and warnings == 0:
-        report += "### Congratulations! Your project is compliant with all biosafety and ethics guidelines.\n"
-        
-
-    elif violations > 0:
-        if "No" in biosafety_data.values():
-            report += "- Ensure all biosafety compliance requirements are met before proceeding\n"
-        if "No" in ethics_data.values():
-            report += "- Address ethical violations identified in this report\n"
-    elif warnings > 0:
-        report += "### Areas for Improvement\n"
-        if user_bsl_val<required_bsl_val:
-            report+=f"- {user_bsl} is below the recommended level {required_bsl} for {research_type}. Make sure to conduct experiments in suitable lab environments to ensure safety and compliance.\n" 
-        report += "- Review warning items and consider addressing them\n"
-        report += "- Consult with relevant committees for guidance\n"
-
-
-    return report
+# Chat messages shown per page of the Guidance Assistant
+CHAT_PAGE_SIZE = 20
 
+# Bump when the cached report entry layout changes, so older entries are not reused
+REPORT_ENTRY_VERSION = 3
 
-# Function to create a download link for the report
-def get_download_link(report, filename="EthixGuard_Report.txt"):
-    """Generates a link to download the report as a text file"""
-    b64 = base64.b64encode(report.encode()).decode()
-    href = f'<a href="data:file/txt;base64,{b64}" download="{filename}">Download Report</a>'
-    return href
+# Landing page illustration (see ethixguard.assets)
+HOME_IMAGE = "biosafety&hazard.png"
 
 # Navigation
 def main():
+    # Set page configuration (must be the first Streamlit call of each run)
+    st.set_page_config(
+        page_title="EthixGuard - Biosafety & Bioethics Compliance",
+        page_icon="🛡️",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+    metrics.start_exporters()
+
     # Sidebar for navigation
     st.sidebar.title("🛡️ EthixGuard")
     st.sidebar.subheader("Navigation")
@@ -204,6 +53,7 @@ def main():
         "Biosafety Compliance": page_biosafety,
         "Ethics Evaluation": page_ethics,
         "Generate Report": page_report,
+        "Institution Dashboard": page_dashboard,
         "Guidance Assistant": page_chatbot
     }
     
@@ -211,15 +61,22 @@ def main():
     selection = st.sidebar.radio("Go to", list(pages.keys()))
     
     # Initialize session state for data storage
-    if "biosafety_data" not in st.session_state:
-        st.session_state.biosafety_data = {}
-    if "ethics_data" not in st.session_state:
-        st.session_state.ethics_data = {}
+    if "submission" not in st.session_state:
+        st.session_state.submission = Submission()
+    if "evaluation" not in st.session_state:
+        st.session_state.evaluation = EvaluationState()
+    if "project_id" not in st.session_state:
+        st.session_state.project_id = uuid.uuid4().hex
     if "chatbot_messages" not in st.session_state:
-        st.session_state.chatbot_messages = []
+        st.session_state.chatbot_messages = ChatHistory(session_id=st.session_state.project_id)
+    checklists = get_checklists()
+    session_submission(checklists)
+    session_evaluation(checklists)
     
     # Display the selected page
-    pages[selection]()
+    with metrics.span("page", selection):
+        pages[selection]()
+    metrics.sample_session_state(st.session_state.to_dict)
     
     # Footer
     st.sidebar.markdown("---")
@@ -228,6 +85,32 @@ def main():
         "Designed to help researchers and food producers ensure compliance with guidelines."
     )
 
+# The session's submission, re-encoded if the checklist schema was reloaded
+# since it was made (its answer codes only hold for its own registry)
+def session_submission(checklists):
+    submission = st.session_state.submission
+    if submission.checklists is not checklists:
+        submission = st.session_state.submission = submission.for_checklists(checklists)
+    return submission
+
+# The session's live evaluation, re-scored if the checklist schema was reloaded
+def session_evaluation(checklists):
+    evaluation = st.session_state.evaluation
+    if evaluation.checklists is not checklists:
+        evaluation = st.session_state.evaluation = evaluation.for_checklists(checklists)
+    return evaluation
+
+# Function to persist a snapshot of this session's answers as a new version
+def save_submission(form):
+    store = get_store()
+    if store is not None:
+        store.save(
+            st.session_state.project_id,
+            form,
+            st.session_state.submission.biosafety_data(),
+            st.session_state.submission.ethics_data()
+        )
+
 # Home page
 def page_home():
     st.title("🛡️ EthixGuard - Biosafety & Bioethics Compliance Reviewer")
@@ -256,66 +139,70 @@ def page_home():
     Get started by selecting "Biosafety Compliance" from the sidebar!
     """)
     
-    # Display sample image - using a placeholder since we can't load external images
-    st.image("biosafety&hazard.png", caption="Biosafety and ethics compliance are critical for research and production")
+    # Display sample image - decoded once per process, sent as a recompressed variant
+    image = get_asset(HOME_IMAGE).variant()
+    st.image(image.data, caption="Biosafety and ethics compliance are critical for research and production",
+             output_format=image.mimetype.split("/")[1].upper())
+
+# Radio for one checklist question, kept in step with the live evaluation
+def checklist_radio(section, question):
+    evaluation = st.session_state.evaluation
+    current = evaluation.answer(section, question.key)
+    answer = st.radio(
+        question.text,
+        question.options,
+        index=question.options.index(current) if current in question.options else 0,
+        key=f"{section}:{question.key}"
+    )
+    evaluation.set_answer(section, question.key, answer)
+    return answer
+
+# Function to show the running compliance score of the answers on screen
+def show_live_score(slot):
+    evaluation = st.session_state.evaluation
+    score = evaluation.compliance_pct()
+    if score is None:
+        return
+    threshold = evaluation.checklists.compliance_threshold
+    slot.metric(
+        "Live compliance score",
+        f"{score:.0f}%",
+        delta=f"{score - threshold:+.0f} points vs. the {threshold}% threshold",
+        help="Share of checklist items that pass, across both forms, as currently answered (saved or not)."
+    )
 
 # Biosafety compliance page
 def page_biosafety():
-    st.title("Biosafety Compliance Checker")
-    st.markdown("Complete the following checklist based on the Government of India Biosafety Guidelines.")
+    checklists = get_checklists()
+    session_evaluation(checklists)
+    st.title(checklists.biosafety_title)
+    st.markdown(checklists.biosafety_description)
+    score_slot = st.empty()
     
-    with st.form("biosafety_form"):
-        # GMO section
-        st.subheader("GMO Handling")
-        gmo_involved = st.radio("Does your research/process involve GMOs (Genetically Modified Organisms)?", 
-                               ["Yes", "No", "Not Applicable"])
-        
-        ibsc_approval = st.radio("Has your Institutional Biosafety Committee (IBSC) approved the project?", 
-                                ["Yes", "No", "Not Applicable"])
-        
-        
-        
-        containment_measures = st.radio("Have appropriate containment measures been implemented?", 
-                                      ["Yes", "No", "Partially"])
-        
-        # Regulatory approval section
-        st.subheader("Regulatory Approvals")
-        rcgm_approval = st.radio("For high-risk category work, has RCGM approval been obtained?", 
-                               ["Yes", "No", "Not Required"])
-        
-        geac_approval = st.radio("For environmental release or large-scale work, has GEAC approval been obtained?", 
-                               ["Yes", "No", "Not Required"])
-        
-        # Training and documentation
-        st.subheader("Training and Documentation")
-        staff_training = st.radio("Have all staff received appropriate biosafety training?", 
-                                ["Yes", "No", "Partially"])
-        
-        documentation = st.radio("Is all necessary biosafety documentation maintained?", 
-                               ["Yes", "No", "Partially"])
-        
-        # Submit button
-        submitted = st.form_submit_button("Save Biosafety Responses")
-        
-        if submitted:
-            # Save responses to session state
-            st.session_state.biosafety_data = {
-                "GMO Involvement": gmo_involved,
-                "IBSC Approval": ibsc_approval,
-                "Containment Measures": containment_measures,
-                "RCGM Approval": rcgm_approval,
-                "GEAC Approval": geac_approval,
-                "Staff Training": staff_training,
-                "Documentation": documentation
-            }
-            st.success("Biosafety responses saved! Proceed to Ethics Evaluation or generate your report.")
+    # One radio per checklist question, grouped by section; every change
+    # updates the live evaluation without re-scoring the other answers
+    answers = {}
+    for section in checklists.biosafety_sections:
+        st.subheader(section.title)
+        for question in section.questions:
+            answers[question.key] = checklist_radio("biosafety", question)
+    show_live_score(score_slot)
+    
+    # Save button
+    if st.button("Save Biosafety Responses"):
+        # Save responses to session state
+        session_submission(checklists).set_biosafety(answers)
+        save_submission("biosafety")
+        st.success("Biosafety responses saved! Proceed to Ethics Evaluation or generate your report.")
     
     # Display current responses if they exist
-    if st.session_state.biosafety_data:
+    if st.session_state.submission.has_biosafety:
         st.subheader("Your Biosafety Responses")
         
+        import pandas as pd
+
         # Create a DataFrame for display
-        data = [[k, v] for k, v in st.session_state.biosafety_data.items()]
+        data = [[k, v] for k, v in st.session_state.submission.biosafety_data().items()]
         df = pd.DataFrame(data, columns=["Question", "Response"])
         
         # Highlight responses based on compliance
@@ -333,86 +220,65 @@ def page_biosafety():
 
 # Ethics evaluation page
 def page_ethics():
-    st.title("Ethics Evaluation")
-    st.markdown("Complete the following ethics checklist applicable to your research or food production process.")
-
-    # Research type selection
+    checklists = get_checklists()
+    st.title(checklists.ethics_title)
+    st.markdown(checklists.ethics_description)
+    score_slot = st.empty()
+    evaluation = session_evaluation(checklists)
+
+    # Research type selection (switching types swaps the question set)
+    research_types = checklists.research_types
     research_type = st.selectbox(
-        "Select the type of research applicable to your project:",
-        ["Clinical/Human Subjects", "Animal Research", "Food Production/Safety", "Academic Research/Publication"]
+        checklists.research_type_field.text,
+        research_types,
+        index=research_types.index(evaluation.research_type) if evaluation.research_type in research_types else 0,
+        key="ethics:research_type"
     )
+    evaluation.set_research_type(research_type)
 
-    # Reset answers when research type changes
-    if "prev_research_type" not in st.session_state:
-        st.session_state.prev_research_type = research_type
-    if st.session_state.prev_research_type != research_type:
-        st.session_state.ethics_answers = {}
-        st.session_state.prev_research_type = research_type
-
-    # Initialize ethics answers
-    if "ethics_answers" not in st.session_state:
-        st.session_state.ethics_answers = {}
+    # Answers on screen, mirrored in the live evaluation; only a saved form
+    # is stored in the submission
+    answers = {}
 
     # Containment level section (common to all research types)
     st.subheader("Biosafety Containment")
-    st.session_state.ethics_answers["Containment Level"] = st.radio(
-        "What containment level is required for your work?",
-        ["BSL-1", "BSL-2", "BSL-3", "BSL-4", "Not determined yet"]
+    containment = checklists.containment_question
+    answers[containment.key] = st.radio(
+        containment.text,
+        containment.options,
+        index=containment.options.index(evaluation.containment) if evaluation.containment in containment.options else 0,
+        key=f"ethics:{containment.key}"
     )
+    evaluation.set_containment(answers[containment.key])
 
-    # Dynamic question handling using a dictionary
-    research_questions = {
-        "Clinical/Human Subjects": {
-            "Informed Consent": "Has informed consent been obtained from all participants?",
-            "Vulnerable Populations": "Does the research involve vulnerable populations (children, pregnant women, etc.)?",
-            "Special Protections": "Have special protections been implemented for vulnerable populations?",
-            "Privacy Measures": "Are adequate privacy and confidentiality measures in place?"
-        },
-        "Animal Research": {
-            "CPCSEA Approval": "Has CPCSEA approval been obtained for animal research?",
-            "3Rs Principle": "Does your protocol follow the 3Rs principle (Replacement, Reduction, Refinement)?",
-            "Pain Management": "Are adequate pain management protocols in place?"
-        },
-        "Food Production/Safety": {
-            "Ingredient Transparency": "Is there full transparency regarding ingredients and additives?",
-            "Safety Data Availability": "Is all safety data publicly available?",
-            "Environmental Impact Assessment": "Has environmental impact been assessed?"
-        },
-        "Academic Research/Publication": {
-            "Data Integrity": "Is there assurance of data integrity and availability?",
-            "Conflict of Interest Declaration": "Have all conflicts of interest been declared?",
-            "Proper Attribution": "Is proper attribution and citation provided for all sources?"
-        }
-    }
-
-    # Display dynamic questions
+    # Questions for the selected research type, from the checklist registry
     st.subheader(f"{research_type} Ethics")
-    for key, question in research_questions[research_type].items():
-        options = ["Yes", "No", "Partially"] if key != "Conflict of Interest Declaration" else ["Yes", "No", "Partially", "No Conflicts Exist"]
-        st.session_state.ethics_answers[key] = st.radio(question, options)
+    for question in checklists.ethics_questions[research_type]:
+        answers[question.key] = checklist_radio("ethics", question)
 
     # Additional notes
-    notes = st.text_area("Additional ethical considerations or notes:", "")
+    notes = st.text_area(checklists.notes_field.text, evaluation.notes, key="ethics:notes")
+    evaluation.notes = notes
+    show_live_score(score_slot)
 
     # Save responses
     if st.button("Save Ethics Responses"):
-        st.session_state.ethics_data = {
-            "Research Type": research_type,
-            **st.session_state.ethics_answers,
-            "Additional Notes": notes
-        }
+        session_submission(checklists).set_ethics(research_type, answers, notes)
+        save_submission("ethics")
         st.success("Ethics responses saved! You can now generate your compliance report.")
 
     # Display current responses
-    if st.session_state.get("ethics_data"):
+    if st.session_state.submission.has_ethics:
         st.subheader("Your Ethics Responses")
         
         # Filter and format data for display
         display_data = {
-            k: v for k, v in st.session_state.ethics_data.items()
-            if k not in ["Additional Notes"] and v not in ["Not Applicable"]
+            k: v for k, v in st.session_state.submission.ethics_data().items()
+            if k != checklists.notes_field.key and v not in ["Not Applicable"]
         }
         
+        import pandas as pd
+
         # Create and style DataFrame
         df = pd.DataFrame(list(display_data.items()), columns=["Question", "Response"])
         
@@ -426,41 +292,70 @@ def page_ethics():
         st.dataframe(df.style.apply(highlight_rows, axis=1))
 
 
+# Function to build the cached part of page_report for one submission: the
+# scores only, since the dated report is rendered for each request
+def build_report_entry(biosafety_data, ethics_data, checklists):
+    # Score once; the report text, charts and downloads all read this result
+    return {"evaluation": evaluate(biosafety_data, ethics_data, checklists).to_dict()}
+
 # Report generation page
 def page_report():
     st.title("Generate Compliance Report")
     
     # Check if both biosafety and ethics data are available
-    if not st.session_state.biosafety_data:
+    if not st.session_state.submission.has_biosafety:
         st.warning("Please complete the Biosafety Compliance section before generating a report.")
-    elif not st.session_state.ethics_data:
+    elif not st.session_state.submission.has_ethics:
         st.warning("Please complete the Ethics Evaluation section before generating a report.")
     else:
         st.success("All required information has been collected. You can now generate your report.")
         
         if st.button("Generate Compliance Report"):
-            # Generate the report
-            report = generate_report(st.session_state.biosafety_data, st.session_state.ethics_data)
+            # Identical answers (from any session) under the same schema reuse the cached scores
+            biosafety_data = st.session_state.submission.biosafety_data()
+            ethics_data = st.session_state.submission.ethics_data()
+            checklists = get_checklists()
+            entry = report_cache.get_or_create(
+                f"{submission_key(biosafety_data, ethics_data)}-{checklists.fingerprint}-{REPORT_ENTRY_VERSION}",
+                lambda: build_report_entry(biosafety_data, ethics_data, checklists)
+            )
+            result = EvaluationResult.from_dict(entry["evaluation"])
+            generated_on = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             
             # Display the report
             st.subheader("EthixGuard Compliance Report")
-            st.markdown(report)
+            st.markdown(report_markdown(result, generated_on))
             
-            # Provide download link
-            st.markdown(get_download_link(report), unsafe_allow_html=True)
+            # Download buttons; each file is rendered only when its button is clicked
+            download_cols = st.columns(len(DOWNLOAD_FORMATS))
+            for col, (label, fmt) in zip(download_cols, DOWNLOAD_FORMATS.items()):
+                _, _, extension, mime = FORMATS[fmt]
+                col.download_button(
+                    f"Download {label}",
+                    data=partial(open_rendered, fmt, result, generated_on),
+                    file_name=f"EthixGuard_Report.{extension}",
+                    mime=mime,
+                    on_click="ignore"
+                )
             
             # Add visualization of compliance status
             st.subheader("Compliance Visualization")
+            import pandas as pd
             
-            # Count status for biosafety
-            biosafety_pass = sum(1 for v in st.session_state.biosafety_data.values() if v == "Yes")
-            biosafety_warn = sum(1 for v in st.session_state.biosafety_data.values() if v == "Partially" or v == "Not determined yet")
-            biosafety_fail = sum(1 for v in st.session_state.biosafety_data.values() if v == "No")
-            
-            # Count status for ethics (excluding Not Applicable)
-            ethics_pass = sum(1 for v in st.session_state.ethics_data.values() if v == "Yes" or v == "No Conflicts Exist")
-            ethics_warn = sum(1 for v in st.session_state.ethics_data.values() if v == "Partially" or v == "Pending")
-            ethics_fail = sum(1 for v in st.session_state.ethics_data.values() if v == "No")
+            score_col, bsl_col = st.columns(2)
+            score_col.metric(
+                "Overall compliance",
+                f"{result.compliance_pct:.0f}%",
+                delta=f"{result.compliance_pct - result.threshold:+.0f} points vs. the {result.threshold}% threshold",
+                help="Share of all scored checklist items (both sections) that pass."
+            )
+            # A negative delta shows the BSL shortfall in red
+            bsl_col.metric(
+                "Containment level",
+                result.user_bsl,
+                delta=f"-{result.bsl_shortfall} level(s) below {result.required_bsl}" if result.bsl_shortfall else None,
+                help=f"Minimum required for {result.research_type or 'this project'}: {result.required_bsl}"
+            )
             
             # Create two columns for biosafety and ethics metrics
             col1, col2 = st.columns(2)
@@ -471,7 +366,7 @@ def page_report():
                 # Create a DataFrame for the metrics
                 biosafety_metrics = pd.DataFrame({
                     "Status": ["Pass", "Warning", "Violation"],
-                    "Count": [biosafety_pass, biosafety_warn, biosafety_fail]
+                    "Count": result.chart_counts("biosafety")
                 })
                 
                 # Display metrics
@@ -483,12 +378,77 @@ def page_report():
                 # Create a DataFrame for the metrics
                 ethics_metrics = pd.DataFrame({
                     "Status": ["Pass", "Warning", "Violation"],
-                    "Count": [ethics_pass, ethics_warn, ethics_fail]
+                    "Count": result.chart_counts("ethics")
                 })
                 
                 # Display metrics
                 st.bar_chart(ethics_metrics.set_index("Status"))
 
+# Institution-wide dashboard page (reads only the pre-aggregated rollups)
+def page_dashboard():
+    st.title("Institution Compliance Dashboard")
+    st.markdown("Current status of every project, based on each project's most recent saved responses.")
+    
+    store = get_store()
+    if store is None:
+        st.info("Submission storage is disabled, so there is no institution-wide data to show.")
+        return
+    
+    import pandas as pd
+    from datetime import timedelta, timezone
+    
+    period = st.selectbox("Last saved", ["Last 30 days", "Last 90 days", "Last 365 days", "All time"])
+    since = None
+    if period != "All time":
+        days = int(period.split()[1])
+        since = (datetime.now(timezone.utc) - timedelta(days=days)).strftime("%Y-%m-%d")
+    
+    totals = store.rollup(since=since)[0]
+    if not totals["projects"]:
+        st.info("No projects have been saved in this period yet.")
+        return
+    
+    # Headline numbers
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Projects", totals["projects"])
+    col2.metric("Fully compliant", totals["status_pass"])
+    col3.metric("With warnings", totals["status_warning"])
+    col4.metric("With violations", totals["status_violation"])
+    
+    status_columns = {"status_pass": "Pass", "status_warning": "Warning", "status_violation": "Violation"}
+    bsl_names = dict(enumerate(get_checklists().bsl_levels))
+    
+    def status_frame(rows, key, label=lambda value: value):
+        frame = pd.DataFrame(rows)
+        frame[key] = [label(value) for value in frame[key]]
+        return frame.set_index(key)[list(status_columns)].rename(columns=status_columns)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("Projects by Research Type")
+        rows = store.rollup(by=("research_type",), since=since)
+        st.bar_chart(status_frame(rows, "research_type", lambda value: value or "Not specified"))
+    with col2:
+        st.subheader("Projects by Containment Level")
+        rows = store.rollup(by=("containment_level",), since=since)
+        st.bar_chart(status_frame(rows, "containment_level", lambda value: bsl_names.get(value, "Not specified")))
+    
+    st.subheader("Projects by Day of Last Save")
+    rows = store.rollup(by=("day",), since=since)
+    st.line_chart(status_frame(rows, "day"))
+    
+    st.subheader("Checklist Items")
+    items = pd.DataFrame({
+        "Pass": [totals["biosafety_pass"], totals["ethics_pass"]],
+        "Warning": [totals["biosafety_warning"], totals["ethics_warning"]],
+        "Violation": [totals["biosafety_violation"], totals["ethics_violation"]],
+    }, index=["Biosafety", "Ethics"])
+    st.dataframe(items)
+
+# Callback to widen the chat window by one page (runs before the rerun renders)
+def load_earlier_messages():
+    st.session_state.chatbot_window += CHAT_PAGE_SIZE
+
 # Chatbot page
 def page_chatbot():
     st.title("Guidance Assistant")
@@ -500,17 +460,29 @@ def page_chatbot():
     
     # Initialize chat history if not already
     if "chatbot_messages" not in st.session_state:
-        st.session_state.chatbot_messages = []
+        st.session_state.chatbot_messages = ChatHistory(session_id=st.session_state.project_id)
+    if "chatbot_window" not in st.session_state:
+        st.session_state.chatbot_window = CHAT_PAGE_SIZE
+    history = st.session_state.chatbot_messages
+    
+    # Offer older messages a page at a time, so a rerun only renders the visible window
+    hidden = len(history) - st.session_state.chatbot_window
+    if hidden > 0:
+        st.button(
+            f"Load earlier messages ({hidden} more)",
+            key="chatbot_load_earlier",
+            on_click=load_earlier_messages
+        )
     
     # Display chat messages
-    for message in st.session_state.chatbot_messages:
-        with st.chat_message(message["role"]):
-            st.write(message["content"])
+    for role, content in history.window(st.session_state.chatbot_window):
+        with st.chat_message(role):
+            st.write(content)
     
     # Get user input
     if prompt := st.chat_input("Ask a question about biosafety or ethics"):
         # Add user message to chat history
-        st.session_state.chatbot_messages.append({"role": "user", "content": prompt})
+        history.append("user", prompt)
         
         # Display user message
         with st.chat_message("user"):
@@ -524,7 +496,7 @@ def page_chatbot():
             st.write(response)
         
         # Add assistant response to chat history
-        st.session_state.chatbot_messages.append({"role": "assistant", "content": response})
+        history.append("assistant", response)
 
 # Run the app
 if __name__ == "__main__":
@@ -0,0 +1,29 @@
+"""Bulk answering (ethixguard.ask) must match get_response, also across calls sharing answers."""
+import unittest
+
+from ethixguard.ask import answer_all, answer_stream
+from ethixguard.assistant import get_response
+
+QUESTIONS = ["What is IBSC?", "what is ibsc", "Do I need GEAC approval?", "biosaftey levels",
+             "where is the cafeteria", "informed consent requirements", "What is IBSC?"]
+
+
+class AnswerStreamTest(unittest.TestCase):
+    def test_matches_get_response(self):
+        self.assertEqual(answer_all(QUESTIONS), [get_response(question) for question in QUESTIONS])
+
+    def test_closed_stream_leaves_only_answers(self):
+        answers = {}
+        for workers in (1, 2):
+            # Read ahead past the first block, then stop after one result
+            stream = answer_stream(enumerate(QUESTIONS * 3), workers=workers, blocksize=2, answers=answers)
+            next(stream)
+            stream.close()
+            self.assertTrue(all(isinstance(answer, str) for answer in answers.values()), answers)
+
+        results = answer_stream(enumerate(QUESTIONS), workers=1, answers=answers)
+        self.assertEqual([answer for _, _, answer in results], [get_response(question) for question in QUESTIONS])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+"""Report cache persistence and the stats both caches export."""
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from ethixguard.cache import QueryCache, ReportCache, _export_cache_stats, _export_query_cache_stats
+
+
+class ReportCacheDiskTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def files(self):
+        return sorted(os.listdir(self.directory))
+
+    def put_all(self, cache, keys):
+        for key in keys:
+            cache.put(key, {"key": key})
+            time.sleep(0.01)  # distinct mtimes
+
+    def test_directory_bounded_to_maxsize(self):
+        cache = ReportCache(maxsize=3, directory=self.directory)
+        self.put_all(cache, ["a", "b", "c", "d", "e"])
+        self.assertEqual(self.files(), ["c.json", "d.json", "e.json"])
+        self.assertEqual(cache.stats()["disk_evictions"], 2)
+
+    def test_disk_hit_refreshes_entry(self):
+        self.put_all(ReportCache(maxsize=3, directory=self.directory), ["a", "b", "c"])
+        # A new process: empty memory, entries only on disk
+        cache = ReportCache(maxsize=3, directory=self.directory)
+        self.assertEqual(cache.get("a"), {"key": "a"})
+        self.assertEqual(cache.stats()["disk_hits"], 1)
+        time.sleep(0.01)
+        self.put_all(cache, ["d"])
+        self.assertEqual(self.files(), ["a.json", "c.json", "d.json"])
+
+    def test_clear_removes_files(self):
+        cache = ReportCache(maxsize=3, directory=self.directory)
+        self.put_all(cache, ["a", "b"])
+        cache.clear()
+        self.assertEqual(self.files(), [])
+        self.assertIsNone(cache.get("a"))
+
+
+class CacheStatsTest(unittest.TestCase):
+    def test_stats_and_export(self):
+        report, query = ReportCache(maxsize=2), QueryCache(maxsize=2)
+        for cache in (report, query):
+            for key in "abc":
+                cache.put(key, key)
+            cache.get("a")
+            cache.get("c")
+            self.assertEqual(cache.stats()["evictions"], 1)
+            self.assertEqual((cache.stats()["hits"], cache.stats()["misses"]), (1, 1))
+        self.assertEqual(report.stats()["disk_evictions"], 0)
+        self.assertNotIn("disk_evictions", query.stats())
+        self.assertTrue(_export_cache_stats())
+        self.assertTrue(_export_query_cache_stats())
+
+
+if __name__ == "__main__":
+    unittest.main()
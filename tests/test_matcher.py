@@ -0,0 +1,112 @@
+"""KeywordMatcher must return exactly what the original linear lookup returned."""
+import random
+import string
+import unittest
+from difflib import get_close_matches
+
+from ethixguard.assistant import normalize
+from ethixguard.knowledge import knowledge_base
+from ethixguard.matcher import FUZZY_CUTOFF, KeywordMatcher
+
+
+def reference_match(knowledge_base, processed_input):
+    """The original get_response matching: first contained key, then the closest word."""
+    for key in knowledge_base:
+        if key in processed_input:
+            return key
+    for word in processed_input.split():
+        close_matches = get_close_matches(word, knowledge_base.keys(), n=1, cutoff=FUZZY_CUTOFF)
+        if close_matches:
+            return close_matches[0]
+    return None
+
+
+def misspell(word, rng):
+    """One random deletion, insertion, substitution or transposition."""
+    if not word:
+        return rng.choice(string.ascii_lowercase)
+    pos = rng.randrange(len(word))
+    edit = rng.randrange(4)
+    if edit == 0:
+        return word[:pos] + word[pos + 1:]
+    if edit == 1:
+        return word[:pos] + rng.choice(string.ascii_lowercase) + word[pos:]
+    if edit == 2:
+        return word[:pos] + rng.choice(string.ascii_lowercase) + word[pos + 1:]
+    if pos + 1 < len(word):
+        return word[:pos] + word[pos + 1] + word[pos] + word[pos + 2:]
+    return word + word[-1]
+
+
+def random_word(rng, alphabet="abcde", lengths=(1, 12)):
+    # A small alphabet makes near-misses (and ties between keys) common
+    return "".join(rng.choice(alphabet) for _ in range(rng.randint(*lengths)))
+
+
+def queries_for(keys, rng, count):
+    words = [word for key in keys for word in key.split()]
+    queries = []
+    for i in range(count):
+        kind = i % 5
+        if kind == 0:
+            queries.append(f"what about {rng.choice(keys)} rules")
+        elif kind == 1:
+            queries.append(f"tell me {misspell(rng.choice(words), rng)}")
+        elif kind == 2:
+            queries.append(" ".join(misspell(rng.choice(words), rng) for _ in range(rng.randint(1, 4))))
+        elif kind == 3:
+            queries.append(" ".join(random_word(rng) for _ in range(rng.randint(1, 5))))
+        else:
+            queries.append(rng.choice(["", "   ", "where is the cafeteria today", rng.choice(words)]))
+    return queries
+
+
+class KeywordMatcherTest(unittest.TestCase):
+    def assert_same(self, knowledge_base, queries):
+        matcher = KeywordMatcher(knowledge_base)
+        for query in queries:
+            expected = reference_match(knowledge_base, query)
+            self.assertEqual(matcher.match(query), expected, query)
+            self.assertEqual(matcher.lookup(query), None if expected is None else knowledge_base[expected])
+
+    def test_builtin_knowledge_base(self):
+        rng = random.Random(1)
+        keys = list(knowledge_base)
+        questions = ["What is IBSC?", "Do I need GEAC approval?", "informed consent requirements",
+                     "tell me about rcgm", "what are the 3Rs", "biosaftey levels", "ibcs", "gmos", "cpcsae",
+                     "Who approves animal experiments?", "containment levle", "trainign", "hello"]
+        queries = [normalize(question) for question in questions] + queries_for(keys, rng, 500)
+        self.assert_same(knowledge_base, queries)
+
+    def test_synthetic_knowledge_bases(self):
+        for seed in range(20):
+            rng = random.Random(seed)
+            size = rng.randint(1, 300)
+            synthetic = {}
+            while len(synthetic) < size:
+                key = " ".join(random_word(rng) for _ in range(rng.randint(1, 3)))
+                synthetic[key] = f"answer for {key}"
+            self.assert_same(synthetic, queries_for(list(synthetic), rng, 300))
+
+    def test_pruning_edges(self):
+        # Every key length from 1 up, so each length bucket sits at or next to
+        # the bounds candidates() derives from the cutoff, including the
+        # buckets it yields whole (shared <= 0) and those it skips (probe <= 0)
+        rng = random.Random(7)
+        synthetic = {}
+        for length in range(1, 25):
+            for _ in range(8):
+                key = random_word(rng, "abc", (length, length))
+                synthetic.setdefault(key, f"answer for {key}")
+        matcher = KeywordMatcher(synthetic)
+        for length in range(1, 30):
+            for _ in range(30):
+                word = random_word(rng, "abc", (length, length))
+                self.assertEqual(matcher.fuzzy(word),
+                                 next(iter(get_close_matches(word, synthetic.keys(), n=1, cutoff=FUZZY_CUTOFF)),
+                                      None), word)
+        self.assert_same(synthetic, queries_for(list(synthetic), rng, 300))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+"""Request handling and error paths of the HTTP API (ethixguard.server)."""
+import asyncio
+import json
+import unittest
+
+from ethixguard.server import APIServer
+
+SUBMISSION = {"biosafety": {"IBSC Approval": "Yes"}, "ethics": {"Research Type": "Animal Research"}}
+
+
+class ServerTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = await APIServer(port=0, max_body=1024).start()
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def send(self, raw):
+        """Send raw request bytes on a new connection; return (status, JSON body)."""
+        reader, writer = await asyncio.open_connection(self.server.host, self.server.port)
+        try:
+            writer.write(raw)
+            await writer.drain()
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), 5)
+            lines = head.decode("latin-1").split("\r\n")
+            headers = dict(line.lower().split(": ", 1) for line in lines[1:] if line)
+            body = await reader.readexactly(int(headers["content-length"]))
+            return int(lines[0].split()[1]), json.loads(body)
+        finally:
+            writer.close()
+
+    async def post(self, path, payload, raw_body=None):
+        body = json.dumps(payload).encode("utf-8") if raw_body is None else raw_body
+        return await self.send(f"POST {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\n"
+                               "Connection: close\r\n\r\n".encode("latin-1") + body)
+
+    async def test_health(self):
+        status, body = await self.send(b"GET /health HTTP/1.1\r\nConnection: close\r\n\r\n")
+        self.assertEqual(status, 200)
+        self.assertEqual(body["status"], "ok")
+
+    async def test_evaluate(self):
+        status, body = await self.post("/evaluate", SUBMISSION)
+        self.assertEqual(status, 200)
+        self.assertIn("report", body)
+
+    async def test_unknown_endpoint_and_method(self):
+        self.assertEqual((await self.post("/nope", {}))[0], 404)
+        status, _ = await self.send(b"GET /evaluate HTTP/1.1\r\nConnection: close\r\n\r\n")
+        self.assertEqual(status, 405)
+
+    async def test_invalid_json(self):
+        status, body = await self.post("/evaluate", None, raw_body=b"{not json")
+        self.assertEqual(status, 400)
+        self.assertIn("invalid JSON", body["error"])
+
+    async def test_body_not_an_object(self):
+        for path in ("/evaluate", "/evaluate/batch", "/ask", "/ask/batch"):
+            status, body = await self.post(path, [])
+            self.assertEqual(status, 400, path)
+
+    async def test_batch_item_not_an_object(self):
+        status, body = await self.post("/evaluate/batch", {"submissions": [SUBMISSION, 1]})
+        self.assertEqual(status, 400)
+        self.assertIn("submissions[1]", body["error"])
+
+    async def test_missing_fields(self):
+        status, body = await self.post("/evaluate", {"biosafety": {}})
+        self.assertEqual(status, 400)
+        self.assertIn("'ethics'", body["error"])
+
+    async def test_answer_not_a_string(self):
+        for section, question in (("biosafety", "IBSC Approval"), ("ethics", "Research Type"),
+                                  ("ethics", "Containment Level")):
+            for answer in (["Yes"], {"a": 1}, 1, None):
+                submission = {"biosafety": {}, "ethics": {"Research Type": "Animal Research"}}
+                submission[section] = dict(submission[section], **{question: answer})
+                status, body = await self.post("/evaluate", submission)
+                self.assertEqual(status, 400, (question, answer))
+                self.assertIn(repr(question), body["error"])
+        status, body = await self.post("/evaluate/batch", {"submissions": [
+            SUBMISSION, {"biosafety": {"IBSC Approval": ["Yes"]}, "ethics": {}}]})
+        self.assertEqual(status, 400)
+        self.assertIn("submissions[1]", body["error"])
+
+    async def test_ask_batch_question_not_a_string(self):
+        for bad in (None, 1, ["What is IBSC?"]):
+            status, body = await self.post("/ask/batch", {"questions": ["What is IBSC?", bad]})
+            self.assertEqual(status, 400, bad)
+            self.assertIn("questions[1]", body["error"])
+        status, body = await self.post("/ask/batch", {"questions": ["What is IBSC?"]})
+        self.assertEqual(status, 200)
+        self.assertEqual(len(body["answers"]), 1)
+
+    async def test_bad_top_k(self):
+        for top_k in ("three", 0, -1, 1.5, True):
+            status, body = await self.post("/ask", {"question": "What is IBSC?", "top_k": top_k})
+            self.assertEqual(status, 400, top_k)
+            self.assertIn("top_k", body["error"])
+
+    async def test_bad_content_length(self):
+        for value in ("abc", "-5"):
+            status, body = await self.send(f"POST /evaluate HTTP/1.1\r\nContent-Length: {value}\r\n\r\n"
+                                           .encode("latin-1"))
+            self.assertEqual(status, 400, value)
+            self.assertIn("Content-Length", body["error"])
+
+    async def test_body_too_large(self):
+        status, _ = await self.post("/evaluate", None, raw_body=b" " * 2048)
+        self.assertEqual(status, 413)
+
+    async def test_chunked_body(self):
+        status, _ = await self.send(b"POST /evaluate HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n")
+        self.assertEqual(status, 501)
+
+    async def test_keep_alive(self):
+        reader, writer = await asyncio.open_connection(self.server.host, self.server.port)
+        try:
+            for _ in range(2):
+                writer.write(b"GET /health HTTP/1.1\r\n\r\n")
+                head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), 5)
+                self.assertIn(b"Connection: keep-alive", head)
+                length = int(head.split(b"Content-Length: ")[1].split(b"\r\n")[0])
+                await reader.readexactly(length)
+        finally:
+            writer.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
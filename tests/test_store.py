@@ -0,0 +1,79 @@
+"""The incrementally maintained rollups must match a rebuild from the raw rows."""
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from ethixguard.checklists import get_checklists
+from ethixguard.store import SubmissionStore
+
+GROUPINGS = ((), ("day",), ("research_type",), ("containment_level",),
+             ("day", "research_type", "containment_level"))
+
+
+def random_submission(checklists, rng):
+    biosafety = {question.key: rng.choice(question.options) for question in checklists.biosafety_questions
+                 if rng.random() < 0.8}
+    if rng.random() < 0.2:
+        return biosafety, {}  # biosafety form saved before any ethics form
+    research_type = rng.choice(checklists.research_types)
+    ethics = {checklists.research_type_field.key: research_type}
+    if rng.random() < 0.8:
+        ethics[checklists.containment_question.key] = rng.choice(checklists.bsl_levels)
+    for question in checklists.ethics_questions[research_type]:
+        ethics[question.key] = rng.choice(question.options)
+    return biosafety, ethics
+
+
+class RollupTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.store = SubmissionStore(os.path.join(self.directory, "test.db"), flush_interval=0.01)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.directory)
+
+    def rollups(self):
+        return {by: self.store.rollup(by=by) for by in GROUPINGS}
+
+    def test_rollup_matches_rebuild(self):
+        checklists = get_checklists()
+        rng = random.Random(3)
+        days = ["2026-10-0%d 12:00:00" % day for day in range(1, 6)]
+        for i in range(200):
+            # Few projects and days, so most saves replace a previous latest,
+            # often moving the project to another bucket
+            project_id = f"project-{rng.randrange(15)}"
+            biosafety, ethics = random_submission(checklists, rng)
+            self.store.save(project_id, rng.choice(("biosafety", "ethics")), biosafety, ethics,
+                            created_at=days[min(i // 40, len(days) - 1)])
+            if i % 37 == 0:
+                self.store.flush()  # spread the saves over several batches
+        self.store.flush()
+
+        incremental = self.rollups()
+        self.assertEqual(incremental[()][0]["projects"], 15)
+        self.store.rebuild_rollups()
+        self.assertEqual(incremental, self.rollups())
+
+    def test_resave_moves_project(self):
+        checklists = get_checklists()
+        ethics = {checklists.research_type_field.key: "Animal Research",
+                  checklists.containment_question.key: "BSL-2"}
+        self.store.save("p", "ethics", {}, ethics, created_at="2026-10-01 09:00:00")
+        self.store.save("p", "ethics", {}, dict(ethics, **{checklists.research_type_field.key:
+                                                           "Clinical/Human Subjects"}),
+                        created_at="2026-10-02 09:00:00")
+        self.store.flush()
+        rows = self.store.rollup(by=("day", "research_type"))
+        self.assertEqual([(row["day"], row["research_type"], row["projects"]) for row in rows],
+                         [("2026-10-02", "Clinical/Human Subjects", 1)])
+        incremental = self.rollups()
+        self.store.rebuild_rollups()
+        self.assertEqual(incremental, self.rollups())
+
+
+if __name__ == "__main__":
+    unittest.main()